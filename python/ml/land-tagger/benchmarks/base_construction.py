@@ -0,0 +1,49 @@
+"""
+Measures the cost of constructing the `Base` data classes
+used on the hot paths, with and without the type validation.
+
+Usage:
+    PYTHONPATH=. python benchmarks/base_construction.py [iterations]
+"""
+
+import sys
+import timeit
+from pathlib import Path
+from typing import Callable
+import numpy
+
+from src.file.file import File
+from src.image.image import Image
+from src.utils.base import validation
+
+
+def measure(run: Callable[[], object], iterations: int) -> float:
+    """
+    Returns the average latency of a call in microseconds.
+    """
+    return timeit.timeit(run, number=iterations) / iterations * 1e6
+
+
+def main() -> None:
+    """
+    Benchmark entrypoint.
+    """
+    iterations: int = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    path = Path("scene.tif")
+    file = File(path=path)
+    content = numpy.zeros((256, 256, 3), dtype=numpy.uint8)
+    cases: dict[str, Callable[[], object]] = {
+        "File": lambda: File(path=path),
+        "Image": lambda: Image(source=file, content=content),
+    }
+    print(f"{'class':>6} | {'validated (us)':>14} | {'skipped (us)':>12}")
+    for name, run in cases.items():
+        validated: float = measure(run, iterations)
+        with validation(False):
+            skipped: float = measure(run, iterations)
+        print(f"{name:>6} | {validated:>14.2f} | {skipped:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
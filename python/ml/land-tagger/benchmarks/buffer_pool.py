@@ -0,0 +1,107 @@
+"""
+Serves the same request many times, decoding a GeoTIFF and
+predicting it in batches, with and without a `BufferPool`.
+Reports the latency, the memory allocated per request and the
+buffers allocated by the pool once it is warm.
+
+Usage:
+    PYTHONPATH=. python benchmarks/buffer_pool.py [size] [requests]
+"""
+
+import sys
+import time
+import tempfile
+import tracemalloc
+from pathlib import Path
+import numpy
+import rasterio
+
+from src.file.file import File
+from src.image.image import Image
+from src.model.model_interfaces import ModelInterface
+from src.utils.pool import BufferPool
+
+
+class SumModel(ModelInterface):
+    """
+    Sums each tile, standing in for a tagging network.
+    """
+
+    def predict(self, sample: numpy.ndarray) -> numpy.ndarray:
+        return sample.sum(axis=(1, 2, 3), dtype=numpy.float32)
+
+    @property
+    def input_shape(self) -> tuple[int, ...]:
+        return (-1, 256, 256, 3)
+
+    @property
+    def input_dtype(self) -> str:
+        return "float32"
+
+
+def serve(file: File, model: SumModel, pool: BufferPool | None) -> None:
+    """
+    Decodes the scene and predicts its tiles.
+    """
+    image: Image = Image.make(file=file, pool=pool)
+    height, width = image.resolution
+    tiles = (
+        image.content[row : row + 256, col : col + 256]
+        for row in range(0, height, 256)
+        for col in range(0, width, 256)
+    )
+    for _ in model.iter_predict(tiles, batch_size=16):
+        pass
+    if pool is not None:
+        pool.release(image.content)
+
+
+def measure(file: File, requests: int, pool: BufferPool | None) -> str:
+    """
+    Returns the latency and the memory allocated per request.
+    """
+    model = SumModel()
+    serve(file, model, pool)
+    tracemalloc.start()
+    started_at: float = time.perf_counter()
+    for _ in range(requests):
+        serve(file, model, pool)
+    elapsed: float = time.perf_counter() - started_at
+    peak: int = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return f"{elapsed / requests * 1e3:.1f} ms/request | peak {peak / 2**20:.1f} MiB"
+
+
+def main() -> None:
+    """
+    Benchmark entrypoint.
+    """
+    size: int = int(sys.argv[1]) if len(sys.argv) > 1 else 2048
+    requests: int = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    with tempfile.TemporaryDirectory() as directory:
+        path: Path = Path(directory).joinpath("scene.tif")
+        with rasterio.open(
+            path,
+            mode="w",
+            driver="GTiff",
+            height=size,
+            width=size,
+            count=3,
+            dtype="uint16",
+            tiled=True,
+        ) as rf:
+            rf.write(numpy.ones((3, size, size), dtype=numpy.uint16))
+        file = File(path=path)
+
+        print(f"{'no pool':>7} | {measure(file, requests, None)}")
+        pool = BufferPool()
+        print(f"{'pool':>7} | {measure(file, requests, pool)}")
+
+    stats = BufferPool.shared().stats
+    print(f"image pool: {pool.stats}")
+    print(f"batch pool: {stats}")
+
+
+if __name__ == "__main__":
+    main()
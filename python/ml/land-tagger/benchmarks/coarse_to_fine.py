@@ -0,0 +1,95 @@
+"""
+Compares predicting every tile of a mostly empty scene
+against the coarse-to-fine tagging, reporting the tiles
+predicted at full resolution and the elapsed time.
+
+Usage:
+    PYTHONPATH=. python benchmarks/coarse_to_fine.py [size] [objects]
+"""
+
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Iterable
+import numpy
+
+from src.file.file import File
+from src.image.image import Image
+from src.model.model import Model
+from src.model.model_interfaces import ModelInterface
+from src.model.tiling import CoarseConfig, TiledInference, TilingConfig
+
+TILE: int = 256
+
+
+class ThresholdModel(ModelInterface):
+    """
+    Scores each pixel by its brightness after a small blur,
+    standing in for a segmentation network.
+    """
+
+    def __init__(self) -> None:
+        self.tiles: int = 0
+
+    def predict(self, sample: numpy.ndarray) -> numpy.ndarray:
+        self.tiles += len(sample)
+        blurred = sample.astype(numpy.float32)
+        for axis in (1, 2):
+            blurred = (
+                blurred + numpy.roll(blurred, 1, axis) + numpy.roll(blurred, -1, axis)
+            ) / 3
+        return blurred / 255
+
+    @property
+    def input_shape(self) -> tuple[int, ...]:
+        return (-1, TILE, TILE, 1)
+
+    @property
+    def input_dtype(self) -> str:
+        return "float32"
+
+
+def scene(size: int, objects: int) -> Image:
+    """
+    Returns a dark scene with a few bright squares.
+    """
+    rng = numpy.random.default_rng(0)
+    content = rng.integers(0, 20, (size, size, 1), dtype=numpy.uint8)
+    for row, col in rng.integers(0, size - 32, (objects, 2)):
+        content[row : row + 32, col : col + 32] = 250
+    return Image(source=File(path=Path("rural.png")), content=content)
+
+
+def measure(backend: ThresholdModel, run: Callable[[], Iterable]) -> str:
+    """
+    Consumes the results of a run, reporting the samples
+    predicted and the elapsed time.
+    """
+    backend.tiles = 0
+    started_at: float = time.perf_counter()
+    for _ in run():
+        pass
+    elapsed: float = time.perf_counter() - started_at
+    return f"samples predicted: {backend.tiles}, elapsed (s): {elapsed:.2f}"
+
+
+def main() -> None:
+    """
+    Benchmark entrypoint.
+    """
+    size: int = int(sys.argv[1]) if len(sys.argv) > 1 else 8192
+    objects: int = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    image: Image = scene(size=size, objects=objects)
+    backend = ThresholdModel()
+    tiling = TiledInference(
+        model=Model(source=File(path=Path("threshold.onnx")), model=backend),
+        config=TilingConfig(batch_size=8),
+    )
+    coarse = CoarseConfig(factor=8, threshold=0.5)
+    print(f"{'all tiles':>14} | {measure(backend, lambda: tiling.strips(image))}")
+    print(f"{'coarse-to-fine':>14} | {measure(backend, lambda: tiling.tag(image, coarse))}")
+
+
+if __name__ == "__main__":
+    main()
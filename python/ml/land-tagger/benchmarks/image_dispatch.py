@@ -0,0 +1,66 @@
+"""
+Measures the startup cost of the image module, importing it
+and choosing the first handler in a new interpreter, and the
+cost of choosing the handler of each file.
+
+Usage:
+    PYTHONPATH=. python benchmarks/image_dispatch.py [files]
+"""
+
+import os
+import sys
+import timeit
+import subprocess
+from pathlib import Path
+
+from src.file.file import File
+from src.image.image import Loader
+
+STARTUP: str = """
+import time
+started_at = time.perf_counter()
+import src.image.image
+imported_at = time.perf_counter()
+src.image.image.Loader.handler(src.file.file.File(path=__import__("pathlib").Path("a.jpg")))
+print((imported_at - started_at) * 1e3, (time.perf_counter() - imported_at) * 1e3)
+"""
+
+
+def startup() -> tuple[float, float]:
+    """
+    Returns the milliseconds to import the module and to
+    choose the first handler, in a new interpreter.
+    """
+    result = subprocess.run(
+        [sys.executable, "-c", STARTUP],
+        capture_output=True,
+        check=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": os.getcwd()},
+    )
+    imported, first = result.stdout.split()
+    return float(imported), float(first)
+
+
+def main() -> None:
+    """
+    Benchmark entrypoint.
+    """
+    count: int = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+
+    imported, first = min(startup() for _ in range(5))
+    print(f"{'import':>14} | {imported:.1f} ms")
+    print(f"{'first handler':>14} | {first:.1f} ms")
+
+    suffixes: tuple[str, ...] = (".jpg", ".TIF", ".png", ".JPEG", ".tiff")
+    files: list[File] = [
+        File(path=Path(f"image_{i}{suffixes[i % len(suffixes)]}")) for i in range(count)
+    ]
+    elapsed: float = timeit.timeit(
+        lambda: [Loader.handler(file) for file in files], number=5
+    )
+    print(f"{'dispatch':>14} | {elapsed / 5 / count * 1e6:.2f} us/file")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Measures the import time of a module using `python -X importtime`
+and checks that the heavy backends are not imported eagerly.
+
+Usage:
+    PYTHONPATH=. python benchmarks/import_time.py [module] [budget_ms]
+"""
+
+import os
+import re
+import sys
+import subprocess
+
+# Modules that should only be imported when a model needs them.
+FORBIDDEN: tuple[str, ...] = ("tensorflow", "keras")
+
+# Line format: "import time: <self us> | <cumulative us> | <module>"
+_import_line = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def import_times(module: str) -> tuple[dict[str, int], set[str]]:
+    """
+    Imports the module in a new interpreter.
+
+    Returns:
+        dict[str, int]: Cumulative import time in microseconds for
+            each module imported directly by the import statement.
+        set[str]: All the modules imported.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        check=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": os.getcwd()},
+    )
+    times: dict[str, int] = {}
+    imported: set[str] = set()
+    for line in result.stderr.splitlines():
+        if (match := _import_line.match(line)) is None:
+            continue
+        _, cumulative, indent, name = match.groups()
+        imported.add(name)
+        if len(indent) == 1:
+            times[name] = int(cumulative)
+    return times, imported
+
+
+def main() -> None:
+    """
+    Benchmark entrypoint.
+    """
+    module: str = sys.argv[1] if len(sys.argv) > 1 else "src.model.model"
+    budget_ms: float = float(sys.argv[2]) if len(sys.argv) > 2 else 2000.0
+
+    times, imported = import_times(module=module)
+    for name, cumulative in sorted(times.items(), key=lambda t: -t[1])[:10]:
+        print(f"{cumulative / 1000:>10.1f} ms | {name}")
+
+    total_ms: float = sum(times.values()) / 1000
+    print(f"{total_ms:>10.1f} ms | total")
+
+    forbidden: list[str] = sorted(m for m in imported if m in FORBIDDEN)
+    if forbidden:
+        sys.exit(f"Modules imported eagerly: {', '.join(forbidden)}")
+    if total_ms > budget_ms:
+        sys.exit(f"The import time exceeds the budget of {budget_ms} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Compares decoding a folder of images against reading only
+their headers with `Image.make(lazy=True)`, reporting the
+time per file to get their resolution and bands.
+
+Usage:
+    PYTHONPATH=. python benchmarks/lazy_header.py [files] [size]
+"""
+
+import sys
+import time
+import tempfile
+from pathlib import Path
+from typing import Callable
+import numpy
+import PIL.Image
+
+from src.file.file import File
+from src.image.image import Image
+
+
+def archive(directory: Path, files: int, size: int) -> list[File]:
+    """
+    Writes some JPEG photos and returns their files.
+    """
+    rng = numpy.random.default_rng(0)
+    content = rng.integers(0, 255, (size, size, 3), dtype=numpy.uint8)
+    paths: list[Path] = []
+    for i in range(files):
+        paths.append(directory.joinpath(f"photo_{i}.jpg"))
+        PIL.Image.fromarray(numpy.roll(content, i, axis=0)).save(paths[-1])
+    return [File(path=path) for path in paths]
+
+
+def measure(files: list[File], make: Callable[[File], Image]) -> float:
+    """
+    Returns the average milliseconds to inspect a file.
+    """
+    started_at: float = time.perf_counter()
+    for file in files:
+        image: Image = make(file)
+        _ = (image.resolution, image.bands)
+    return (time.perf_counter() - started_at) / len(files) * 1e3
+
+
+def main() -> None:
+    """
+    Benchmark entrypoint.
+    """
+    count: int = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    size: int = int(sys.argv[2]) if len(sys.argv) > 2 else 4096
+
+    with tempfile.TemporaryDirectory() as directory:
+        files: list[File] = archive(Path(directory), files=count, size=size)
+        decoded: float = measure(files, lambda file: Image.make(file=file))
+        header: float = measure(files, lambda file: Image.make(file=file, lazy=True))
+    print(f"{'decoded':>7} | {decoded:.2f} ms/file")
+    print(f"{'header':>7} | {header:.2f} ms/file")
+
+
+if __name__ == "__main__":
+    main()
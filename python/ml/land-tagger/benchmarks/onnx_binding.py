@@ -0,0 +1,74 @@
+"""
+Compares the default ONNX predictions against the
+IOBinding path, reporting the memory allocated and
+the latency percentiles per call.
+
+Usage:
+    PYTHONPATH=. python benchmarks/onnx_binding.py [model.onnx] [iterations]
+"""
+
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+import numpy
+
+from src.file.file import File
+from src.model.onnx import ONNXLoader, ONNXModel
+
+DEFAULT_MODEL: str = "./tests/model/static/linear-two-times-x-plus-one.onnx"
+
+
+def measure(run: Callable[[], object], iterations: int) -> dict[str, float]:
+    """
+    Runs the callable several times and returns the memory
+    allocated per call and the latency percentiles.
+    """
+    for _ in range(10):
+        run()
+
+    latencies: list[float] = []
+    allocated: list[int] = []
+    tracemalloc.start()
+    for _ in range(iterations):
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        started_at: float = time.perf_counter()
+        run()
+        latencies.append(time.perf_counter() - started_at)
+        allocated.append(tracemalloc.get_traced_memory()[1] - current)
+    tracemalloc.stop()
+
+    return {
+        "allocated bytes/call": float(numpy.mean(allocated)),
+        "p50 (us)": float(numpy.percentile(latencies, 50)) * 1e6,
+        "p99 (us)": float(numpy.percentile(latencies, 99)) * 1e6,
+    }
+
+
+def main() -> None:
+    """
+    Benchmark entrypoint.
+    """
+    model_path: str = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_MODEL
+    iterations: int = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+
+    onnx_model = ONNXLoader().load(source=File(path=Path(model_path).absolute()))
+    if not isinstance(onnx_model, ONNXModel):
+        raise TypeError("Please provide an ONNX model")
+
+    bound = onnx_model.bind()
+    sample: numpy.ndarray = numpy.ones_like(bound.input)
+
+    results: dict[str, dict[str, float]] = {
+        "session.run": measure(lambda: onnx_model.predict(sample), iterations),
+        "iobinding": measure(lambda: bound.run(sample), iterations),
+    }
+    for name, metrics in results.items():
+        summary: str = ", ".join(f"{k}: {v:.2f}" for k, v in metrics.items())
+        print(f"{name:>12} | {summary}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Compares a typical chain of numpy operations to prepare
+an image for a model against `Preprocessing`, reporting the
+memory allocated and the latency per image.
+
+Usage:
+    PYTHONPATH=. python benchmarks/preprocessing.py [height] [width] [iterations]
+"""
+
+import sys
+import timeit
+import functools
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+import numpy
+
+from src.file.file import File
+from src.image.image import Image
+from src.model.preprocessing import Preprocessing, PreprocessingConfig
+
+SIZE: tuple[int, int] = (224, 224)
+MEAN: tuple[float, ...] = (0.485, 0.456, 0.406)
+STD: tuple[float, ...] = (0.229, 0.224, 0.225)
+
+
+def measure(run: Callable[[], object], iterations: int) -> dict[str, float]:
+    """
+    Returns the peak memory allocated by a call and
+    the average latency.
+    """
+    run()
+    tracemalloc.start()
+    run()
+    allocated: int = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "allocated KiB/image": allocated / 1024,
+        "mean (ms)": timeit.timeit(run, number=iterations) / iterations * 1e3,
+    }
+
+
+def naive(image: Image) -> numpy.ndarray:
+    """
+    Resize (nearest), select the bands, normalize and cast
+    using one numpy operation per step.
+    """
+    height, width = image.resolution
+    rows = (numpy.arange(SIZE[0]) + 0.5) * height // SIZE[0]
+    cols = (numpy.arange(SIZE[1]) + 0.5) * width // SIZE[1]
+    content = image.content[..., [0, 1, 2]].astype(numpy.float64)
+    content = content[rows.astype(int)][:, cols.astype(int)]
+    content = content / 255
+    content = (content - numpy.array(MEAN)) / numpy.array(STD)
+    return content.astype(numpy.float32)
+
+
+def main() -> None:
+    """
+    Benchmark entrypoint.
+    """
+    height: int = int(sys.argv[1]) if len(sys.argv) > 1 else 1024
+    width: int = int(sys.argv[2]) if len(sys.argv) > 2 else 1024
+    iterations: int = int(sys.argv[3]) if len(sys.argv) > 3 else 100
+
+    image = Image(
+        source=File(path=Path("benchmark.png")),
+        content=numpy.random.default_rng(0).integers(
+            0, 255, (height, width, 4), dtype=numpy.uint8
+        ),
+    )
+    transforms: dict[str, Preprocessing] = {
+        method: Preprocessing(
+            config=PreprocessingConfig(
+                size=SIZE, bands=(0, 1, 2), scale=1 / 255, mean=MEAN, std=STD, resize=method
+            )
+        )
+        for method in PreprocessingConfig.RESIZE_METHODS
+    }
+    out = numpy.empty((*SIZE, 3), dtype=numpy.float32)
+
+    print(f"{'numpy chain':>14} | {summary(measure(lambda: naive(image), iterations))}")
+    for method, transform in transforms.items():
+        results: dict[str, float] = measure(
+            functools.partial(transform.transform, image), iterations
+        )
+        print(f"{method:>14} | {summary(results)}")
+        results = measure(
+            functools.partial(transform.transform_into, image, out), iterations
+        )
+        print(f"{method + ' into':>14} | {summary(results)}")
+
+
+def summary(metrics: dict[str, float]) -> str:
+    """
+    Formats the metrics of a run.
+    """
+    return ", ".join(f"{k}: {v:.2f}" for k, v in metrics.items())
+
+
+if __name__ == "__main__":
+    main()
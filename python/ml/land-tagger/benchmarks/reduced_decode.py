@@ -0,0 +1,66 @@
+"""
+Compares decoding a large JPEG at full resolution against
+decoding it for a small model input with `LoadOptions.size`,
+reporting the decode latency and the decoded array size.
+
+Usage:
+    PYTHONPATH=. python benchmarks/reduced_decode.py [height] [width] [target]
+"""
+
+import sys
+import timeit
+import tempfile
+import functools
+from pathlib import Path
+import numpy
+import PIL.Image
+
+from src.file.file import File
+from src.image.image import Image, LoadOptions
+
+
+def photo(path: Path, height: int, width: int) -> File:
+    """
+    Writes a JPEG with smooth gradients and some noise,
+    closer to a photo than pure noise.
+    """
+    rng = numpy.random.default_rng(0)
+    rows, cols = numpy.mgrid[0:height, 0:width]
+    content = numpy.stack(
+        [(rows * 255 // height), (cols * 255 // width), ((rows + cols) % 256)], axis=-1
+    )
+    content = (content + rng.integers(0, 8, content.shape)).clip(0, 255)
+    PIL.Image.fromarray(content.astype(numpy.uint8)).save(path, quality=90)
+    return File(path=path)
+
+
+def measure(file: File, options: LoadOptions, iterations: int = 5) -> str:
+    """
+    Returns the decoded resolution and size and the average latency.
+    """
+    image: Image = Image.make(file=file, options=options)
+    run = functools.partial(Image.make, file=file, options=options)
+    elapsed: float = timeit.timeit(run, number=iterations) / iterations
+    return (
+        f"decoded {image.resolution} | "
+        f"{image.content.nbytes / 2**20:.1f} MiB | {elapsed * 1e3:.1f} ms"
+    )
+
+
+def main() -> None:
+    """
+    Benchmark entrypoint.
+    """
+    height: int = int(sys.argv[1]) if len(sys.argv) > 1 else 4000
+    width: int = int(sys.argv[2]) if len(sys.argv) > 2 else 6000
+    target: int = int(sys.argv[3]) if len(sys.argv) > 3 else 224
+
+    with tempfile.TemporaryDirectory() as directory:
+        file: File = photo(Path(directory).joinpath("photo.jpg"), height, width)
+        print(f"{'full':>9} | {measure(file, LoadOptions())}")
+        reduced = LoadOptions(size=(target, target))
+        print(f"{f'{target}x{target}':>9} | {measure(file, reduced)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Compares returning decoded images from a process pool by
+pickling them against handing them over with `SharedArray`,
+reporting the images received per second.
+
+Usage:
+    PYTHONPATH=. python benchmarks/shared_handoff.py [images] [size] [workers]
+"""
+
+import os
+import sys
+import time
+import functools
+import multiprocessing
+from typing import Callable
+from concurrent.futures import ProcessPoolExecutor
+import numpy
+
+from src.utils.shared import SharedArray
+
+
+def decode(index: int, size: int) -> numpy.ndarray:
+    """
+    Stands in for a decoder returning an int32 image.
+    """
+    return numpy.full((size, size, 3), index, dtype=numpy.int32)
+
+
+def decode_shared(index: int, size: int) -> SharedArray:
+    """
+    Decodes the image and places it in shared memory.
+    """
+    return SharedArray.create(decode(index, size))
+
+
+def measure(pool: ProcessPoolExecutor, images: int, size: int, shared: bool) -> float:
+    """
+    Returns the images received per second.
+    """
+    task: Callable[[int], numpy.ndarray | SharedArray] = functools.partial(
+        decode_shared if shared else decode, size=size
+    )
+    started_at: float = time.perf_counter()
+    for result in pool.map(task, range(images)):
+        content: numpy.ndarray = (
+            result.attach() if isinstance(result, SharedArray) else result
+        )
+        assert content[0, 0, 0] >= 0
+    return images / (time.perf_counter() - started_at)
+
+
+def main() -> None:
+    """
+    Benchmark entrypoint.
+    """
+    images: int = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    size: int = int(sys.argv[2]) if len(sys.argv) > 2 else 2048
+    workers: int = int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count() or 1
+
+    print(f"{images} images of {size * size * 3 * 4 / 2**20:.0f} MiB, {workers} workers")
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        measure(pool, workers, 16, shared=False)
+        for shared in (False, True):
+            throughput: float = measure(pool, images, size, shared=shared)
+            print(f"{'shared' if shared else 'pickled':>8} | {throughput:.1f} images/s")
+
+
+if __name__ == "__main__":
+    main()
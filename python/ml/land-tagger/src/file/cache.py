@@ -0,0 +1,309 @@
+"""
+Local cache for the files retrieved from slow locations
+and the arrays decoded from them. The entries are stored by
+their content hash, so the same content is stored once even
+if it is available in several locations.
+"""
+
+import os
+import fcntl
+import pickle
+import hashlib
+import pathlib
+import tempfile
+import contextlib
+from typing import Callable, Iterator, TypeVar
+import numpy
+from src.file.file import File
+
+T = TypeVar("T")
+
+
+class FileCache:
+    """
+    Stores the files' content and the arrays decoded from
+    them in a local directory. A file is looked up by its URI
+    and version (modification time or ETag), so it isn't
+    retrieved again until it changes. The local files aren't
+    copied, only the arrays decoded from them are stored. The
+    least recently used entries are evicted once the cache
+    exceeds its size. Several processes can share the same
+    directory.
+
+    The decoded metadata is stored with pickle, so the cache
+    directory should only be writable by trusted users.
+
+    Layout:
+        objects/ab/<sha256><suffix>: File content.
+        arrays/ab/<key>.<variant>.npy: Decoded array, by content
+            hash or, for the local files, by URI and version.
+        arrays/ab/<key>.<variant>.meta: Decoded metadata.
+        refs/<key>: Content hash of a file's URI and version.
+
+    Attributes:
+        directory (pathlib.Path): Cache directory.
+        max_bytes (int | None): Maximum size of the cache. None
+            means no limit.
+    """
+
+    def __init__(
+        self, directory: pathlib.Path | str, max_bytes: int | None = None
+    ) -> None:
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError(f"Invalid cache size: {max_bytes}")
+
+        self.directory = pathlib.Path(directory)
+        self.max_bytes = max_bytes
+        for folder in ("objects", "arrays", "refs"):
+            self.directory.joinpath(folder).mkdir(parents=True, exist_ok=True)
+        self._lock_path = self.directory.joinpath(".lock")
+        self._lock_path.touch(exist_ok=True)
+
+    @contextlib.contextmanager
+    def __locked(self, exclusive: bool = False) -> Iterator[None]:
+        """
+        Locks the cache directory. The lookups share the lock,
+        while the eviction holds it exclusively, so an entry isn't
+        removed while it is being found and opened under the lock.
+        """
+        with open(self._lock_path, mode="rb") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def __write(self, path: pathlib.Path, write: Callable) -> None:
+        """
+        Writes an entry atomically: the content is written
+        into a staging file and moved to its final path.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            dir=path.parent, prefix=".staging-", delete=False
+        ) as staging:
+            try:
+                write(staging)
+            except BaseException:
+                os.unlink(staging.name)
+                raise
+        os.replace(staging.name, path)
+
+    def __version_key(self, file: File) -> str | None:
+        """
+        Returns the key of the file's URI and current version.
+        None if the file's location doesn't provide versions.
+        """
+        version: str | None = file.version()
+        if version is None:
+            return None
+        return hashlib.sha256(f"{file.uri}\0{version}".encode()).hexdigest()
+
+    def __ref_path(self, file: File) -> pathlib.Path | None:
+        """
+        Returns the reference to the content of the file's current
+        version. None if the file's location doesn't provide versions.
+        """
+        if (key := self.__version_key(file=file)) is None:
+            return None
+        return self.directory.joinpath("refs", key)
+
+    def __object_path(self, digest: str, suffix: str) -> pathlib.Path:
+        return self.directory.joinpath("objects", digest[:2], f"{digest}{suffix}")
+
+    def __array_path(self, cached: File, variant: str) -> pathlib.Path:
+        objects: pathlib.Path = self.directory.joinpath("objects")
+        key: str | None = pathlib.Path(cached.path).name.split(".")[0]
+        if pathlib.Path(cached.path).parent.parent != objects:
+            # A local file returned as is.
+            key = self.__version_key(file=cached)
+        if key is None:
+            raise ValueError(f"Not a cached file: {cached.path}")
+        variant_key: str = hashlib.sha256(variant.encode()).hexdigest()[:16]
+        return self.directory.joinpath("arrays", key[:2], f"{key}.{variant_key}.npy")
+
+    def __lookup(self, file: File, ref_path: pathlib.Path | None) -> File | None:
+        """
+        Returns the cached copy of the file, if available.
+        """
+        if ref_path is None:
+            return None
+        with self.__locked():
+            try:
+                digest: str = ref_path.read_text(encoding="utf-8")
+                path: pathlib.Path = self.__object_path(digest, suffix=file.suffix)
+                os.utime(path)
+                os.utime(ref_path)
+            except FileNotFoundError:
+                return None
+        return File(path=path, memory_map=file.memory_map)
+
+    def __store(self, file: File, ref_path: pathlib.Path | None) -> File:
+        """
+        Streams the file's content into the cache while hashing it.
+        """
+        sha256 = hashlib.sha256()
+        staging_dir: pathlib.Path = self.directory.joinpath("objects")
+        with tempfile.NamedTemporaryFile(
+            dir=staging_dir, prefix=".staging-", delete=False
+        ) as staging:
+            try:
+                for chunk in file.iter_chunks():
+                    sha256.update(chunk)
+                    staging.write(chunk)
+            except BaseException:
+                os.unlink(staging.name)
+                raise
+
+        digest: str = sha256.hexdigest()
+        path: pathlib.Path = self.__object_path(digest, suffix=file.suffix)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(staging.name, path)
+
+        if ref_path is not None:
+            self.__write(ref_path, lambda f: f.write(digest.encode()))
+        self.__evict(keep={path})
+        return File(path=path, memory_map=file.memory_map)
+
+    def fetch(self, file: File) -> File:
+        """
+        Returns a local copy of the file. The file is only
+        retrieved if it isn't cached or it has changed. The local
+        files are returned as they are.
+
+        The copy may be evicted by another process before it is
+        opened, use `use` to open it safely.
+
+        Args:
+            file: File to retrieve.
+        Returns:
+            File: Cached copy, with the same extension as the source.
+        """
+        if file.is_local and not file.content:
+            return file
+        ref_path: pathlib.Path | None = self.__ref_path(file=file)
+        cached: File | None = self.__lookup(file=file, ref_path=ref_path)
+        return cached or self.__store(file=file, ref_path=ref_path)
+
+    def use(self, file: File, func: Callable[[File], T]) -> T:
+        """
+        Passes the local copy of the file to a function, e.g:
+        to decode it. If another process evicts the copy before
+        the function opens it, the file is fetched again.
+
+        Args:
+            file: File to retrieve.
+            func: Function which opens the copy.
+        Returns:
+            T: The function's result.
+        """
+        cached: File = self.fetch(file=file)
+        try:
+            return func(cached)
+        except Exception:  # pylint: disable=broad-exception-caught
+            if cached is file or os.path.exists(cached.path):
+                raise
+        return func(self.fetch(file=file))
+
+    def load(self, file: File) -> bytes | memoryview:
+        """
+        Loads the file's content through the cache.
+
+        Args:
+            file: File to load. Its content is set once loaded.
+        Returns:
+            bytes | memoryview: File's content.
+        """
+        file.content = self.use(file=file, func=File.load)
+        return file.content
+
+    def get_array(self, cached: File, variant: str) -> tuple[numpy.ndarray, dict] | None:
+        """
+        Returns an array decoded from a cached file. The array is
+        memory-mapped (copy on write), so it is paged in on demand.
+
+        Args:
+            cached: File returned by `fetch`.
+            variant: Describes how the array was decoded,
+                e.g: the decoding options.
+        Returns:
+            tuple[numpy.ndarray, dict] | None: Array and its metadata,
+                or None if it isn't cached.
+        """
+        path: pathlib.Path = self.__array_path(cached=cached, variant=variant)
+        with self.__locked():
+            try:
+                content: numpy.ndarray = numpy.load(path, mmap_mode="c")
+                with open(path.with_suffix(".meta"), mode="rb") as f:
+                    metadata: dict = pickle.load(f)
+                os.utime(path)
+            except FileNotFoundError:
+                return None
+        return content, metadata
+
+    def put_array(
+        self, cached: File, variant: str, content: numpy.ndarray, metadata: dict
+    ) -> None:
+        """
+        Stores an array decoded from a cached file.
+
+        Args:
+            cached: File returned by `fetch`.
+            variant: Describes how the array was decoded.
+            content: Decoded array.
+            metadata: Decoded metadata.
+        """
+        path: pathlib.Path = self.__array_path(cached=cached, variant=variant)
+        # The metadata goes first, so a visible array always has it.
+        self.__write(path.with_suffix(".meta"), lambda f: pickle.dump(metadata, f))
+        self.__write(path, lambda f: numpy.save(f, content, allow_pickle=False))
+        self.__evict(keep={path, path.with_suffix(".meta")})
+
+    def __entries(self) -> list[tuple[pathlib.Path, os.stat_result]]:
+        """
+        Lists the cached files and references from the
+        least to the most recently used.
+        """
+        entries: list[tuple[pathlib.Path, os.stat_result]] = []
+        for pattern in ("objects/*/*", "arrays/*/*", "refs/*"):
+            for path in self.directory.glob(pattern):
+                if path.name.startswith(".staging-"):
+                    continue
+                with contextlib.suppress(FileNotFoundError):
+                    entries.append((path, path.stat()))
+        return sorted(entries, key=lambda entry: entry[1].st_mtime_ns)
+
+    def size(self) -> int:
+        """
+        Returns the bytes used by the cached files and references.
+        """
+        return sum(stat.st_size for _, stat in self.__entries())
+
+    def __evict(self, keep: set[pathlib.Path]) -> None:
+        """
+        Removes the least recently used entries until the
+        cache fits its size. The given entries are kept.
+        """
+        if self.max_bytes is None:
+            return
+
+        with self.__locked(exclusive=True):
+            entries = self.__entries()
+            total: int = sum(stat.st_size for _, stat in entries)
+            for path, stat in entries:
+                if total <= self.max_bytes:
+                    break
+                if path in keep:
+                    continue
+                with contextlib.suppress(FileNotFoundError):
+                    path.unlink()
+                total -= stat.st_size
+
+    def clear(self) -> None:
+        """
+        Removes all the cached entries.
+        """
+        with self.__locked(exclusive=True):
+            for path, _ in self.__entries():
+                with contextlib.suppress(FileNotFoundError):
+                    path.unlink()
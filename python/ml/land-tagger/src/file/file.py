@@ -1,37 +1,230 @@
 """
 Module to handle file loads and basic operations.
 """
-import pathlib
+import io
+import os
 import abc
+import mmap
+import pathlib
+import hashlib
+import importlib
+import threading
+import urllib.parse
+from typing import BinaryIO, Iterator
 from src.utils.base import Base, dataclass
+from src.utils.aio import Executors, run_blocking
+
+# Default chunk size to stream the files: 1 MiB.
+CHUNK_SIZE: int = 1 << 20
+
+
+class MemoryStream(io.RawIOBase):
+    """
+    Reads a content already in memory, e.g: a memory-mapped
+    file, without copying it as `io.BytesIO` does.
+    """
+
+    def __init__(self, content: bytes | memoryview) -> None:
+        super().__init__()
+        self.view = memoryview(content).cast("B")
+        self.position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        start: int = {
+            io.SEEK_SET: 0,
+            io.SEEK_CUR: self.position,
+            io.SEEK_END: len(self.view),
+        }[whence]
+        if start + offset < 0:
+            raise ValueError(f"Negative seek position: {start + offset}")
+        self.position = start + offset
+        return self.position
+
+    def readinto(self, buffer) -> int:
+        view = memoryview(buffer).cast("B")
+        data: memoryview = self.view[self.position : self.position + len(view)]
+        view[: len(data)] = data
+        self.position += len(data)
+        return len(data)
 
 
 @dataclass
 class File(Base):
+    # pylint: disable=too-many-public-methods
     """
     Represents a file that is going to be loaded to parse
     later as an image. This file can be loaded from several
     locations including local filesystems, NFS, cloud filesystems.
+
+    Attributes:
+        path (pathlib.Path | str): Local path or URI of the file,
+            e.g: s3://bucket/key.tif. Local URIs are converted
+            into paths.
+        content (bytes | memoryview | None): File's content.
+        memory_map (bool): Map local files into memory
+            instead of reading them.
     """
 
-    path: pathlib.Path
-    content: bytes | None = None
+    path: pathlib.Path | str
+    content: bytes | memoryview | None = None
+    memory_map: bool = False
 
     def __check_values__(self):
-        pass
+        if isinstance(self.path, str):
+            uri = urllib.parse.urlparse(self.path)
+            if not uri.scheme or len(uri.scheme) == 1:
+                # No scheme or a Windows drive letter.
+                self.path = pathlib.Path(self.path)
+            elif uri.scheme == "file":
+                self.path = pathlib.Path(urllib.parse.unquote(uri.path))
 
-    def load(self) -> bytes:
+    @property
+    def is_local(self) -> bool:
         """
-        Loads the file's content.
+        Returns True if the file is in the local filesystem.
+        """
+        return isinstance(self.path, pathlib.Path)
+
+    @property
+    def scheme(self) -> str:
+        """
+        Returns the URI scheme of the file, e.g: file, s3, https.
+        """
+        if isinstance(self.path, pathlib.Path):
+            return "file"
+        return urllib.parse.urlparse(self.path).scheme.lower()
+
+    @property
+    def uri(self) -> str:
+        """
+        Returns the URI of the file.
+        """
+        if isinstance(self.path, pathlib.Path):
+            return self.path.absolute().as_uri()
+        return self.path
+
+    @property
+    def name(self) -> str:
+        """
+        Returns the file name, including its extension.
+        """
+        if isinstance(self.path, pathlib.Path):
+            return self.path.name
+        return pathlib.PurePosixPath(urllib.parse.urlparse(self.path).path).name
+
+    @property
+    def suffix(self) -> str:
+        """
+        Returns the file extension, e.g: .tif
+        """
+        if isinstance(self.path, pathlib.Path):
+            return self.path.suffix
+        return pathlib.PurePosixPath(self.name).suffix
+
+    def load(self) -> bytes | memoryview:
+        """
+        Loads the file's content. If `memory_map` is set, the
+        content is a read-only view of the memory-mapped file,
+        so it is paged in on demand instead of copied.
         """
         if not self.content:
-            Loader.load(file=self)
+            if self.memory_map:
+                Loader.map(file=self)
+            else:
+                Loader.load(file=self)
 
-        content: bytes = b""
+        content: bytes | memoryview = b""
         if self.content:
             content = self.content
         return content
 
+    async def aload(self, timeout: float | None = None) -> bytes | memoryview:
+        """
+        Loads the file's content without blocking the event loop.
+        The content is retrieved in the shared I/O pool, which
+        reuses the pooled connections to the remote servers.
+
+        Args:
+            timeout: Maximum seconds to wait. None waits forever.
+        Raises:
+            TimeoutError: If the timeout expires.
+        """
+        if self.content:
+            return self.content
+        return await run_blocking(Executors.IO, self.load, timeout=timeout)
+
+    def open_stream(self) -> BinaryIO:
+        """
+        Opens the file's content as a binary stream without
+        loading the whole content in memory.
+
+        Returns:
+            BinaryIO: Stream to read the content. Please close it
+                after using it.
+        """
+        if self.content:
+            return io.BufferedReader(MemoryStream(content=self.content))
+        return Loader.open_stream(file=self)
+
+    def iter_chunks(self, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes | memoryview]:
+        """
+        Reads the file's content in chunks.
+
+        Args:
+            chunk_size: Maximum size of each chunk in bytes.
+        Returns:
+            Iterator[bytes | memoryview]: The content chunks.
+        """
+        if chunk_size <= 0:
+            raise ValueError(f"Invalid chunk size: {chunk_size}")
+
+        if self.content:
+            view: memoryview = memoryview(self.content)
+            for start in range(0, len(view), chunk_size):
+                yield view[start : start + chunk_size]
+            return
+
+        with self.open_stream() as stream:
+            while chunk := stream.read(chunk_size):
+                yield chunk
+
+    def size(self) -> int:
+        """
+        Returns the file size in bytes without loading it.
+        """
+        if self.content:
+            return len(self.content)
+        return Loader.size(file=self)
+
+    def version(self) -> str | None:
+        """
+        Returns a token that changes when the file is modified,
+        e.g: its modification time or ETag, without loading it.
+        None if the location doesn't provide one.
+        """
+        if self.content:
+            return None
+        return Loader.version(file=self)
+
+    def digest(self) -> str:
+        """
+        Computes the SHA-256 of the file's content. The
+        content is streamed if it isn't loaded yet.
+        """
+        sha256 = hashlib.sha256()
+        for chunk in self.iter_chunks():
+            sha256.update(chunk)
+        return sha256.hexdigest()
+
 
 class LoaderInterface(abc.ABC):
     """
@@ -40,15 +233,59 @@ class LoaderInterface(abc.ABC):
     """
 
     @abc.abstractmethod
-    def load(self, from_path: pathlib.Path) -> bytes:
+    def load(self, from_path: pathlib.Path | str) -> bytes | memoryview:
         """
         Loads the file content as bytes.
 
         Args:
             from_path: File's location.
         Returns:
-            bytes: File's content read as bytes.
+            bytes | memoryview: File's content read as bytes, or
+                a read-only view of the buffer it was read into.
+        """
+
+    def open_stream(self, from_path: pathlib.Path | str) -> BinaryIO:
+        """
+        Opens the file content as a binary stream.
+
+        Args:
+            from_path: File's location.
+        Returns:
+            BinaryIO: Stream to read the content.
+        """
+        return io.BytesIO(self.load(from_path=from_path))
+
+    def size(self, from_path: pathlib.Path | str) -> int:
+        """
+        Returns the file size in bytes.
+
+        Args:
+            from_path: File's location.
+        """
+        return len(self.load(from_path=from_path))
+
+    def version(self, from_path: pathlib.Path | str) -> str | None:
+        """
+        Returns a token that changes when the file is modified.
+
+        Args:
+            from_path: File's location.
+        Returns:
+            str | None: The token or None if it isn't available.
         """
+        # pylint: disable=unused-argument
+        return None
+
+    def map(self, from_path: pathlib.Path | str) -> memoryview:
+        """
+        Maps the file content into memory.
+
+        Args:
+            from_path: File's location.
+        Returns:
+            memoryview: Read-only view of the content.
+        """
+        return memoryview(self.load(from_path=from_path)).toreadonly()
 
 
 class LocalLoader(LoaderInterface):
@@ -57,28 +294,81 @@ class LocalLoader(LoaderInterface):
     local filesystem.
     """
 
-    def load(self, from_path: pathlib.Path) -> bytes:
+    def load(self, from_path: pathlib.Path | str) -> bytes:
         with open(file=from_path, mode="rb") as f:
             return f.read()
 
+    def size(self, from_path: pathlib.Path | str) -> int:
+        return os.stat(from_path).st_size
+
+    def version(self, from_path: pathlib.Path | str) -> str | None:
+        stat = os.stat(from_path)
+        return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+    def open_stream(self, from_path: pathlib.Path | str) -> BinaryIO:
+        # pylint: disable=consider-using-with
+        return open(file=from_path, mode="rb")
+
+    def map(self, from_path: pathlib.Path | str) -> memoryview:
+        with open(file=from_path, mode="rb") as f:
+            # Empty files can't be mapped.
+            if not os.fstat(f.fileno()).st_size:
+                return memoryview(b"")
+            # The view keeps the mapping alive after closing the file.
+            mapped = mmap.mmap(f.fileno(), length=0, access=mmap.ACCESS_READ)
+            return memoryview(mapped)
+
 
 class Loader:
     """
     Based on the file URI scheme and the
     file's extension. Load the content from a given
     file.
+
+    Attributes:
+        SCHEMES (dict[str, str]): Loader class for each URI scheme,
+            as `module:Class`. The remote loaders are imported the
+            first time a file with its scheme is loaded.
+        HANDLER (dict[str, LoaderInterface]): Loader instances by
+            scheme. They are shared, so the remote loaders can
+            reuse their connections.
     """
 
+    SCHEMES: dict[str, str] = {
+        "file": "src.file.file:LocalLoader",
+        "http": "src.file.remote:HTTPLoader",
+        "https": "src.file.remote:HTTPLoader",
+        "s3": "src.file.remote:S3Loader",
+    }
+    HANDLER: dict[str, LoaderInterface] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def register(cls, scheme: str, loader: LoaderInterface) -> None:
+        """
+        Registers the loader to use for the given URI scheme.
+        """
+        with cls._lock:
+            cls.HANDLER[scheme.lower()] = loader
+
     @classmethod
     def __retrieve_loader(cls, file: File) -> LoaderInterface:
         """
         Check the file URI schema and return a loader
         to get the file's content.
         """
-        path: pathlib.Path = file.path
-        if path.as_uri().startswith("file"):
-            return LocalLoader()
-        raise NotImplementedError("Unfortunately, there is no loader for your file")
+        scheme: str = file.scheme
+        with cls._lock:
+            if (loader := cls.HANDLER.get(scheme)) is not None:
+                return loader
+            if (reference := cls.SCHEMES.get(scheme)) is None:
+                raise NotImplementedError(
+                    "Unfortunately, there is no loader for your file"
+                )
+            module, name = reference.split(":")
+            loader = getattr(importlib.import_module(module), name)()
+            cls.HANDLER[scheme] = loader
+            return loader
 
     @classmethod
     def load(cls, file: File) -> File:
@@ -86,6 +376,39 @@ class Loader:
         Loads the file's content.
         """
         loader: LoaderInterface = cls.__retrieve_loader(file=file)
-        content: bytes = loader.load(file.path)
+        content: bytes | memoryview = loader.load(file.path)
         file.content = content
         return file
+
+    @classmethod
+    def size(cls, file: File) -> int:
+        """
+        Returns the file size in bytes.
+        """
+        loader: LoaderInterface = cls.__retrieve_loader(file=file)
+        return loader.size(file.path)
+
+    @classmethod
+    def version(cls, file: File) -> str | None:
+        """
+        Returns a token that changes when the file is modified.
+        """
+        loader: LoaderInterface = cls.__retrieve_loader(file=file)
+        return loader.version(file.path)
+
+    @classmethod
+    def map(cls, file: File) -> File:
+        """
+        Maps the file's content into memory.
+        """
+        loader: LoaderInterface = cls.__retrieve_loader(file=file)
+        file.content = loader.map(file.path)
+        return file
+
+    @classmethod
+    def open_stream(cls, file: File) -> BinaryIO:
+        """
+        Opens the file's content as a binary stream.
+        """
+        loader: LoaderInterface = cls.__retrieve_loader(file=file)
+        return loader.open_stream(file.path)
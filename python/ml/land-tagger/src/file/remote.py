@@ -0,0 +1,442 @@
+"""
+Loaders to retrieve the files stored in remote
+locations like HTTP servers or object storages.
+"""
+
+import io
+import os
+import hmac
+import time
+import pathlib
+import hashlib
+import datetime
+import threading
+import contextlib
+import collections
+import http.client
+import urllib.parse
+from typing import BinaryIO, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from src.utils.base import Base, dataclass
+from src.file.file import LoaderInterface
+
+# Status codes worth a retry.
+_RETRY_STATUS: frozenset[int] = frozenset({408, 429, 500, 502, 503, 504})
+
+# Errors worth a retry.
+_RETRY_ERRORS: tuple[type[Exception], ...] = (
+    ConnectionError,
+    TimeoutError,
+    http.client.HTTPException,
+)
+
+
+@dataclass
+class RemoteConfig(Base):
+    """
+    Settings to retrieve remote files.
+
+    Attributes:
+        max_connections (int): Maximum connections open at the same
+            time. They are kept alive and reused between requests.
+        timeout (float): Seconds to wait for the server.
+        retries (int): Retries for failed requests.
+        backoff (float): Seconds to wait before the first retry. The
+            wait is doubled on each retry.
+        part_size (int): Bytes requested by each ranged GET.
+        parallel_threshold (int): Files of at least this size are
+            retrieved using parallel ranged GETs.
+    """
+
+    max_connections: int = 8
+    timeout: float = 30.0
+    retries: int = 3
+    backoff: float = 0.1
+    part_size: int = 8 << 20
+    parallel_threshold: int = 16 << 20
+
+    def __check_values__(self):
+        if self.max_connections <= 0:
+            raise ValueError("At least one connection is required")
+        if self.retries < 0 or self.backoff < 0 or self.timeout <= 0:
+            raise ValueError("Invalid retry settings")
+        if self.part_size <= 0 or self.parallel_threshold <= 0:
+            raise ValueError("Invalid part size")
+
+
+@dataclass
+class Response(Base):
+    """
+    Response for a request to a remote location.
+    """
+
+    status: int
+    headers: dict
+    body: bytes
+
+    def __check_values__(self):
+        pass
+
+    @property
+    def total_size(self) -> int | None:
+        """
+        Returns the size of the whole file for a partial
+        response. None if it is unknown.
+        """
+        if self.status != 206:
+            return None
+        total: str = self.headers.get("content-range", "").rpartition("/")[2]
+        return int(total) if total.isdigit() else None
+
+
+class ConnectionPool:
+    """
+    Keeps the connections to each server alive, so
+    they are reused between requests.
+
+    Attributes:
+        config (RemoteConfig): Connection settings.
+    """
+
+    def __init__(self, config: RemoteConfig) -> None:
+        self.config = config
+        self._idle: collections.defaultdict[tuple, list] = collections.defaultdict(
+            list
+        )
+        self._slots = threading.BoundedSemaphore(config.max_connections)
+        self._lock = threading.Lock()
+
+    def __connect(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        with self._lock:
+            if idle := self._idle[(scheme, netloc)]:
+                return idle.pop()
+        if scheme == "https":
+            return http.client.HTTPSConnection(netloc, timeout=self.config.timeout)
+        return http.client.HTTPConnection(netloc, timeout=self.config.timeout)
+
+    @contextlib.contextmanager
+    def connection(
+        self, scheme: str, netloc: str
+    ) -> Iterator[http.client.HTTPConnection]:
+        """
+        Borrows a connection to the given server. It is returned
+        to the pool if the request succeeds, or closed otherwise.
+        """
+        with self._slots:
+            conn = self.__connect(scheme=scheme, netloc=netloc)
+            try:
+                yield conn
+            except BaseException:
+                conn.close()
+                raise
+            with self._lock:
+                self._idle[(scheme, netloc)].append(conn)
+
+    def close(self) -> None:
+        """
+        Closes the idle connections.
+        """
+        with self._lock:
+            for connections in self._idle.values():
+                for conn in connections:
+                    conn.close()
+            self._idle.clear()
+
+
+class RangeStream(io.RawIOBase):
+    """
+    Reads a remote file sequentially using ranged GETs,
+    so only one part is kept in memory.
+    """
+
+    def __init__(self, loader: "HTTPLoader", url: str, size: int) -> None:
+        super().__init__()
+        self.loader = loader
+        self.url = url
+        self.size = size
+        self.position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        view = memoryview(buffer).cast("B")
+        if self.position >= self.size or view.nbytes == 0:
+            return 0
+        end: int = min(self.position + len(view), self.size) - 1
+        data: bytes = self.loader.get_range(url=self.url, start=self.position, end=end)
+        view[: len(data)] = data
+        self.position += len(data)
+        return len(data)
+
+
+class HTTPLoader(LoaderInterface):
+    """
+    Loads the file's content from a HTTP(S) server. The
+    connections are pooled and kept alive, the large files are
+    retrieved with parallel ranged GETs and the failed requests
+    are retried with exponential backoff.
+
+    Attributes:
+        config (RemoteConfig): Settings to retrieve the files.
+        pool (ConnectionPool): Connections to the servers.
+    """
+
+    def __init__(self, config: RemoteConfig | None = None) -> None:
+        self.config = config or RemoteConfig()
+        self.pool = ConnectionPool(config=self.config)
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def url(self, from_path: pathlib.Path | str) -> str:
+        """
+        Returns the HTTP URL for the given location.
+        """
+        return str(from_path)
+
+    def headers(self, method: str, url: str) -> dict[str, str]:
+        """
+        Returns the extra headers for a request, e.g: to
+        authenticate it.
+        """
+        # pylint: disable=unused-argument
+        return {}
+
+    def __send(self, method: str, url: str, headers: dict[str, str]) -> Response:
+        """
+        Sends a single request using a pooled connection.
+        """
+        parsed = urllib.parse.urlsplit(url)
+        target: str = parsed.path or "/"
+        if parsed.query:
+            target += f"?{parsed.query}"
+
+        with self.pool.connection(scheme=parsed.scheme, netloc=parsed.netloc) as conn:
+            conn.request(method, target, headers=headers)
+            response = conn.getresponse()
+            body: bytes = response.read()
+            if response.will_close:
+                conn.close()
+            return Response(
+                status=response.status,
+                headers={k.lower(): v for k, v in response.getheaders()},
+                body=body,
+            )
+
+    def request(
+        self, method: str, url: str, headers: dict[str, str] | None = None
+    ) -> Response:
+        """
+        Sends a request, retrying it if it fails.
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist.
+            PermissionError: If the access to the file is denied.
+            IOError: If the request fails after all the retries.
+        """
+        all_headers: dict[str, str] = {**(headers or {}), **self.headers(method, url)}
+        error: Exception | None = None
+        for attempt in range(self.config.retries + 1):
+            if attempt:
+                time.sleep(self.config.backoff * 2 ** (attempt - 1))
+            try:
+                response: Response = self.__send(method, url, all_headers)
+            except _RETRY_ERRORS as e:
+                error = e
+                continue
+            if response.status not in _RETRY_STATUS:
+                break
+            error = IOError(f"Request failed with status {response.status}: {url}")
+        else:
+            raise IOError(f"Unable to retrieve: {url}") from error
+
+        if response.status == 416 and "Range" in all_headers:
+            # The range starts after the end, e.g: of an empty file.
+            return response
+        if response.status == 404:
+            raise FileNotFoundError(f"No such remote file: {url}")
+        if response.status in (401, 403):
+            raise PermissionError(f"Access denied: {url}")
+        if response.status >= 400:
+            raise IOError(f"Request failed with status {response.status}: {url}")
+        return response
+
+    def head(self, url: str) -> dict:
+        """
+        Retrieves the file headers.
+        """
+        return self.request(method="HEAD", url=url).headers
+
+    def get_range(self, url: str, start: int, end: int) -> bytes:
+        """
+        Retrieves the bytes between start and end (both included).
+        """
+        response: Response = self.request(
+            method="GET", url=url, headers={"Range": f"bytes={start}-{end}"}
+        )
+        if response.status == 206:
+            return response.body
+        # The server ignored the range.
+        return response.body[start : end + 1]
+
+    def __executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.config.max_connections,
+                    thread_name_prefix="ranged-get",
+                )
+            return self._executor
+
+    def close(self) -> None:
+        """
+        Closes the idle connections and stops the threads
+        retrieving the parts. The loader can still be used,
+        they are created again when needed.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        self.pool.close()
+
+    def load(self, from_path: pathlib.Path | str) -> bytes | memoryview:
+        # The first part tells the file size, so the small
+        # files only take one request.
+        url: str = self.url(from_path)
+        part: int = self.config.part_size
+        first: Response = self.request(
+            method="GET", url=url, headers={"Range": f"bytes=0-{part - 1}"}
+        )
+        if first.status == 416:
+            return b""
+        size: int | None = first.total_size
+        if size is None or size <= len(first.body):
+            return first.body
+
+        # The rest is written into its slice of the content, in
+        # parallel parts for the large files.
+        content = bytearray(size)
+        view = memoryview(content)
+        view[: len(first.body)] = first.body
+        step: int = part if size >= self.config.parallel_threshold else size
+
+        def __retrieve(start: int) -> None:
+            end: int = min(start + step, size)
+            view[start:end] = self.get_range(url=url, start=start, end=end - 1)
+
+        for _ in self.__executor().map(__retrieve, range(len(first.body), size, step)):
+            pass
+        return view.toreadonly()
+
+    def size(self, from_path: pathlib.Path | str) -> int:
+        headers: dict = self.head(url=self.url(from_path))
+        if "content-length" not in headers:
+            return super().size(from_path=from_path)
+        return int(headers["content-length"])
+
+    def version(self, from_path: pathlib.Path | str) -> str | None:
+        headers: dict = self.head(url=self.url(from_path))
+        if "etag" in headers:
+            return headers["etag"]
+        if "last-modified" in headers:
+            return f"{headers['last-modified']}-{headers.get('content-length', '')}"
+        return None
+
+    def open_stream(self, from_path: pathlib.Path | str) -> BinaryIO:
+        url: str = self.url(from_path)
+        headers: dict = self.head(url=url)
+        if headers.get("accept-ranges", "") != "bytes" or "content-length" not in headers:
+            return super().open_stream(from_path=from_path)
+        stream = RangeStream(loader=self, url=url, size=int(headers["content-length"]))
+        return io.BufferedReader(stream, buffer_size=self.config.part_size)
+
+
+class S3Loader(HTTPLoader):
+    """
+    Loads the file's content from an S3 compatible object
+    storage, e.g: s3://bucket/key.tif. The requests are signed
+    (AWS Signature V4) if the credentials are available in the
+    environment (AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY and
+    optionally AWS_SESSION_TOKEN).
+
+    Attributes:
+        endpoint (str | None): Endpoint of the object storage, e.g:
+            http://localhost:9000. Paths are used to address the
+            buckets. If not provided, AWS_ENDPOINT_URL is used or
+            AWS S3 otherwise.
+        region (str): Region used to sign the requests.
+    """
+
+    def __init__(
+        self, config: RemoteConfig | None = None, endpoint: str | None = None
+    ) -> None:
+        super().__init__(config=config)
+        self.endpoint = endpoint or os.environ.get("AWS_ENDPOINT_URL")
+        self.region = os.environ.get(
+            "AWS_REGION", os.environ.get("AWS_DEFAULT_REGION", "us-east-1")
+        )
+
+    def url(self, from_path: pathlib.Path | str) -> str:
+        uri = urllib.parse.urlparse(str(from_path))
+        bucket: str = uri.netloc
+        key: str = urllib.parse.quote(uri.path.lstrip("/"))
+        if self.endpoint:
+            return f"{self.endpoint.rstrip('/')}/{bucket}/{key}"
+        return f"https://{bucket}.s3.{self.region}.amazonaws.com/{key}"
+
+    def __signature(self, secret_key: str, scope: str, string_to_sign: str) -> str:
+        """
+        Signs the request using a key derived from the secret
+        key and the credential scope.
+        """
+        key: bytes = f"AWS4{secret_key}".encode()
+        for part in scope.split("/"):
+            key = hmac.new(key, part.encode(), hashlib.sha256).digest()
+        return hmac.new(key, string_to_sign.encode(), hashlib.sha256).hexdigest()
+
+    def headers(self, method: str, url: str) -> dict[str, str]:
+        access_key: str | None = os.environ.get("AWS_ACCESS_KEY_ID")
+        secret_key: str | None = os.environ.get("AWS_SECRET_ACCESS_KEY")
+        if not access_key or not secret_key:
+            return {}
+
+        headers: dict[str, str] = {
+            "host": urllib.parse.urlsplit(url).netloc,
+            "x-amz-content-sha256": "UNSIGNED-PAYLOAD",
+            "x-amz-date": datetime.datetime.now(datetime.timezone.utc).strftime(
+                "%Y%m%dT%H%M%SZ"
+            ),
+        }
+        if "AWS_SESSION_TOKEN" in os.environ:
+            headers["x-amz-security-token"] = os.environ["AWS_SESSION_TOKEN"]
+
+        scope: str = f"{headers['x-amz-date'][:8]}/{self.region}/s3/aws4_request"
+        signed_headers: str = ";".join(sorted(headers))
+        canonical_request: str = "\n".join(
+            [
+                method,
+                urllib.parse.urlsplit(url).path or "/",
+                "",
+                "".join(f"{k}:{headers[k]}\n" for k in sorted(headers)),
+                signed_headers,
+                "UNSIGNED-PAYLOAD",
+            ]
+        )
+        signature: str = self.__signature(
+            secret_key=secret_key,
+            scope=scope,
+            string_to_sign="\n".join(
+                [
+                    "AWS4-HMAC-SHA256",
+                    headers["x-amz-date"],
+                    scope,
+                    hashlib.sha256(canonical_request.encode()).hexdigest(),
+                ]
+            ),
+        )
+        headers["authorization"] = (
+            f"AWS4-HMAC-SHA256 Credential={access_key}/{scope}, "
+            f"SignedHeaders={signed_headers}, Signature={signature}"
+        )
+        return headers
@@ -2,15 +2,76 @@
 This modules models the image and its
 content and allows the users to interact with it.
 """
-import io
+
+# pylint: disable=too-many-lines
 import abc
+import asyncio
+import threading
+import contextlib
+from typing import Iterator
 import numpy
 import rasterio
+import rasterio.io
 import rasterio.drivers
+import rasterio.enums
 import rasterio.plot
+import rasterio.windows
 import PIL.Image
 from src.utils.base import Base, dataclass
+from src.utils.aio import Executors, run_blocking
 from src.file.file import File
+from src.file.cache import FileCache
+from src.utils.pool import BufferPool
+from src.image.plugins import PluginRegistry
+
+
+def _region(window: tuple[int, int, int, int]) -> tuple[slice, slice]:
+    """
+    Returns the rows and columns of a region (row, col, height, width).
+    """
+    row, col, height, width = window
+    return slice(row, row + height), slice(col, col + width)
+
+
+def _crop(
+    content: numpy.ndarray, metadata: dict, window: tuple[int, int, int, int]
+) -> tuple[numpy.ndarray, dict]:
+    """
+    Returns a region (row, col, height, width) of a decoded image
+    and its metadata, including the geotransform of the region.
+    """
+    row, col, height, width = window
+    region: dict = {**metadata, "height": height, "width": width, "window": window}
+    if "transform" in metadata:
+        region["transform"] = rasterio.windows.transform(
+            rasterio.windows.Window(col, row, width, height), metadata["transform"]
+        )
+    return content[_region(window)], region
+
+
+@dataclass
+class LoadOptions(Base):
+    """
+    Options to decode an image from a file.
+
+    Attributes:
+        native_dtype (bool): Keep the source dtype (e.g: uint8,
+            uint16, float32) instead of casting the content to int32.
+        size (tuple | None): Target (height, width), e.g: the model
+            input. The loaders may decode a reduced resolution, never
+            smaller than the target: JPEG images are scaled while
+            decoding and geospatial images are read from their
+            overviews. None decodes the full resolution.
+    """
+
+    native_dtype: bool = True
+    size: tuple | None = None
+
+    def __check_values__(self):
+        if self.size is not None and (
+            len(self.size) != 2 or min(self.size) <= 0
+        ):
+            raise ValueError(f"Invalid target size: {self.size}")
 
 
 @dataclass
@@ -37,18 +98,241 @@ class Image(Base):
         if self.resolution == (0, 0):
             raise ValueError("Invalid image resolution")
 
+    @property
+    def dtype(self) -> numpy.dtype:
+        """
+        Returns the dtype used to store the image content.
+        """
+        return self.content.dtype
+
     @classmethod
-    def make(cls, file: File):
+    def make(
+        cls,
+        file: File,
+        options: LoadOptions | None = None,
+        cache: FileCache | None = None,
+        lazy: bool = False,
+        pool: BufferPool | None = None,
+    ):
         """
-        Creates a new file and loads its content.
+        Creates a new file and loads its content. If a cache is
+        given, the file is retrieved and decoded only once: later
+        calls map the decoded array from the cache.
+
+        If `lazy` is set, only the image header is read and a
+        `LazyImage` is returned: its content is decoded the first
+        time it is used.
+
+        If a pool is given and there is no cache, the content is
+        decoded into a buffer of the pool. Release it with
+        `pool.release(image.content)` once the image isn't used.
         """
-        img_array, metadata = Loader.load(file=file)
+        if lazy:
+            return LazyImage.open(
+                file=file,
+                options=options,
+                reader=None if cache is None else cache.fetch(file=file),
+            )
+        if cache is None:
+            img_array, metadata = Loader.load(file=file, options=options, pool=pool)
+            return Image(source=file, content=img_array, metadata=metadata)
+
+        options = options or LoadOptions()
+
+        def decode(cached: File) -> tuple[numpy.ndarray, dict]:
+            variant: str = repr(options)
+            if (decoded := cache.get_array(cached=cached, variant=variant)) is None:
+                decoded = Loader.load(file=cached, options=options)
+                cache.put_array(cached, variant, *decoded)
+            return decoded
+
+        img_array, metadata = cache.use(file=file, func=decode)
         return Image(
             source=file,
             content=img_array,
             metadata=metadata
         )
 
+    @classmethod
+    async def amake(
+        cls,
+        file: File,
+        options: LoadOptions | None = None,
+        cache: FileCache | None = None,
+        timeout: float | None = None,
+    ):
+        """
+        Creates a new image without blocking the event loop. The
+        remote content is retrieved in the shared I/O pool and
+        the image is decoded in the shared decode pool.
+
+        Args:
+            file: File to load the image from.
+            options: Decoding options.
+            cache: Cache for the file and the decoded image.
+            timeout: Maximum seconds to wait. None waits forever.
+        Raises:
+            TimeoutError: If the timeout expires.
+        """
+        async with asyncio.timeout(timeout):
+            if cache is None and not file.is_local:
+                await file.aload()
+            return await run_blocking(
+                Executors.DECODE, cls.make, file=file, options=options, cache=cache
+            )
+
+    @classmethod
+    def tiles(
+        cls,
+        file: File,
+        tile_size: tuple[int, int] | None = None,
+        overlap: int = 0,
+        options: LoadOptions | None = None,
+    ) -> Iterator["Image"]:
+        """
+        Reads the image window by window instead of decoding
+        the whole file at once. Each tile is yielded as an `Image`,
+        so the peak memory is bounded by the tile size.
+
+        Args:
+            file: File to read the tiles from.
+            tile_size: Tile (height, width). If not provided, the
+                tiles are aligned with the raster's internal blocks.
+            overlap: Extra pixels added on each side of a tile.
+            options: Decoding options.
+        """
+        yield from Loader.tiles(
+            file=file, tile_size=tile_size, overlap=overlap, options=options
+        )
+
+
+class LazyImage(Image):
+    """
+    Image whose resolution, bands and metadata are read from
+    the file header. The pixels are decoded the first time the
+    content is used, so the images can be inspected, e.g: to
+    route them or to choose a tile grid, without decoding them.
+    A region can be decoded alone with `region`.
+
+    Attributes:
+        options (LoadOptions): Decoding options.
+    """
+
+    # pylint: disable=super-init-not-called
+    def __init__(
+        self,
+        source: File,
+        shape: tuple[int, int, int],
+        metadata: dict | None = None,
+        options: LoadOptions | None = None,
+        reader: File | None = None,
+    ) -> None:
+        """
+        Args:
+            source: Image file.
+            shape: Image (height, width, bands) read from its header.
+            metadata: Image metadata read from its header.
+            options: Decoding options.
+            reader: File to decode the pixels from, e.g: the cached
+                copy of a remote source. Defaults to the source.
+        """
+        height, width, bands = shape
+        if height <= 0 or width <= 0 or bands <= 0:
+            raise ValueError(f"Invalid image shape: {shape}")
+        self.source = source
+        self.resolution = (height, width)
+        self.bands = bands
+        self.metadata = metadata
+        self.options = options or LoadOptions()
+        self._reader = reader or source
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(
+        cls,
+        file: File,
+        options: LoadOptions | None = None,
+        reader: File | None = None,
+    ) -> "LazyImage":
+        """
+        Reads the header of an image file.
+        """
+        shape, metadata = Loader.header(file=reader or file, options=options)
+        return LazyImage(
+            source=file, shape=shape, metadata=metadata, options=options, reader=reader
+        )
+
+    def __getattr__(self, name: str):
+        # Only called while the content isn't decoded yet.
+        if name != "content":
+            raise AttributeError(name)
+        with self._lock:
+            if "content" not in self.__dict__:
+                content, _ = Loader.load(file=self._reader, options=self.options)
+                if content.shape[:2] != self.resolution or content.ndim < 3:
+                    raise ValueError(
+                        f"Expected a {self.resolution} image with {self.bands} "
+                        f"bands, found {content.shape}"
+                    )
+                self.__dict__["content"] = content
+        return self.__dict__["content"]
+
+    def __getstate__(self) -> dict:
+        state: dict = dict(self.__dict__)
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return (
+            f"LazyImage(source={self.source!r}, resolution={self.resolution}, "
+            f"bands={self.bands}, loaded={self.loaded})"
+        )
+
+    @property
+    def loaded(self) -> bool:
+        """
+        Returns if the content is already decoded.
+        """
+        return "content" in self.__dict__
+
+    def region(self, window: tuple[int, int, int, int]) -> Image:
+        """
+        Decodes a region of the image. Only the requested blocks of
+        the geospatial images are decoded. If the content is already
+        decoded, the region is a view of it.
+
+        Args:
+            window: Region (row, col, height, width).
+        Returns:
+            Image: Region content. Its metadata includes the window
+                and, for geospatial images, its geotransform.
+        Raises:
+            ValueError: If the region isn't inside the image.
+        """
+        row, col, height, width = window
+        if (
+            min(row, col) < 0
+            or height <= 0
+            or width <= 0
+            or row + height > self.resolution[0]
+            or col + width > self.resolution[1]
+        ):
+            raise ValueError(f"Invalid region {window} for a {self.resolution} image")
+
+        if self.loaded:
+            content, metadata = _crop(
+                content=self.content, metadata=self.metadata or {}, window=window
+            )
+        else:
+            content, metadata = Loader.read(
+                file=self._reader, window=window, options=self.options
+            )
+        return Image(source=self.source, content=content, metadata=metadata)
+
 
 class ImageInterface(abc.ABC):
     """
@@ -69,12 +353,13 @@ class ImageInterface(abc.ABC):
         """
 
     @abc.abstractmethod
-    def load(self, file: File) -> tuple[numpy.ndarray, dict]:
+    def load(self, file: File, options: LoadOptions) -> tuple[numpy.ndarray, dict]:
         """
         Parse the file's content as an image.
 
         Args:
-            from_path: File's location.
+            file: File to parse.
+            options: Decoding options.
         Returns:
             numpy.ndarray: Image file loaded as an
                 array.
@@ -93,6 +378,75 @@ class ImageInterface(abc.ABC):
             numpy.ndarray: Image content with the axis rearranged.
         """
 
+    def load_into(
+        self, file: File, options: LoadOptions, pool: BufferPool
+    ) -> tuple[numpy.ndarray, dict]:
+        """
+        Parse the file's content into a buffer of the pool. By
+        default, the image is decoded and copied into the buffer.
+
+        Args:
+            file: File to parse.
+            options: Decoding options.
+            pool: Pool to take the buffer from.
+        Returns:
+            numpy.ndarray: Image file loaded into the buffer, or
+                a view of it.
+            dict: Image metadata
+        """
+        content, metadata = self.load(file=file, options=options)
+        buffer: numpy.ndarray = pool.acquire(content.shape, content.dtype)
+        numpy.copyto(buffer, content)
+        return buffer, metadata
+
+    def signatures(self) -> tuple[bytes, ...]:
+        """
+        Returns the first bytes of the files the handler
+        is able to load, to find the handler of the files
+        without a known extension.
+
+        Returns:
+            tuple[bytes, ...]: File signatures, e.g: b"\\x89PNG"
+        """
+        return ()
+
+    def header(
+        self, file: File, options: LoadOptions
+    ) -> tuple[tuple[int, int, int], dict]:
+        """
+        Reads the image shape and metadata without decoding its
+        pixels. By default, the image is decoded to get them.
+
+        Args:
+            file: File to parse.
+            options: Decoding options, the shape is the one
+                `load` decodes with them.
+        Returns:
+            tuple[int, int, int]: Image (height, width, bands).
+            dict: Image metadata.
+        """
+        content, metadata = self.load(file=file, options=options)
+        bands: int = content.shape[2] if content.ndim > 2 else 1
+        return (content.shape[0], content.shape[1], bands), metadata
+
+    def read(
+        self, file: File, window: tuple[int, int, int, int], options: LoadOptions
+    ) -> tuple[numpy.ndarray, dict]:
+        """
+        Decodes a region of the image. By default, the whole
+        image is decoded and cropped.
+
+        Args:
+            file: File to parse.
+            window: Region (row, col, height, width).
+            options: Decoding options.
+        Returns:
+            numpy.ndarray: Region content.
+            dict: Image metadata, including the window.
+        """
+        content, metadata = self.load(file=file, options=options)
+        return _crop(content=content, metadata=metadata, window=window)
+
 
 class PillowLoader(ImageInterface):
     """
@@ -129,19 +483,71 @@ class PillowLoader(ImageInterface):
     def extensions(self) -> set[str]:
         return self.available_extensions
 
+    def signatures(self) -> tuple[bytes, ...]:
+        return (
+            b"\xff\xd8\xff",  # JPEG
+            b"\x89PNG\r\n\x1a\n",
+            b"GIF87a",
+            b"GIF89a",
+            b"BM",
+            b"RIFF",  # WebP
+        )
+
     def arrange_dims(self, content: numpy.ndarray) -> numpy.ndarray:
         # Image from PIL package already uses this convention.
         return content
 
-    def load(self, file: File) -> tuple[numpy.ndarray, dict]:
-        content: bytes = file.load()
-        image = PIL.Image.open(io.BytesIO(content))
-        img_content = numpy.array(image, dtype=numpy.int32)
-        img_metadata = self.__get_metadata(image=image)
+    def __draft(self, image: PIL.Image.Image, options: LoadOptions) -> None:
+        """
+        Configures the JPEG decoder to scale the image down by a
+        power of two while keeping it larger than the target size.
+        The other formats are decoded at full resolution.
+        """
+        if options.size is not None:
+            height, width = options.size
+            image.draft(image.mode, (width, height))
+
+    def load(self, file: File, options: LoadOptions) -> tuple[numpy.ndarray, dict]:
+        # Decode from a stream to avoid an intermediate copy of the file.
+        with file.open_stream() as stream, PIL.Image.open(stream) as image:
+            self.__draft(image=image, options=options)
+            # A writable copy, the arrays exposed by Pillow are read-only.
+            img_content = numpy.array(
+                image, dtype=None if options.native_dtype else numpy.int32
+            )
+            img_metadata = self.__get_metadata(image=image)
         return img_content, img_metadata
 
+    def header(
+        self, file: File, options: LoadOptions
+    ) -> tuple[tuple[int, int, int], dict]:
+        # Opening the image only parses its header.
+        with file.open_stream() as stream, PIL.Image.open(stream) as image:
+            self.__draft(image=image, options=options)
+            shape = (image.height, image.width, len(image.getbands()))
+            return shape, self.__get_metadata(image=image)
+
+    def read(
+        self, file: File, window: tuple[int, int, int, int], options: LoadOptions
+    ) -> tuple[numpy.ndarray, dict]:
+        rows, cols = _region(window)
+        with file.open_stream() as stream, PIL.Image.open(stream) as image:
+            self.__draft(image=image, options=options)
+            region = image.crop((cols.start, rows.start, cols.stop, rows.stop))
+            # A writable copy, the arrays exposed by Pillow are read-only.
+            content = numpy.array(
+                region, dtype=None if options.native_dtype else numpy.int32
+            )
+            return content, {
+                **self.__get_metadata(image=image),
+                "height": window[2],
+                "width": window[3],
+                "window": window,
+            }
+
 
 class RasterIOLoader(ImageInterface):
+    # pylint: disable=too-many-public-methods
     """
     Loads a geospatial image from the file's content.
 
@@ -176,56 +582,441 @@ class RasterIOLoader(ImageInterface):
     def extensions(self) -> set[str]:
         return self.available_extensions
 
+    def signatures(self) -> tuple[bytes, ...]:
+        # Classic and BigTIFF, little and big endian.
+        return (b"II*\x00", b"MM\x00*", b"II+\x00", b"MM\x00+")
+
     def arrange_dims(self, content: numpy.ndarray) -> numpy.ndarray:
         return rasterio.plot.reshape_as_image(content)
 
-    def load(self, file: File) -> tuple[numpy.ndarray, dict]:
-        content: io.BytesIO = io.BytesIO(file.load())
-        with rasterio.open(
-            fp=content,
-            mode="r",
-            driver="GTiff",
-            dtype=numpy.int32
-        ) as rf:
-            img_content: numpy.ndarray = rf.read()
+    def open(
+        self, file: File, stack: contextlib.ExitStack
+    ) -> rasterio.io.DatasetReader:
+        """
+        Opens the raster and registers it in the given stack to
+        close it. Local files are read by GDAL from their path,
+        otherwise the loaded content is used without copying it.
+        """
+        if not file.content and file.is_local:
+            return stack.enter_context(rasterio.open(fp=file.path, mode="r"))
+
+        memory_file = stack.enter_context(rasterio.io.MemoryFile(file.load()))
+        return stack.enter_context(memory_file.open(driver="GTiff"))
+
+    def load(self, file: File, options: LoadOptions) -> tuple[numpy.ndarray, dict]:
+        with contextlib.ExitStack() as stack:
+            rf = self.open(file=file, stack=stack)
+            if (factor := self.__factor(raster=rf, options=options)) > 1:
+                return self.__decimated(raster=rf, factor=factor, options=options)
+            img_content: numpy.ndarray = rf.read(out_dtype=self.__out_dtype(options))
             img_content = self.arrange_dims(content=img_content)
             metadata: dict = self.__get_metadata(raster=rf)
             return img_content, metadata
 
+    def load_into(
+        self, file: File, options: LoadOptions, pool: BufferPool
+    ) -> tuple[numpy.ndarray, dict]:
+        # The raster is read straight into the buffer.
+        with contextlib.ExitStack() as stack:
+            rf = self.open(file=file, stack=stack)
+            factor: int = self.__factor(raster=rf, options=options)
+            out: numpy.ndarray = pool.acquire(
+                (rf.count, -(-rf.height // factor), -(-rf.width // factor)),
+                numpy.dtype(self.__out_dtype(options) or rf.dtypes[0]),
+            )
+            try:
+                return self.__decimated(
+                    raster=rf, factor=factor, options=options, out=out
+                )
+            except BaseException:
+                pool.release(out)
+                raise
+
+    def header(
+        self, file: File, options: LoadOptions
+    ) -> tuple[tuple[int, int, int], dict]:
+        with contextlib.ExitStack() as stack:
+            rf = self.open(file=file, stack=stack)
+            factor: int = self.__factor(raster=rf, options=options)
+            height: int = -(-rf.height // factor)
+            width: int = -(-rf.width // factor)
+            metadata: dict = self.__get_metadata(raster=rf)
+            if factor > 1:
+                metadata = {
+                    **metadata,
+                    "height": height,
+                    "width": width,
+                    "transform": rf.transform
+                    * rf.transform.scale(rf.width / width, rf.height / height),
+                    "factor": factor,
+                }
+            return (height, width, rf.count), metadata
+
+    def read(
+        self, file: File, window: tuple[int, int, int, int], options: LoadOptions
+    ) -> tuple[numpy.ndarray, dict]:
+        with contextlib.ExitStack() as stack:
+            rf = self.open(file=file, stack=stack)
+            factor: int = self.__factor(raster=rf, options=options)
+            region = self.__source_window(raster=rf, window=window, factor=factor)
+            content: numpy.ndarray = rf.read(
+                window=region,
+                out_shape=(rf.count, window[2], window[3]),
+                out_dtype=self.__out_dtype(options),
+                resampling=rasterio.enums.Resampling.average,
+            )
+            metadata: dict = self.__window_metadata(raster=rf, window=region)
+            if factor > 1:
+                metadata.update(
+                    height=window[2],
+                    width=window[3],
+                    transform=metadata["transform"]
+                    * metadata["transform"].scale(
+                        region.width / window[3], region.height / window[2]
+                    ),
+                    window=window,
+                    factor=factor,
+                )
+            return self.arrange_dims(content=content), metadata
+
+    def __source_window(
+        self, raster, window: tuple[int, int, int, int], factor: int
+    ) -> rasterio.windows.Window:
+        """
+        Returns the raster window covered by a region of the
+        raster decimated by `factor`.
+        """
+        rows, cols = _region(window)
+        return rasterio.windows.Window.from_slices(
+            slice(rows.start * factor, rows.stop * factor),
+            slice(cols.start * factor, cols.stop * factor),
+        ).intersection(rasterio.windows.Window(0, 0, raster.width, raster.height))
+
+    def __factor(self, raster, options: LoadOptions) -> int:
+        """
+        Returns the largest decimation factor that keeps the raster
+        at least as large as the target size of the options.
+        """
+        if options.size is None:
+            return 1
+        height, width = options.size
+        return max(1, min(raster.height // height, raster.width // width))
+
+    def __out_dtype(self, options: LoadOptions) -> type | None:
+        """
+        Returns the dtype to read the raster with. None
+        keeps the raster's own dtype.
+        """
+        return None if options.native_dtype else numpy.int32
+
+    def __windows(
+        self, raster, tile_size: tuple[int, int] | None
+    ) -> Iterator[rasterio.windows.Window]:
+        """
+        Splits the raster into windows. If no tile size is given,
+        the raster's block layout is used to avoid decoding the
+        same block twice.
+        """
+        if tile_size is None:
+            for _, window in raster.block_windows(1):
+                yield window
+            return
+
+        height, width = tile_size
+        if height <= 0 or width <= 0:
+            raise ValueError(f"Invalid tile size: {tile_size}")
+        for row_off in range(0, raster.height, height):
+            for col_off in range(0, raster.width, width):
+                yield rasterio.windows.Window(
+                    col_off=col_off,
+                    row_off=row_off,
+                    width=min(width, raster.width - col_off),
+                    height=min(height, raster.height - row_off),
+                )
+
+    def __expand(
+        self, raster, window: rasterio.windows.Window, overlap: int
+    ) -> rasterio.windows.Window:
+        """
+        Grows the window by `overlap` pixels on each side,
+        clipped to the raster bounds.
+        """
+        if overlap == 0:
+            return window
+        row_start = max(int(window.row_off) - overlap, 0)
+        col_start = max(int(window.col_off) - overlap, 0)
+        row_stop = min(int(window.row_off + window.height) + overlap, raster.height)
+        col_stop = min(int(window.col_off + window.width) + overlap, raster.width)
+        return rasterio.windows.Window(
+            col_off=col_start,
+            row_off=row_start,
+            width=col_stop - col_start,
+            height=row_stop - row_start,
+        )
+
+    def __window_metadata(self, raster, window: rasterio.windows.Window) -> dict:
+        """
+        Retrieves the raster metadata adjusted to the given window.
+        """
+        return {
+            **self.__get_metadata(raster=raster),
+            "height": int(window.height),
+            "width": int(window.width),
+            "transform": raster.window_transform(window),
+            "window": (
+                int(window.row_off),
+                int(window.col_off),
+                int(window.height),
+                int(window.width),
+            ),
+        }
+
+    def tiles(
+        self,
+        file: File,
+        tile_size: tuple[int, int] | None = None,
+        overlap: int = 0,
+        options: LoadOptions | None = None,
+    ) -> Iterator[tuple[numpy.ndarray, dict]]:
+        """
+        Reads the raster by windows. Only the requested
+        blocks are decoded.
+
+        Args:
+            file: File to read.
+            tile_size: Tile (height, width) or None to use the
+                raster's block layout.
+            overlap: Extra pixels added on each side of a tile.
+            options: Decoding options.
+        Returns:
+            Iterator[tuple[numpy.ndarray, dict]]: Tile content and
+                metadata. The metadata includes the tile's window
+                and geotransform.
+        """
+        if overlap < 0:
+            raise ValueError("The overlap can't be negative")
+        out_dtype = self.__out_dtype(options or LoadOptions())
+
+        with contextlib.ExitStack() as stack:
+            rf = self.open(file=file, stack=stack)
+            for block in self.__windows(raster=rf, tile_size=tile_size):
+                window = self.__expand(raster=rf, window=block, overlap=overlap)
+                yield (
+                    self.arrange_dims(
+                        content=rf.read(window=window, out_dtype=out_dtype)
+                    ),
+                    self.__window_metadata(raster=rf, window=window),
+                )
+
+    def overview_factors(self, file: File) -> list[int]:
+        """
+        Returns the decimation factors of the overviews
+        stored in the raster, e.g: [2, 4, 8].
+        """
+        with contextlib.ExitStack() as stack:
+            return list(self.open(file=file, stack=stack).overviews(1))
+
+    def overview(
+        self, file: File, factor: int, options: LoadOptions | None = None
+    ) -> tuple[numpy.ndarray, dict]:
+        """
+        Reads the raster reduced by the given factor. GDAL uses the
+        closest overview stored in the raster and only decimates
+        the full resolution when there is none.
+
+        Args:
+            file: File to read.
+            factor: Decimation factor, e.g: 4 reads a quarter
+                of the rows and columns.
+            options: Decoding options.
+        Returns:
+            numpy.ndarray: Reduced content.
+            dict: Raster metadata adjusted to the reduced size.
+        """
+        if factor < 1:
+            raise ValueError(f"Invalid overview factor: {factor}")
+        with contextlib.ExitStack() as stack:
+            rf = self.open(file=file, stack=stack)
+            return self.__decimated(
+                raster=rf, factor=factor, options=options or LoadOptions()
+            )
+
+    def __decimated(
+        self,
+        raster,
+        factor: int,
+        options: LoadOptions,
+        out: numpy.ndarray | None = None,
+    ) -> tuple[numpy.ndarray, dict]:
+        """
+        Reads the whole raster reduced by the given factor,
+        into `out` if given.
+        """
+        height: int = -(-raster.height // factor)
+        width: int = -(-raster.width // factor)
+        content: numpy.ndarray = raster.read(
+            out=out,
+            out_shape=None if out is not None else (raster.count, height, width),
+            out_dtype=self.__out_dtype(options),
+            resampling=rasterio.enums.Resampling.average,
+        )
+        if factor == 1:
+            return self.arrange_dims(content=content), self.__get_metadata(raster=raster)
+        metadata: dict = {
+            **self.__get_metadata(raster=raster),
+            "height": height,
+            "width": width,
+            "transform": raster.transform
+            * raster.transform.scale(raster.width / width, raster.height / height),
+            "factor": factor,
+        }
+        return self.arrange_dims(content=content), metadata
+
 
 class Loader:
     """
-    Load the image content as a numeric array.
+    Load the image content as a numeric array. See `PluginRegistry`
+    for how the handler of each file is chosen.
+
+    Attributes:
+        PLUGINS (PluginRegistry): Image handlers. The built-in ones
+            are created the first time a file is loaded.
     """
 
-    HANDLER: list[ImageInterface] = [
-        RasterIOLoader(),
-        PillowLoader()
-    ]
+    PLUGINS: PluginRegistry[ImageInterface] = PluginRegistry(
+        [(20, "src.image.image:RasterIOLoader"), (10, "src.image.image:PillowLoader")]
+    )
 
     @classmethod
-    def __retrieve_loader(cls, file: File) -> ImageInterface:
+    def register(cls, handler: ImageInterface, priority: int = 0) -> None:
         """
-        Check the file extension return a handler
-        to load the image.
+        Registers an extra handler, e.g: a faster decoder. The
+        built-in handlers use the priorities 20 (geospatial) and
+        10 (Pillow).
+        """
+        cls.PLUGINS.register(handler=handler, priority=priority)
+
+    @classmethod
+    def handler(cls, file: File) -> ImageInterface:
         """
-        extension: str = file.path.suffix
-        for plugin in Loader.HANDLER:
-            if extension in plugin.extensions():
-                return plugin
+        Returns the handler to load an image.
 
-        error_msg: str = (
-            f"Unfortunately, there is no handler for loading a '{extension}' image."
+        Raises:
+            NotImplementedError: If no handler supports the file.
+        """
+        for handler in cls.PLUGINS.candidates(file=file):
+            return handler
+        raise NotImplementedError(
+            f"Unfortunately, there is no handler for loading a '{file.suffix}' image."
         )
-        raise NotImplementedError(error_msg)
 
     @classmethod
-    def load(cls, file: File) -> tuple[numpy.ndarray, dict]:
+    def load(
+        cls,
+        file: File,
+        options: LoadOptions | None = None,
+        pool: BufferPool | None = None,
+    ) -> tuple[numpy.ndarray, dict]:
         """
-        Load the image as a numeric array.
+        Load the image as a numeric array, into a buffer
+        of the pool if given.
         """
+        options = options or LoadOptions()
         try:
-            handler: ImageInterface = cls.__retrieve_loader(file=file)
-            return handler.load(file=file)
+            if pool is not None:
+                return cls.PLUGINS.run(
+                    file, lambda handler: handler.load_into(file, options, pool)
+                )
+            return cls.PLUGINS.run(file, lambda handler: handler.load(file, options))
         except Exception as e:
             raise RuntimeError("Unable to load the image") from e
+
+    @classmethod
+    def header(
+        cls, file: File, options: LoadOptions | None = None
+    ) -> tuple[tuple[int, int, int], dict]:
+        """
+        Read the image (height, width, bands) and metadata
+        without decoding its pixels.
+        """
+        options = options or LoadOptions()
+        try:
+            return cls.PLUGINS.run(file, lambda handler: handler.header(file, options))
+        except Exception as e:
+            raise RuntimeError("Unable to read the image header") from e
+
+    @classmethod
+    def read(
+        cls,
+        file: File,
+        window: tuple[int, int, int, int],
+        options: LoadOptions | None = None,
+    ) -> tuple[numpy.ndarray, dict]:
+        """
+        Load a region (row, col, height, width) of the
+        image as a numeric array.
+        """
+        options = options or LoadOptions()
+        try:
+            return cls.PLUGINS.run(file, lambda handler: handler.read(file, window, options))
+        except Exception as e:
+            raise RuntimeError("Unable to load the image region") from e
+
+    @classmethod
+    def __raster_loader(cls, file: File) -> RasterIOLoader:
+        """
+        Returns the handler for geospatial images.
+        """
+        handler: ImageInterface = cls.handler(file=file)
+        if not isinstance(handler, RasterIOLoader):
+            raise NotImplementedError(
+                f"Windowed reads are not available for '{file.suffix}' images."
+            )
+        return handler
+
+    @classmethod
+    def tiles(
+        cls,
+        file: File,
+        tile_size: tuple[int, int] | None = None,
+        overlap: int = 0,
+        options: LoadOptions | None = None,
+    ) -> Iterator[Image]:
+        """
+        Load the image tile by tile. Only available
+        for geospatial images.
+        """
+        handler: RasterIOLoader = cls.__raster_loader(file=file)
+        for content, metadata in handler.tiles(
+            file=file, tile_size=tile_size, overlap=overlap, options=options
+        ):
+            yield Image(source=file, content=content, metadata=metadata)
+
+    @classmethod
+    def open_raster(
+        cls, file: File, stack: contextlib.ExitStack
+    ) -> rasterio.io.DatasetReader:
+        """
+        Opens a geospatial image to read arbitrary windows.
+        The raster is closed with the given stack.
+        """
+        return cls.__raster_loader(file=file).open(file=file, stack=stack)
+
+    @classmethod
+    def overview_factors(cls, file: File) -> list[int]:
+        """
+        Returns the factors of the overviews stored in a
+        geospatial image. See `RasterIOLoader.overview_factors`.
+        """
+        return cls.__raster_loader(file=file).overview_factors(file=file)
+
+    @classmethod
+    def overview(
+        cls, file: File, factor: int, options: LoadOptions | None = None
+    ) -> tuple[numpy.ndarray, dict]:
+        """
+        Load a geospatial image reduced by the given
+        factor. See `RasterIOLoader.overview`.
+        """
+        handler: RasterIOLoader = cls.__raster_loader(file=file)
+        return handler.overview(file=file, factor=factor, options=options)
@@ -0,0 +1,158 @@
+"""
+This module chooses the handler to decode each image file:
+by its extension, ignoring the case, or by its first bytes
+when the extension is unknown or misleading. The built-in
+handlers are only created when the first file is decoded.
+"""
+
+import threading
+import importlib
+from typing import Callable, Generic, Iterator, Protocol, TypeVar
+from src.file.file import File
+
+T = TypeVar("T")
+
+
+class Plugin(Protocol):
+    """
+    Describes the files a handler is able to decode.
+    """
+
+    def extensions(self) -> set[str]:
+        """
+        Returns the file extensions, e.g: .jpg
+        """
+
+    def signatures(self) -> tuple[bytes, ...]:
+        """
+        Returns the first bytes of the files, e.g: b"\\x89PNG"
+        """
+
+
+P = TypeVar("P", bound=Plugin)
+
+
+class PluginRegistry(Generic[P]):
+    """
+    Keeps the handlers by priority and an index of the
+    handler of each extension, built on first use.
+
+    Attributes:
+        plugins (list[tuple[int, str]]): Built-in handlers as
+            (priority, `module:Class`), created on first use.
+    """
+
+    # Bytes read to find the handler of a file signature.
+    HEAD_SIZE: int = 16
+
+    def __init__(self, plugins: list[tuple[int, str]]) -> None:
+        self.plugins = plugins
+        self._handlers: list[tuple[int, P]] = []
+        self._dispatch: tuple[dict[str, P], tuple[P, ...]] | None = None
+        self._loaded: bool = False
+        self._lock = threading.Lock()
+
+    def register(self, handler: P, priority: int = 0) -> None:
+        """
+        Registers a handler, e.g: a faster decoder. It is preferred
+        over the handlers with a lower priority for its extensions
+        and signatures. For the same priority, the first registered
+        is preferred.
+        """
+        with self._lock:
+            self._handlers.append((priority, handler))
+            self._handlers.sort(key=lambda item: -item[0])
+            self._dispatch = None
+
+    def unregister(self, handler: P) -> None:
+        """
+        Removes a registered handler.
+        """
+        with self._lock:
+            self._handlers = [item for item in self._handlers if item[1] is not handler]
+            self._dispatch = None
+
+    def __load_plugins(self) -> None:
+        """
+        Creates the built-in handlers. Called with the lock held.
+        """
+        for priority, reference in self.plugins:
+            module, name = reference.split(":")
+            plugin: P = getattr(importlib.import_module(module), name)()
+            self._handlers.append((priority, plugin))
+        self._handlers.sort(key=lambda item: -item[0])
+        self._loaded = True
+
+    def __build(self) -> tuple[dict[str, P], tuple[P, ...]]:
+        """
+        Returns the handler of each extension and all the handlers,
+        the highest priority first. They are built again after a
+        handler is registered.
+        """
+        if (dispatch := self._dispatch) is not None:
+            return dispatch
+        with self._lock:
+            if not self._loaded:
+                self.__load_plugins()
+            if self._dispatch is None:
+                handlers: tuple[P, ...] = tuple(item[1] for item in self._handlers)
+                index: dict[str, P] = {}
+                for handler in handlers:
+                    for extension in handler.extensions():
+                        index.setdefault(extension.lower(), handler)
+                self._dispatch = (index, handlers)
+            return self._dispatch
+
+    @property
+    def handlers(self) -> tuple[P, ...]:
+        """
+        Returns the handlers, the highest priority first.
+        """
+        return self.__build()[1]
+
+    def sniff(self, file: File) -> P | None:
+        """
+        Returns the handler of the file signature, if any.
+        """
+        try:
+            with file.open_stream() as stream:
+                head: bytes = bytes(stream.read(self.HEAD_SIZE))
+        except OSError:
+            return None
+        for handler in self.handlers:
+            if any(head.startswith(signature) for signature in handler.signatures()):
+                return handler
+        return None
+
+    def candidates(self, file: File) -> Iterator[P]:
+        """
+        Yields the handler of the file extension and then, if it is
+        different, the one of its signature. The signature is only
+        read if the first handler is missing or not enough.
+        """
+        index, _ = self.__build()
+        if (handler := index.get(file.suffix.lower())) is not None:
+            yield handler
+        if (sniffed := self.sniff(file=file)) is not None and sniffed is not handler:
+            yield sniffed
+
+    def run(self, file: File, action: Callable[[P], T]) -> T:
+        """
+        Runs the action with the candidate handlers of the file
+        until one succeeds, e.g: a PNG named `.jpg` is decoded by
+        the handler of its signature. The first error is raised.
+
+        Raises:
+            NotImplementedError: If no handler supports the file.
+        """
+        error: Exception | None = None
+        for handler in self.candidates(file=file):
+            try:
+                return action(handler)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                error = error or e
+        if error is not None:
+            raise error
+        raise NotImplementedError(
+            f"Unfortunately, there is no handler for loading a '{file.suffix}' image."
+        )
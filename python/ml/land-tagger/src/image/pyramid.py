@@ -0,0 +1,164 @@
+"""
+This module builds reduced resolution versions of an
+image (overviews), e.g: to preview it or to search the
+regions worth analysing at full resolution.
+"""
+
+import numpy
+from src.file.file import File
+from src.file.cache import FileCache
+from src.image.image import Image, LoadOptions, Loader
+
+
+def _downsample(content: numpy.ndarray, factor: int) -> numpy.ndarray:
+    """
+    Averages the blocks of `factor` x `factor` pixels. The
+    image is padded with its border pixels when its size isn't
+    a multiple of the factor.
+    """
+    height, width, bands = content.shape
+    rows: int = -(-height // factor)
+    cols: int = -(-width // factor)
+    padded = numpy.pad(
+        content,
+        ((0, rows * factor - height), (0, cols * factor - width), (0, 0)),
+        mode="edge",
+    )
+    blocks = padded.reshape((rows, factor, cols, factor, bands))
+    mean: numpy.ndarray = blocks.mean(axis=(1, 3), dtype=numpy.float64)
+    if content.dtype.kind in "iub":
+        mean = numpy.rint(mean)
+    return mean.astype(content.dtype)
+
+
+class Pyramid:
+    """
+    Overviews of an image, built on demand and kept in memory.
+    The geospatial images are read through their internal
+    overviews when present, without decoding the full resolution.
+    The other images are decoded once and each overview is
+    computed from the closest finer one. If a cache is given,
+    the overviews are also kept there for the next processes.
+
+    Attributes:
+        DEFAULT_FACTORS (tuple[int, ...]): Factors used if the
+            image doesn't declare its own overviews.
+        file (File): File of the image.
+        options (LoadOptions): Decoding options.
+        cache (FileCache | None): Cache for the overviews.
+    """
+
+    DEFAULT_FACTORS: tuple[int, ...] = (2, 4, 8, 16, 32)
+
+    def __init__(
+        self,
+        file: File,
+        options: LoadOptions | None = None,
+        cache: FileCache | None = None,
+    ) -> None:
+        self.file = file
+        self.options = options or LoadOptions()
+        self.cache = cache
+        self._levels: dict[int, Image] = {}
+        self._geospatial: bool = True
+
+    @classmethod
+    def from_image(cls, image: Image) -> "Pyramid":
+        """
+        Builds the overviews of an image already decoded.
+        """
+        pyramid = cls(file=image.source)
+        pyramid._levels[1] = image
+        pyramid._geospatial = False
+        return pyramid
+
+    @property
+    def factors(self) -> tuple[int, ...]:
+        """
+        Returns the factors of the overviews stored in the
+        image, or the default ones if it hasn't any.
+        """
+        if self._geospatial:
+            try:
+                if factors := Loader.overview_factors(file=self.file):
+                    return tuple(factors)
+            except NotImplementedError:
+                self._geospatial = False
+        return Pyramid.DEFAULT_FACTORS
+
+    def __make(self, factor: int) -> Image:
+        """
+        Reads or computes the overview.
+        """
+        if factor == 1:
+            return Image.make(file=self.file, options=self.options, cache=self.cache)
+        if self._geospatial:
+            try:
+                content, metadata = Loader.overview(
+                    file=self.file, factor=factor, options=self.options
+                )
+                return Image(source=self.file, content=content, metadata=metadata)
+            except NotImplementedError:
+                self._geospatial = False
+
+        # Start from the coarsest level available that divides the factor.
+        finer: int = max(f for f in (1, *self._levels) if factor % f == 0)
+        image: Image = self.level(finer)
+        return Image(
+            source=self.file,
+            content=_downsample(image.content, factor // finer),
+            metadata={**(image.metadata or {}), "factor": factor},
+        )
+
+    def level(self, factor: int) -> Image:
+        """
+        Returns the image reduced by the given factor. The
+        factor 1 returns the full resolution.
+
+        Args:
+            factor: Decimation factor.
+        Returns:
+            Image: Overview, with about `1 / factor` of the rows
+                and columns.
+        Raises:
+            ValueError: If the factor is invalid.
+        """
+        if factor < 1:
+            raise ValueError(f"Invalid overview factor: {factor}")
+        if (image := self._levels.get(factor)) is not None:
+            return image
+
+        variant: str = f"overview:{factor}:{self.options!r}"
+        cached: File | None = None
+        if self.cache is not None and factor > 1:
+            cached = self.cache.fetch(file=self.file)
+            decoded = self.cache.get_array(cached=cached, variant=variant)
+            if decoded is not None:
+                image = Image(source=self.file, content=decoded[0], metadata=decoded[1])
+
+        if image is None:
+            image = self.__make(factor)
+            if cached is not None and self.cache is not None:
+                self.cache.put_array(
+                    cached, variant, image.content, image.metadata or {}
+                )
+        self._levels[factor] = image
+        return image
+
+    def preview(self, max_size: int) -> Image:
+        """
+        Returns the finest overview fitting in the given size,
+        e.g: to display the image on a web page. The coarsest
+        overview is returned if none fits.
+
+        Args:
+            max_size: Maximum height and width.
+        """
+        factors: list[int] = sorted({1, *self.factors})
+        coarsest: Image = self.level(factors[-1])
+        # Upper bound of the full resolution.
+        size: int = max(coarsest.resolution) * factors[-1]
+        for factor in factors:
+            if -(-size // factor) <= max_size:
+                return self.level(factor)
+        return coarsest
@@ -0,0 +1,84 @@
+"""
+This module includes the configuration used by
+each backend to load a model. It doesn't import any
+backend, so it is cheap to use the configurations
+before knowing which backend will load the model.
+"""
+
+import pathlib
+from src.utils.base import Base, dataclass
+
+
+@dataclass
+class ONNXSessionConfig(Base):
+    # pylint: disable=too-many-instance-attributes
+    """
+    Tunes the ONNX Runtime session used to run a model.
+
+    Attributes:
+        intra_op_num_threads (int): Threads used to parallelize
+            an operator. 0 lets ONNX Runtime decide.
+        inter_op_num_threads (int): Threads used to run operators
+            in parallel. 0 lets ONNX Runtime decide.
+        execution_mode (str): `sequential` or `parallel`.
+        graph_optimization_level (str): `disabled`, `basic`,
+            `extended` or `all`.
+        enable_mem_arena (bool): Use the CPU memory arena.
+        enable_mem_pattern (bool): Preallocate memory based on
+            the memory pattern of previous runs.
+        providers (tuple | None): Execution providers sorted by
+            preference. None uses ONNX Runtime's default.
+        optimized_model_dir (pathlib.Path | None): Directory to
+            store the optimized graphs. If provided, the optimized
+            graph is saved on the first load and reused later.
+    """
+
+    EXECUTION_MODES = ("sequential", "parallel")
+    OPTIMIZATION_LEVELS = ("disabled", "basic", "extended", "all")
+
+    intra_op_num_threads: int = 0
+    inter_op_num_threads: int = 0
+    execution_mode: str = "sequential"
+    graph_optimization_level: str = "all"
+    enable_mem_arena: bool = True
+    enable_mem_pattern: bool = True
+    providers: tuple | None = None
+    optimized_model_dir: pathlib.Path | None = None
+
+    def __check_values__(self):
+        if self.intra_op_num_threads < 0 or self.inter_op_num_threads < 0:
+            raise ValueError("The number of threads can't be negative")
+        if self.execution_mode not in ONNXSessionConfig.EXECUTION_MODES:
+            raise ValueError(f"Invalid execution mode: {self.execution_mode}")
+        if self.graph_optimization_level not in ONNXSessionConfig.OPTIMIZATION_LEVELS:
+            raise ValueError(
+                f"Invalid graph optimization level: {self.graph_optimization_level}"
+            )
+
+
+@dataclass
+class TensorflowConfig(Base):
+    """
+    Tunes how a Tensorflow model runs the predictions.
+
+    Attributes:
+        jit_compile (bool): Compile the model with XLA.
+        warmup (bool): Run a prediction while loading the model,
+            so the first request doesn't pay the tracing cost.
+        predict_threshold (int): Samples from which `model.predict`
+            is used instead of calling the model directly. It only
+            pays off for very large arrays.
+    """
+
+    jit_compile: bool = False
+    warmup: bool = True
+    predict_threshold: int = 4096
+
+    def __check_values__(self):
+        if self.predict_threshold <= 0:
+            raise ValueError(
+                f"Invalid threshold for `model.predict`: {self.predict_threshold}"
+            )
+
+
+BackendConfig = ONNXSessionConfig | TensorflowConfig
@@ -4,33 +4,201 @@ further steps to generate predictions on given
 data.
 """
 
+import pathlib
+import functools
+import importlib
+import collections
+from typing import Iterable, Iterator
+import numpy
 from src.utils.base import Base, dataclass
+from src.utils.aio import Executors, run_blocking
 from src.file.file import File
+from src.image.image import Image
 from src.model.model_interfaces import (
+    ModelImageInterface,
     ModelInterface,
     ModelLoadInterface,
 )
-from src.model.tensorflow import TensorflowLoader
-from src.model.onnx import ONNXLoader
+from src.model.config import BackendConfig, ONNXSessionConfig, TensorflowConfig
+
+
+@functools.cache
+def _import_loader(reference: str) -> type[ModelLoadInterface]:
+    """
+    Imports a loader class given as `module:Class`.
+    """
+    module, name = reference.split(":")
+    loader: type[ModelLoadInterface] = getattr(importlib.import_module(module), name)
+    return loader
+
+
+@dataclass
+class Backend(Base):
+    """
+    Describes a backend able to load models.
+
+    Attributes:
+        name (str): Backend name, e.g: onnx.
+        loader (str | type): Loader class, or its reference as
+            `module:Class` to import it the first time it is used.
+        formats (frozenset): File extensions the backend handles.
+            `*` stands for the extensions no backend handles.
+        priority (int): Preference when several backends handle
+            the same format. The highest wins.
+        config (type | None): Configuration class accepted by the loader.
+    """
+
+    name: str
+    loader: str | type
+    formats: frozenset
+    priority: int = 0
+    config: type | None = None
+
+    def __check_values__(self):
+        if not self.name:
+            raise ValueError("Please assign a name to the backend")
+        if isinstance(self.loader, str) and self.loader.count(":") != 1:
+            raise ValueError(f"Invalid loader reference: {self.loader}")
+        if isinstance(self.loader, type) and not issubclass(
+            self.loader, ModelLoadInterface
+        ):
+            raise ValueError(f"Invalid loader class: {self.loader}")
+
+    @classmethod
+    def from_loader(cls, name: str, loader: type[ModelLoadInterface]) -> "Backend":
+        """
+        Describes a backend using the formats and
+        priority declared by its loader.
+        """
+        return Backend(
+            name=name,
+            loader=loader,
+            formats=loader.FORMATS,
+            priority=loader.PRIORITY,
+            config=loader.CONFIG,
+        )
+
+    def make_loader(self, config: BackendConfig | None) -> ModelLoadInterface:
+        """
+        Creates the backend loader. The configuration is
+        only applied if it belongs to this backend.
+        """
+        loader_class = (
+            _import_loader(reference=self.loader)
+            if isinstance(self.loader, str)
+            else self.loader
+        )
+        accepted: bool = self.config is not None and isinstance(config, self.config)
+        return loader_class(config=config if accepted else None)  # type: ignore[call-arg]
 
 
 class Loader:
     """
     Loads the given model using a given file.
+
+    Attributes:
+        BACKENDS (dict[str, Backend]): Registered backends by name.
     """
 
+    # Built-in backends are imported the first time they are used,
+    # so serving ONNX models doesn't pay for importing Tensorflow.
+    # That's why their formats are declared here and not by their
+    # loaders. The empty extension stands for SavedModel folders.
+    BACKENDS: dict[str, Backend] = {
+        "onnx": Backend(
+            name="onnx",
+            loader="src.model.onnx:ONNXLoader",
+            formats=frozenset({".onnx"}),
+            priority=10,
+            config=ONNXSessionConfig,
+        ),
+        "tensorflow": Backend(
+            name="tensorflow",
+            loader="src.model.tensorflow:TensorflowLoader",
+            formats=frozenset({".keras", ".h5", ".hdf5", "", "*"}),
+            priority=0,
+            config=TensorflowConfig,
+        ),
+    }
+
     @classmethod
-    def load(cls, source: File) -> ModelInterface:
+    def register(cls, backend: Backend) -> None:
         """
-        Loads the model from the given file.
+        Registers a new backend or replaces the one
+        with the same name.
+        """
+        cls.BACKENDS[backend.name] = backend
+
+    @classmethod
+    def resolve(
+        cls, source: File, prefer: tuple[str, ...] | None = None
+    ) -> tuple[Backend, File]:
+        """
+        Selects the backend to load the model.
+
+        Without preferences, the backend with the highest priority
+        handling the file extension is used, or the one handling `*`
+        if none does. With preferences, the
+        backends are tried in the given order and a sibling file
+        with the same name and one of the backend formats is used
+        if it exists, e.g: a converted `model.onnx` next to `model.keras`.
+
+        Args:
+            source: File to load the model from.
+            prefer: Backend names sorted by preference.
+        Returns:
+            tuple[Backend, File]: The backend and the file to load.
+        Raises:
+            NotImplementedError: If no backend handles the file.
         """
-        loader: ModelLoadInterface = (
-            ONNXLoader() if source.path.suffix == ".onnx" else TensorflowLoader()
+        suffix: str = source.suffix
+        for name in prefer or ():
+            if (backend := cls.BACKENDS.get(name)) is None:
+                raise ValueError(f"Unknown backend: {name}")
+            if suffix in backend.formats:
+                return backend, source
+            if not isinstance(source.path, pathlib.Path):
+                continue
+            for fmt in sorted(backend.formats - {"", "*"}):
+                if (sibling := source.path.with_suffix(fmt)).exists():
+                    return backend, File(path=sibling)
+
+        candidates: list[Backend] = sorted(
+            (b for b in cls.BACKENDS.values() if suffix in b.formats),
+            key=lambda b: b.priority,
+            reverse=True,
+        ) or sorted(
+            (b for b in cls.BACKENDS.values() if "*" in b.formats),
+            key=lambda b: b.priority,
+            reverse=True,
         )
+        if not candidates:
+            raise NotImplementedError(
+                f"Unfortunately, there is no backend for loading a '{suffix}' model."
+            )
+        return candidates[0], source
+
+    @classmethod
+    def resolve_and_load(
+        cls,
+        source: File,
+        config: BackendConfig | None = None,
+        prefer: tuple[str, ...] | None = None,
+    ) -> tuple[ModelInterface, File]:
+        """
+        Loads the model from the given file or from the
+        sibling selected by the backend preferences.
+
+        Returns:
+            tuple[ModelInterface, File]: The model and the file
+                it was loaded from.
+        """
         error: Exception | None = None
 
         try:
-            model: ModelInterface = loader.load(source=source)
+            backend, model_file = cls.resolve(source=source, prefer=prefer)
+            loader: ModelLoadInterface = backend.make_loader(config=config)
+            model: ModelInterface = loader.load(source=model_file)
         except Exception as e:  # pylint: disable=broad-exception-caught
             error = e
 
@@ -39,6 +207,19 @@ class Loader:
                 f"Unable to load a model from source: {source.path}"
             ) from error
 
+        return model, model_file
+
+    @classmethod
+    def load(
+        cls,
+        source: File,
+        config: BackendConfig | None = None,
+        prefer: tuple[str, ...] | None = None,
+    ) -> ModelInterface:
+        """
+        Loads the model from the given file.
+        """
+        model, _ = cls.resolve_and_load(source=source, config=config, prefer=prefer)
         return model
 
 
@@ -55,12 +236,100 @@ class Model(Base):
         pass
 
     @classmethod
-    def make(cls, source: File):
+    def make(
+        cls,
+        source: File,
+        config: BackendConfig | None = None,
+        prefer: tuple[str, ...] | None = None,
+    ):
         """
         Creates a new file and loads its content.
+
+        Args:
+            source: File to load the model from.
+            config: Backend configuration.
+            prefer: Backend names sorted by preference. See `Loader.resolve`.
         """
-        model: ModelInterface = Loader.load(source=source)
+        model, source = Loader.resolve_and_load(
+            source=source, config=config, prefer=prefer
+        )
         return Model(
             source=source,
             model=model,
         )
+
+    @classmethod
+    async def amake(
+        cls,
+        source: File,
+        config: BackendConfig | None = None,
+        prefer: tuple[str, ...] | None = None,
+        timeout: float | None = None,
+    ):
+        """
+        Loads the model without blocking the event loop.
+        See `make`.
+
+        Raises:
+            TimeoutError: If the timeout expires.
+        """
+        return await run_blocking(
+            Executors.IO,
+            cls.make,
+            source=source,
+            config=config,
+            prefer=prefer,
+            timeout=timeout,
+        )
+
+    async def apredict(
+        self, sample: numpy.ndarray, timeout: float | None = None
+    ) -> numpy.ndarray:
+        """
+        Generates a prediction without blocking the event loop.
+        The model runs in the shared predict pool, so the number
+        of concurrent predictions is bounded.
+
+        Args:
+            sample: Sample to generate the prediction.
+            timeout: Maximum seconds to wait. None waits forever.
+        Returns:
+            numpy.ndarray: Prediction for the sample.
+        Raises:
+            TimeoutError: If the timeout expires.
+        """
+        return await run_blocking(
+            Executors.PREDICT, self.model.predict, sample, timeout=timeout
+        )
+
+    def predict_images(
+        self,
+        images: Iterable[Image],
+        transform: ModelImageInterface | None = None,
+        batch_size: int = 32,
+    ) -> Iterator[tuple[Image, numpy.ndarray]]:
+        """
+        Generate a prediction for each image, grouping
+        them in batches to reduce the per call overhead.
+
+        Args:
+            images: Images to generate the predictions.
+            transform: Transforms each image into a sample. If not
+                provided, the image content is used as the sample.
+            batch_size: Samples per batch. Ignored if the model
+                declares a fixed batch size.
+        Returns:
+            Iterator[tuple[Image, numpy.ndarray]]: Each image with
+                its prediction, in the same order as the images.
+        """
+        pending: collections.deque[Image] = collections.deque()
+
+        def __samples() -> Iterator[numpy.ndarray]:
+            for image in images:
+                pending.append(image)
+                yield image.content if transform is None else transform.transform(image)
+
+        for prediction in self.model.iter_predict(
+            samples=__samples(), batch_size=batch_size
+        ):
+            yield pending.popleft(), prediction
@@ -4,9 +4,73 @@ related with the model schema.
 """
 
 import abc
+import itertools
+import threading
+from typing import Iterable, Iterator
 import numpy
 from src.file.file import File
 from src.image.image import Image
+from src.utils.pool import BufferPool
+
+
+class InputCaster:
+    """
+    Casts the samples to the model's input dtype. The cast
+    is done into a buffer that is reused while the sample shape
+    doesn't change, so images can be kept in their native dtype
+    until they are used as model input.
+
+    Attributes:
+        buffers (threading.local): Cast buffer for each thread.
+    """
+
+    def __init__(self) -> None:
+        self.buffers = threading.local()
+
+    def cast(self, sample: numpy.ndarray, dtype: str) -> numpy.ndarray:
+        """
+        Casts the sample to the given dtype.
+
+        Args:
+            sample: Sample to cast.
+            dtype: Desired dtype.
+        Returns:
+            numpy.ndarray: The sample itself if it already has the
+                desired dtype, otherwise a buffer with the cast values.
+                The buffer is overwritten on the next call.
+        """
+        target = numpy.dtype(dtype)
+        if sample.dtype == target:
+            return sample
+
+        buffer: numpy.ndarray | None = getattr(self.buffers, "buffer", None)
+        if buffer is None or buffer.shape != sample.shape or buffer.dtype != target:
+            buffer = numpy.empty(sample.shape, dtype=target)
+            self.buffers.buffer = buffer
+        numpy.copyto(buffer, sample, casting="unsafe")
+        return buffer
+
+
+def _check_shape(expected: tuple, shape: tuple) -> None:
+    """
+    Checks the shape of a sample. The expected dimensions
+    which aren't positive integers are dynamic.
+    """
+    if len(shape) != len(expected) or any(
+        isinstance(e, int) and e > 0 and e != s for e, s in zip(expected, shape)
+    ):
+        raise ValueError(f"Expected a sample of shape {expected}, found {shape} instead")
+
+
+def _fill(batch: numpy.ndarray, chunk: list[numpy.ndarray]) -> None:
+    """
+    Copies the samples into the batch. The rest of the batch
+    is zeroed, so the backend always sees the same shape.
+    """
+    for idx, sample in enumerate(chunk):
+        _check_shape(expected=batch.shape[1:], shape=sample.shape)
+        batch[idx] = sample
+    batch[len(chunk) :] = 0
 
 
 class ModelInterface(abc.ABC):
@@ -27,6 +91,115 @@ class ModelInterface(abc.ABC):
             numpy.ndarray: Result prediction.
         """
 
+    def predict_batch(
+        self, samples: Iterable[numpy.ndarray], batch_size: int = 32
+    ) -> list[numpy.ndarray]:
+        """
+        Generate a prediction for each one of the given samples,
+        running one backend call per batch.
+
+        Args:
+            samples: Samples to generate the predictions. All of
+                them should have the same shape.
+            batch_size: Samples per batch. Ignored if the model
+                declares a fixed batch size.
+
+        Returns:
+            list[numpy.ndarray]: One prediction per sample.
+        """
+        return list(self.iter_predict(samples=samples, batch_size=batch_size))
+
+    def iter_predict(
+        self, samples: Iterable[numpy.ndarray], batch_size: int = 32
+    ) -> Iterator[numpy.ndarray]:
+        """
+        Lazy version of `predict_batch`. The samples are consumed
+        one batch at a time, so it is possible to stream them.
+        The batch buffer is taken from the shared `BufferPool`
+        and returned once the samples are exhausted.
+
+        Args:
+            samples: Samples to generate the predictions. All of
+                them should have the same shape.
+            batch_size: Maximum samples per batch. Ignored if the
+                model declares a fixed batch size. The pooled buffer
+                is sized for it, so pass the same maximum on every
+                call to reuse the buffer for smaller batches.
+
+        Returns:
+            Iterator[numpy.ndarray]: One prediction per sample,
+                in the same order as the samples.
+        Raises:
+            ValueError: If the samples don't share the same shape.
+        """
+        size: int = self.batch_size or batch_size
+        if size <= 0:
+            raise ValueError(f"Invalid batch size: {size}")
+
+        pool: BufferPool = BufferPool.shared()
+        batch: numpy.ndarray | None = None
+        iterator = iter(samples)
+        try:
+            while chunk := list(itertools.islice(iterator, size)):
+                if batch is None:
+                    batch = self.__acquire(pool=pool, size=size, sample=chunk[0])
+                # The models with a dynamic batch size only get the
+                # filled part of the buffer.
+                filled = batch if self.batch_size else batch[: len(chunk)]
+                _fill(batch=filled, chunk=chunk)
+                outputs: numpy.ndarray = self.predict(filled)
+                yield from outputs[: len(chunk)].copy()
+        finally:
+            if batch is not None:
+                pool.release(batch)
+
+    def __acquire(
+        self, pool: BufferPool, size: int, sample: numpy.ndarray
+    ) -> numpy.ndarray:
+        """
+        Checks the first sample and takes a buffer for
+        batches of samples like it.
+        """
+        if (expected := self.sample_shape) is not None:
+            _check_shape(expected=expected, shape=sample.shape)
+        return pool.acquire((size, *sample.shape), self.input_dtype)
+
+    @property
+    def sample_shape(self) -> tuple | None:
+        """
+        Returns the dimensions of one sample, i.e: the input
+        layer without the batch dimension.
+
+        Returns:
+            tuple | None: The dimensions or None if they aren't
+                known, e.g: the model has several input layers.
+        """
+        try:
+            return tuple(self.input_shape[1:])
+        except ValueError:
+            return None
+
+    @property
+    def resident_size(self) -> int:
+        """
+        Returns the approximate memory used by the model.
+
+        Returns:
+            int: Size in bytes. 0 if the backend can't estimate it.
+        """
+        return 0
+
+    @property
+    def batch_size(self) -> int | None:
+        """
+        Returns the batch size declared by the input layer.
+
+        Returns:
+            int | None: Fixed batch size or None if the
+                model accepts batches of any size.
+        """
+        return None
+
     @property
     @abc.abstractmethod
     def input_shape(self) -> tuple[int, ...]:
@@ -57,9 +230,23 @@ class ModelInterface(abc.ABC):
 
 class ModelLoadInterface(abc.ABC):
     """
-    Common operations to load a model.
+    Common operations to load a model. The attributes
+    describe the backend built by `Backend.from_loader`.
+
+    Attributes:
+        FORMATS (frozenset[str]): File extensions the loader
+            handles, starting with a dot. An empty string
+            stands for files or folders without extension.
+        PRIORITY (int): Preference when several loaders
+            handle the same format. The highest wins.
+        CONFIG (type | None): Configuration class accepted
+            by the loader.
     """
 
+    FORMATS: frozenset[str] = frozenset()
+    PRIORITY: int = 0
+    CONFIG: type | None = None
+
     @abc.abstractmethod
     def load(self, source: File) -> ModelInterface:
         """
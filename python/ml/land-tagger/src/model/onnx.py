@@ -3,14 +3,22 @@ Loads a model from a ONNX file
 to perform predictions.
 """
 
+import os
 import re
 import types
+import hashlib
+import pathlib
 import numpy
 
 # pylint: disable=import-error, no-name-in-module
 from onnx.mapping import TENSOR_TYPE_MAP
 import onnxruntime as ort
-from src.model.model_interfaces import ModelInterface, ModelLoadInterface
+from src.model.model_interfaces import (
+    InputCaster,
+    ModelInterface,
+    ModelLoadInterface,
+)
+from src.model.config import ONNXSessionConfig
 from src.file.file import File
 
 
@@ -35,6 +43,112 @@ _onnx_to_numpy = types.MappingProxyType(_onnx_get_match_to_numpy())
 # Extract the dtype
 _onnx_get_dtype = re.compile(r"^tensor\(([a-z0-9]+)\)")
 
+_onnx_execution_modes = types.MappingProxyType(
+    {
+        "sequential": ort.ExecutionMode.ORT_SEQUENTIAL,
+        "parallel": ort.ExecutionMode.ORT_PARALLEL,
+    }
+)
+
+_onnx_optimization_levels = types.MappingProxyType(
+    {
+        "disabled": ort.GraphOptimizationLevel.ORT_DISABLE_ALL,
+        "basic": ort.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+        "extended": ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+        "all": ort.GraphOptimizationLevel.ORT_ENABLE_ALL,
+    }
+)
+
+
+class BoundSession:
+    """
+    Runs a fixed-shape model through ONNX Runtime's IOBinding.
+    The input and output buffers are allocated once and bound
+    to the session, so each run neither copies the input nor
+    allocates new outputs. Not thread-safe, use one bound
+    session per thread.
+
+    Attributes:
+        session (ort.InferenceSession): ONNX session to run predictions.
+        binding (ort.IOBinding): Buffers bound to the session.
+        input (numpy.ndarray): Input buffer. Writing the sample
+            directly here avoids any copy.
+        outputs (list[numpy.ndarray]): Output buffers, overwritten
+            on each run.
+    """
+
+    def __init__(
+        self,
+        session: ort.InferenceSession,
+        shape: tuple[int, ...],
+        dtype: str,
+        input: numpy.ndarray | None = None,  # pylint: disable=redefined-builtin
+    ) -> None:
+        """
+        Args:
+            session: ONNX session to run predictions.
+            shape: Input shape, including the batch dimension.
+            dtype: Input dtype.
+            input: Buffer to bind as the input, e.g: a shared
+                memory block the samples are written to. If not
+                provided, a new one is allocated.
+        Raises:
+            ValueError: If the input buffer isn't C-contiguous or
+                its shape or dtype don't match.
+        """
+        if input is None:
+            input = numpy.zeros(shape, dtype=dtype)
+        elif not input.flags.c_contiguous:
+            raise ValueError("The input buffer must be C-contiguous")
+        elif input.shape != tuple(shape) or input.dtype != numpy.dtype(dtype):
+            raise ValueError(
+                f"Expected an input buffer of shape {tuple(shape)} and dtype "
+                f"{dtype}, found {input.shape} and {input.dtype} instead"
+            )
+        self.session = session
+        self.binding: ort.IOBinding = session.io_binding()
+        self.input: numpy.ndarray = input
+        self.outputs: list[numpy.ndarray] = []
+        self.__bind(name=session.get_inputs()[0].name)
+
+    def __bind_buffer(self, name: str, buffer: numpy.ndarray, is_input: bool) -> None:
+        bind = self.binding.bind_input if is_input else self.binding.bind_output
+        bind(name, "cpu", 0, buffer.dtype, buffer.shape, buffer.ctypes.data)
+
+    def __bind(self, name: str) -> None:
+        """
+        Binds the input buffer and allocates the outputs. The
+        output shapes may be symbolic, so they are retrieved
+        from a first run with the bound input.
+        """
+        self.__bind_buffer(name=name, buffer=self.input, is_input=True)
+        results: list[numpy.ndarray] = self.session.run(None, {name: self.input})
+        for layer, result in zip(self.session.get_outputs(), results):
+            buffer: numpy.ndarray = numpy.empty_like(result)
+            self.__bind_buffer(name=layer.name, buffer=buffer, is_input=False)
+            self.outputs.append(buffer)
+
+    def run(self, sample: numpy.ndarray | None = None) -> list[numpy.ndarray]:
+        """
+        Runs the model with the bound buffers.
+
+        Args:
+            sample: Sample to copy into the input buffer. If not
+                provided, the current content of `input` is used.
+        Returns:
+            list[numpy.ndarray]: The output buffers. Their content
+                is overwritten on the next run.
+        """
+        if sample is not None:
+            if sample.shape != self.input.shape:
+                raise ValueError(
+                    f"Expected a sample of shape {self.input.shape}, "
+                    f"found {sample.shape} instead"
+                )
+            numpy.copyto(self.input, sample, casting="unsafe")
+        self.session.run_with_iobinding(self.binding)
+        return self.outputs
+
 
 class ONNXModel(ModelInterface):
     """
@@ -43,11 +157,15 @@ class ONNXModel(ModelInterface):
 
     Attributes:
         session (ort.InferenceSession): ONNX session to run predictions.
+        model_size (int): Size in bytes of the serialized model.
+        caster (InputCaster): Casts the samples to the input layer dtype.
     """
 
-    def __init__(self, session: ort.InferenceSession) -> None:
+    def __init__(self, session: ort.InferenceSession, model_size: int = 0) -> None:
         self.session = session
+        self.model_size = model_size
         self.input_layer = self.__get_input_layers()
+        self.caster = InputCaster()
 
     def __get_input_layers(self) -> ort.NodeArg:
         """
@@ -66,13 +184,59 @@ class ONNXModel(ModelInterface):
         return model_inputs[0]
 
     def predict(self, sample: numpy.ndarray) -> numpy.ndarray:
+        sample = self.caster.cast(sample=sample, dtype=self.input_dtype)
         outputs = self.session.run(None, {self.input_layer.name: sample})
         return outputs[0]
 
+    def bind(
+        self,
+        shape: tuple[int, ...] | None = None,
+        input: numpy.ndarray | None = None,  # pylint: disable=redefined-builtin
+    ) -> BoundSession:
+        """
+        Creates a bound session for steady-state serving of
+        samples with a fixed shape.
+
+        Args:
+            shape: Input shape, including the batch dimension. If
+                not provided, the input layer's shape is used.
+            input: Buffer to bind as the input, as-is. If not
+                provided, a new one is allocated.
+        Returns:
+            BoundSession: Session with preallocated buffers.
+        Raises:
+            ValueError: If the input shape has dynamic dimensions
+                or the input buffer doesn't match it.
+        """
+        input_shape: tuple = shape or self.input_shape
+        if not all(isinstance(dim, int) and dim > 0 for dim in input_shape):
+            raise ValueError(
+                f"A fixed input shape is required to bind the session: {input_shape}"
+            )
+        return BoundSession(
+            session=self.session,
+            shape=input_shape,
+            dtype=self.input_dtype,
+            input=input,
+        )
+
     @property
     def input_shape(self) -> tuple[int, ...]:
         return tuple(self.input_layer.shape)
 
+    @property
+    def resident_size(self) -> int:
+        # The initializers dominate the session's memory.
+        return self.model_size
+
+    @property
+    def batch_size(self) -> int | None:
+        # Dynamic dimensions are reported as strings or None.
+        shape: list = self.input_layer.shape
+        if shape and isinstance(shape[0], int) and shape[0] > 0:
+            return shape[0]
+        return None
+
     @property
     def input_dtype(self) -> str:
         dtype: str = self.input_layer.type
@@ -88,8 +252,83 @@ class ONNXModel(ModelInterface):
 class ONNXLoader(ModelLoadInterface):
     """
     Load a model using ONNX.
+
+    Attributes:
+        config (ONNXSessionConfig): Session configuration.
     """
 
+    def __init__(self, config: ONNXSessionConfig | None = None) -> None:
+        self.config = config or ONNXSessionConfig()
+
+    def __session_options(self) -> ort.SessionOptions:
+        """
+        Translates the configuration into ONNX Runtime options.
+        """
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = self.config.intra_op_num_threads
+        options.inter_op_num_threads = self.config.inter_op_num_threads
+        options.execution_mode = _onnx_execution_modes[self.config.execution_mode]
+        options.graph_optimization_level = _onnx_optimization_levels[
+            self.config.graph_optimization_level
+        ]
+        options.enable_cpu_mem_arena = self.config.enable_mem_arena
+        options.enable_mem_pattern = self.config.enable_mem_pattern
+        return options
+
+    def __optimized_path(self, source: File) -> pathlib.Path | None:
+        """
+        Returns the location of the optimized graph for the
+        given model. The name depends on the model content, the
+        execution providers, the ONNX Runtime version and the
+        optimization level, so stale graphs are never reused.
+        """
+        if self.config.optimized_model_dir is None:
+            return None
+        digest: str = source.digest()
+        # The graph is fused for the providers, in order of preference.
+        providers: list = list(self.config.providers or ort.get_available_providers())
+        runtime: str = hashlib.sha256(
+            f"{ort.__version__}\0{providers!r}".encode()
+        ).hexdigest()[:16]
+        level: str = self.config.graph_optimization_level
+        return self.config.optimized_model_dir.joinpath(
+            f"{digest}.{runtime}.{level}.onnx"
+        )
+
+    def __model(self, source: File) -> bytes | str:
+        """
+        Returns the model as ONNX Runtime expects it. Local files
+        are read by ONNX Runtime from their path, so the model
+        isn't copied into a bytes object.
+        """
+        if isinstance(source.content, bytes):
+            return source.content
+        if source.is_local:
+            return str(source.path)
+        return bytes(source.load())
+
+    def __session(
+        self, model: bytes | str, options: ort.SessionOptions
+    ) -> ort.InferenceSession:
+        return ort.InferenceSession(
+            model, sess_options=options, providers=self.config.providers
+        )
+
     def load(self, source: File) -> ModelInterface:
-        onnx_inference: ort.InferenceSession = ort.InferenceSession(source.load())
-        return ONNXModel(session=onnx_inference)
+        options: ort.SessionOptions = self.__session_options()
+        optimized: pathlib.Path | None = self.__optimized_path(source=source)
+
+        if optimized is not None and optimized.exists():
+            # The graph is already optimized, skip the optimizations.
+            options.graph_optimization_level = _onnx_optimization_levels["disabled"]
+            session = self.__session(model=str(optimized), options=options)
+        elif optimized is not None:
+            optimized.parent.mkdir(parents=True, exist_ok=True)
+            staging: pathlib.Path = optimized.with_suffix(f".{os.getpid()}.tmp")
+            options.optimized_model_filepath = str(staging)
+            session = self.__session(model=self.__model(source=source), options=options)
+            os.replace(staging, optimized)
+        else:
+            session = self.__session(model=self.__model(source=source), options=options)
+
+        return ONNXModel(session=session, model_size=source.size())
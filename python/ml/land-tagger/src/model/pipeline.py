@@ -0,0 +1,416 @@
+"""
+This module runs the predictions for many images,
+overlapping the retrieval, decoding and inference of
+the images instead of running them one after another.
+"""
+
+import os
+import time
+import functools
+import queue
+import pathlib
+import threading
+import dataclasses
+import multiprocessing
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Generator, Iterable, Iterator
+import numpy
+from src.utils.base import Base, dataclass
+from src.utils.shared import SharedArray
+from src.file.file import File
+from src.image.image import Image, LoadOptions, Loader as ImageLoader
+from src.model.model import Model
+from src.model.model_interfaces import ModelImageInterface
+
+
+@dataclass
+class PipelineConfig(Base):
+    """
+    Concurrency settings for each stage of the pipeline.
+
+    Attributes:
+        fetch_workers (int): Threads retrieving the remote files.
+        decode_workers (int): Processes decoding the images. 0
+            decodes them in the fetch threads instead.
+        shared_memory (bool): Hand the images decoded by other
+            processes over through shared memory instead of pickling
+            them. See `SharedArray`.
+        max_pending (int): Maximum images in flight, from being
+            retrieved until they are yielded. Bounds the memory
+            used and stops reading the sources while it's reached.
+        batch_size (int): Maximum images per inference call.
+        ordered (bool): Yield the predictions in the same order as
+            the sources. Otherwise, they are yielded as they complete.
+    """
+
+    fetch_workers: int = 8
+    decode_workers: int = os.cpu_count() or 1
+    shared_memory: bool = True
+    max_pending: int = 64
+    batch_size: int = 32
+    ordered: bool = True
+
+    def __check_values__(self):
+        if self.fetch_workers <= 0 or self.decode_workers < 0:
+            raise ValueError("Invalid number of workers")
+        if self.max_pending <= 0:
+            raise ValueError(f"Invalid maximum pending images: {self.max_pending}")
+        if self.batch_size <= 0:
+            raise ValueError(f"Invalid batch size: {self.batch_size}")
+
+
+@dataclass
+class StageStats(Base):
+    """
+    Timings for a pipeline stage.
+
+    Attributes:
+        items (int): Images processed by the stage.
+        busy_time (float): Total seconds spent by the workers.
+        elapsed (float): Seconds since the pipeline started until
+            the stage processed its last image.
+    """
+
+    items: int = 0
+    busy_time: float = 0.0
+    elapsed: float = 0.0
+
+    def __check_values__(self):
+        pass
+
+    @property
+    def throughput(self) -> float:
+        """
+        Returns the images processed per second.
+        """
+        return self.items / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def mean_time(self) -> float:
+        """
+        Returns the average seconds spent per image.
+        """
+        return self.busy_time / self.items if self.items else 0.0
+
+
+@dataclass
+class PipelineStats(Base):
+    """
+    Timings for each stage of the pipeline.
+    """
+
+    fetch: StageStats
+    decode: StageStats
+    predict: StageStats
+
+    def __check_values__(self):
+        pass
+
+
+@dataclasses.dataclass
+class _Item:
+    """
+    An image moving through the pipeline.
+    """
+
+    index: int
+    image: Image | None = None
+    error: BaseException | None = None
+
+
+@dataclasses.dataclass
+class _Progress:
+    """
+    Images released to be predicted and the number of
+    sources, once all of them have been read.
+    """
+
+    released: int = 0
+    total: int = -1
+
+    @property
+    def finished(self) -> bool:
+        """
+        Returns True once all the images have been released.
+        """
+        return self.released == self.total
+
+
+def _decode(
+    file: File, options: LoadOptions, shared: bool = False
+) -> tuple[numpy.ndarray | SharedArray, dict, float]:
+    """
+    Decodes the image. It runs in the decode processes, which
+    may place the content in shared memory to avoid pickling it.
+    """
+    started_at: float = time.perf_counter()
+    content, metadata = ImageLoader.load(file=file, options=options)
+    if shared:
+        return SharedArray.create(content), metadata, time.perf_counter() - started_at
+    return content, metadata, time.perf_counter() - started_at
+
+
+class Pipeline:
+    # pylint: disable=too-many-instance-attributes
+    """
+    Generates the predictions for many images. The files are
+    retrieved by a thread pool and decoded by a process pool
+    while the previous images are being predicted. The stages
+    are bounded by `max_pending`, so a slow stage stops the
+    sources from being read instead of accumulating images.
+
+    Attributes:
+        model (Model): Model used to generate the predictions.
+        config (PipelineConfig): Concurrency settings.
+        transform (ModelImageInterface | None): Transforms each
+            image into a sample.
+        options (LoadOptions): Decoding options.
+    """
+
+    def __init__(
+        self,
+        model: Model,
+        config: PipelineConfig | None = None,
+        transform: ModelImageInterface | None = None,
+        options: LoadOptions | None = None,
+    ) -> None:
+        self.model = model
+        self.config = config or PipelineConfig()
+        self.transform = transform
+        self.options = options or LoadOptions()
+        self._fetch_pool = ThreadPoolExecutor(
+            max_workers=self.config.fetch_workers, thread_name_prefix="pipeline-fetch"
+        )
+        self._decode_pool: Executor = self._fetch_pool
+        if self.config.decode_workers:
+            # Forking a process with running threads isn't safe.
+            self._decode_pool = ProcessPoolExecutor(
+                max_workers=self.config.decode_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        self._shared: bool = (
+            self.config.shared_memory and self._decode_pool is not self._fetch_pool
+        )
+        self._stats = PipelineStats(
+            fetch=StageStats(), decode=StageStats(), predict=StageStats()
+        )
+        self._started_at: float = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "Pipeline":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Stops the workers.
+        """
+        self._fetch_pool.shutdown(wait=True, cancel_futures=True)
+        self._decode_pool.shutdown(wait=True, cancel_futures=True)
+
+    @property
+    def stats(self) -> PipelineStats:
+        """
+        Returns a snapshot of the timings of each stage.
+        """
+        with self._lock:
+            return PipelineStats(
+                fetch=dataclasses.replace(self._stats.fetch),
+                decode=dataclasses.replace(self._stats.decode),
+                predict=dataclasses.replace(self._stats.predict),
+            )
+
+    def __record(self, stage: StageStats, items: int, busy_time: float) -> None:
+        with self._lock:
+            stage.items += items
+            stage.busy_time += busy_time
+            stage.elapsed = time.perf_counter() - self._started_at
+
+    def __fetch(self, file: File) -> File:
+        """
+        Retrieves the remote files. The local files are read
+        by the decoders from their path.
+        """
+        started_at: float = time.perf_counter()
+        if not file.content and not file.is_local:
+            file.load()
+        if isinstance(file.content, memoryview) and isinstance(
+            self._decode_pool, ProcessPoolExecutor
+        ):
+            # The views can't be sent to other processes.
+            file = File(path=file.path, content=bytes(file.content))
+        self.__record(self._stats.fetch, 1, time.perf_counter() - started_at)
+        return file
+
+    def __fetched(self, fetched: Future, index: int, results: queue.Queue) -> None:
+        """
+        Sends the retrieved file to be decoded.
+        """
+        def __decoded(decoded: Future) -> None:
+            if decoded.cancelled():
+                return
+            if (error := decoded.exception()) is not None:
+                results.put(_Item(index=index, error=error))
+                return
+            content, metadata, busy_time = decoded.result()
+            if isinstance(content, SharedArray):
+                try:
+                    content = content.attach()
+                except OSError as e:
+                    results.put(_Item(index=index, error=e))
+                    return
+            self.__record(self._stats.decode, 1, busy_time)
+            image = Image(source=file, content=content, metadata=metadata)
+            results.put(_Item(index=index, image=image))
+
+        if fetched.cancelled():
+            return
+        if (error := fetched.exception()) is not None:
+            results.put(_Item(index=index, error=error))
+            return
+
+        file: File = fetched.result()
+        try:
+            future: Future = self._decode_pool.submit(
+                _decode, file, self.options, self._shared
+            )
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            results.put(_Item(index=index, error=e))
+            return
+        future.add_done_callback(__decoded)
+
+    def __feed(
+        self,
+        sources: Iterable[File | pathlib.Path | str],
+        slots: threading.Semaphore,
+        results: queue.Queue,
+        stop: threading.Event,
+    ) -> None:
+        """
+        Reads the sources while there are free slots.
+        Once done, sends the number of sources.
+        """
+        index: int = 0
+        try:
+            for source in sources:
+                while not slots.acquire(timeout=0.1):
+                    if stop.is_set():
+                        return
+                if stop.is_set():
+                    return
+                file: File = source if isinstance(source, File) else File(path=source)
+                future: Future = self._fetch_pool.submit(self.__fetch, file)
+                future.add_done_callback(
+                    functools.partial(self.__fetched, index=index, results=results)
+                )
+                index += 1
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            results.put(_Item(index=index, error=e))
+            index += 1
+        results.put(index)
+
+    def __take(
+        self, results: queue.Queue, waiting: dict[int, _Item], progress: _Progress
+    ) -> list[_Item]:
+        """
+        Waits for at least one image ready to be predicted and
+        takes the ones already available, up to a full batch.
+        """
+        ready: list[_Item] = []
+        while True:
+            # The previous call may have left the next images waiting.
+            while waiting and len(ready) < self.config.batch_size:
+                if self.config.ordered:
+                    if progress.released not in waiting:
+                        break
+                    ready.append(waiting.pop(progress.released))
+                else:
+                    ready.append(waiting.pop(next(iter(waiting))))
+                progress.released += 1
+            if len(ready) == self.config.batch_size or progress.finished:
+                break
+
+            try:
+                # Only wait if there is nothing to predict yet.
+                received: _Item | int = results.get(block=not ready)
+            except queue.Empty:
+                break
+            if isinstance(received, int):
+                progress.total = received
+            else:
+                waiting[received.index] = received
+        return ready
+
+    def run(
+        self, sources: Iterable[File | pathlib.Path | str]
+    ) -> Generator[tuple[Image, numpy.ndarray], None, None]:
+        """
+        Generates a prediction for each source. Close the
+        generator to stop reading the sources early.
+
+        Args:
+            sources: Files, paths or URIs of the images.
+        Returns:
+            Generator[tuple[Image, numpy.ndarray], None, None]: Each image
+                with its prediction, in the same order as the sources if `ordered`
+                is set, or as soon as they are ready otherwise.
+        Raises:
+            RuntimeError: If an image can't be retrieved or decoded.
+        """
+        slots = threading.Semaphore(self.config.max_pending)
+        results: queue.Queue = queue.Queue()
+        stop = threading.Event()
+        feeder = threading.Thread(
+            target=self.__feed,
+            args=(sources, slots, results, stop),
+            name="pipeline-feed",
+            daemon=True,
+        )
+        with self._lock:
+            self._stats = PipelineStats(
+                fetch=StageStats(), decode=StageStats(), predict=StageStats()
+            )
+            self._started_at = time.perf_counter()
+        feeder.start()
+
+        waiting: dict[int, _Item] = {}
+        progress = _Progress()
+        try:
+            while not progress.finished:
+                ready: list[_Item] = self.__take(results, waiting, progress)
+                yield from self.__predict(ready)
+                for _ in ready:
+                    slots.release()
+        finally:
+            stop.set()
+            feeder.join()
+
+    def __predict(self, ready: list[_Item]) -> Iterator[tuple[Image, numpy.ndarray]]:
+        """
+        Predicts a batch of images.
+        """
+        images: list[Image] = []
+        for item in ready:
+            if item.error is not None:
+                raise RuntimeError(
+                    f"Unable to process the image #{item.index}"
+                ) from item.error
+            if item.image is not None:
+                images.append(item.image)
+        if not images:
+            return
+
+        started_at: float = time.perf_counter()
+        predictions: list[tuple[Image, numpy.ndarray]] = list(
+            self.model.predict_images(
+                images=images,
+                transform=self.transform,
+                batch_size=self.config.batch_size,
+            )
+        )
+        self.__record(
+            self._stats.predict, len(predictions), time.perf_counter() - started_at
+        )
+        yield from predictions
@@ -0,0 +1,324 @@
+"""
+This module transforms the images into model samples:
+resize, band selection, normalization and cast. The steps
+are planned once per image shape and run into buffers that
+are reused between images.
+"""
+
+import threading
+import dataclasses
+import numpy
+from src.utils.base import Base, dataclass
+from src.image.image import Image
+from src.model.model_interfaces import ModelImageInterface, ModelInterface
+
+
+@dataclass
+class PreprocessingConfig(Base):
+    # pylint: disable=too-many-instance-attributes
+    """
+    Steps to transform an image into a sample. The values are
+    normalized as `(value * scale - mean) / std`.
+
+    Attributes:
+        size (tuple | None): Sample (height, width). If not provided,
+            it is taken from the model's input shape.
+        bands (tuple | None): Indexes of the bands to keep, in the
+            desired order. None keeps all of them.
+        scale (float): Factor applied before the normalization,
+            e.g: 1 / 255.
+        mean (tuple | None): Mean of each band.
+        std (tuple | None): Standard deviation of each band.
+        resize (str): `nearest` or `bilinear`.
+        channels_first (bool): Use the (bands, height, width) layout.
+        batch_dim (bool): Add a leading batch dimension, to pass
+            the sample directly to `ModelInterface.predict`.
+    """
+
+    RESIZE_METHODS = ("nearest", "bilinear")
+
+    size: tuple | None = None
+    bands: tuple | None = None
+    scale: float = 1.0
+    mean: tuple | None = None
+    std: tuple | None = None
+    resize: str = "bilinear"
+    channels_first: bool = False
+    batch_dim: bool = False
+
+    def __check_values__(self):
+        if self.size is not None and (len(self.size) != 2 or min(self.size) <= 0):
+            raise ValueError(f"Invalid sample size: {self.size}")
+        if self.resize not in PreprocessingConfig.RESIZE_METHODS:
+            raise ValueError(f"Invalid resize method: {self.resize}")
+        if self.std is not None and 0 in self.std:
+            raise ValueError("The standard deviation can't be zero")
+
+
+@dataclasses.dataclass
+class _Axis:
+    """
+    Source indexes to resize an axis. The bilinear resize
+    blends two source pixels using the weights.
+    """
+
+    first: numpy.ndarray
+    second: numpy.ndarray
+    weights: tuple[numpy.ndarray, numpy.ndarray] | None
+
+    @classmethod
+    def make(
+        cls, source: int, target: int, bilinear: bool, axis: int
+    ) -> "_Axis | None":
+        """
+        Computes the source pixels for each target pixel. The
+        pixel centers are aligned, as Pillow and OpenCV do.
+        None if the axis isn't resized.
+        """
+        if source == target:
+            return None
+
+        center = (numpy.arange(target) + 0.5) * (source / target)
+        if not bilinear:
+            nearest = numpy.minimum(center.astype(numpy.intp), source - 1)
+            return _Axis(first=nearest, second=nearest, weights=None)
+
+        position = numpy.clip(center - 0.5, 0, source - 1)
+
+        first = numpy.floor(position).astype(numpy.intp)
+        # Broadcast the weights along the resized axis.
+        weight = (position - first).astype(numpy.float32).reshape(
+            (-1, 1, 1) if axis == 0 else (1, -1, 1)
+        )
+        return _Axis(
+            first=first,
+            second=numpy.minimum(first + 1, source - 1),
+            weights=(1 - weight, weight),
+        )
+
+
+@dataclasses.dataclass
+class _Plan:
+    """
+    Precomputed steps for an image shape.
+    """
+
+    rows: _Axis | None
+    cols: _Axis | None
+    bands: numpy.ndarray | None
+    factor: numpy.ndarray
+    offset: numpy.ndarray
+    shape: tuple[int, ...]
+
+
+class Preprocessing(ModelImageInterface):
+    """
+    Transforms the images into samples for a model. The
+    indexes and weights are computed once per image shape and
+    the intermediate arrays are kept for each thread, so the
+    only allocation per image is the returned sample. Use
+    `transform_into` to write the sample into an existing array,
+    e.g: a batch, without any allocation.
+
+    Attributes:
+        config (PreprocessingConfig): Steps to run.
+        dtype (numpy.dtype): Sample dtype.
+    """
+
+    def __init__(self, config: PreprocessingConfig, dtype: str = "float32") -> None:
+        if config.size is None:
+            raise ValueError("The sample size is required")
+        self.config = config
+        self.dtype = numpy.dtype(dtype)
+        self._plans: dict[tuple, _Plan] = {}
+        self._buffers = threading.local()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_model(
+        cls, model: ModelInterface, config: PreprocessingConfig | None = None
+    ) -> "Preprocessing":
+        """
+        Creates the preprocessing for the given model. The sample
+        size and dtype are taken from the model's input layer.
+
+        Args:
+            model: Model using the samples.
+            config: Steps to run. The size is only required if the
+                model accepts any size.
+        Raises:
+            ValueError: If the model's input isn't an image.
+        """
+        config = config or PreprocessingConfig()
+        shape: tuple = tuple(model.input_shape)
+        if len(shape) < 3:
+            raise ValueError(f"The model's input isn't an image: {shape}")
+
+        if config.size is None:
+            size: tuple = shape[-2:] if config.channels_first else shape[-3:-1]
+            if not all(isinstance(s, int) and s > 0 for s in size):
+                raise ValueError(f"Please provide the sample size for {shape}")
+            config = dataclasses.replace(config, size=tuple(size))
+        return cls(config=config, dtype=model.input_dtype)
+
+    def __bands(self, bands: int) -> numpy.ndarray | None:
+        """
+        Returns the indexes of the selected bands.
+        """
+        if self.config.bands is None:
+            return None
+        selected = numpy.asarray(self.config.bands, dtype=numpy.intp)
+        if selected.min() < 0 or selected.max() >= bands:
+            raise ValueError(f"Invalid bands {self.config.bands} for {bands} bands")
+        return selected
+
+    def __normalization(self, bands: int) -> tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        Folds the scale, mean and std into a factor and an offset:
+        (value * scale - mean) / std == value * factor + offset
+        """
+        mean = numpy.asarray(self.config.mean or (0.0,) * bands, dtype=numpy.float64)
+        std = numpy.asarray(self.config.std or (1.0,) * bands, dtype=numpy.float64)
+        if mean.shape != (bands,) or std.shape != (bands,):
+            raise ValueError(f"Expected a mean and std for each of the {bands} bands")
+        return (
+            (self.config.scale / std).astype(numpy.float32),
+            (-mean / std).astype(numpy.float32),
+        )
+
+    def __shape(self, size: tuple, bands: int) -> tuple[int, ...]:
+        """
+        Returns the sample shape.
+        """
+        shape: tuple[int, ...] = (
+            (bands, *size) if self.config.channels_first else (*size, bands)
+        )
+        return (1, *shape) if self.config.batch_dim else shape
+
+    def __plan(self, content: numpy.ndarray) -> _Plan:
+        """
+        Returns the plan for the given image shape,
+        computing it on the first use.
+        """
+        if (plan := self._plans.get(content.shape)) is not None:
+            return plan
+
+        height, width, bands = content.shape
+        size: tuple = self.config.size or (height, width)
+        selected: numpy.ndarray | None = self.__bands(bands)
+        count: int = bands if selected is None else len(selected)
+        normalization = self.__normalization(count)
+
+        plan = _Plan(
+            rows=_Axis.make(height, size[0], self.config.resize == "bilinear", axis=0),
+            cols=_Axis.make(width, size[1], self.config.resize == "bilinear", axis=1),
+            bands=selected,
+            factor=normalization[0],
+            offset=normalization[1],
+            shape=self.__shape(size=size, bands=count),
+        )
+        with self._lock:
+            self._plans[content.shape] = plan
+        return plan
+
+    def __buffer(self, name: str, shape: tuple, dtype: numpy.dtype) -> numpy.ndarray:
+        """
+        Returns an intermediate array of the current thread.
+        """
+        buffers: dict = getattr(self._buffers, "arrays", None) or {}
+        self._buffers.arrays = buffers
+        buffer: numpy.ndarray | None = buffers.get(name)
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = numpy.empty(shape, dtype=dtype)
+            buffers[name] = buffer
+        return buffer
+
+    def __take(
+        self, name: str, content: numpy.ndarray, index: numpy.ndarray | None, axis: int
+    ) -> numpy.ndarray:
+        """
+        Gathers the given indexes along the axis into a buffer.
+        """
+        if index is None:
+            return content
+        shape = list(content.shape)
+        shape[axis] = len(index)
+        out = self.__buffer(name, tuple(shape), content.dtype)
+        # The indexes are always valid. `clip` avoids buffering the output.
+        return numpy.take(content, index, axis=axis, out=out, mode="clip")
+
+    def __rows(self, content: numpy.ndarray, plan: _Plan) -> numpy.ndarray:
+        """
+        Resizes the rows and selects the bands. The result
+        is a float32 buffer.
+        """
+        float32 = numpy.dtype(numpy.float32)
+        rows: numpy.ndarray | None = None if plan.rows is None else plan.rows.first
+        first = self.__take("rows", content, rows, axis=0)
+        first = self.__take("bands", first, plan.bands, axis=2)
+        result = self.__buffer("float_rows", first.shape, float32)
+        numpy.copyto(result, first, casting="unsafe")
+        if plan.rows is None or plan.rows.weights is None:
+            return result
+
+        second = self.__take("rows", content, plan.rows.second, axis=0)
+        second = self.__take("bands", second, plan.bands, axis=2)
+        blend = self.__buffer("float_rows_blend", second.shape, float32)
+        numpy.copyto(blend, second, casting="unsafe")
+        result *= plan.rows.weights[0]
+        blend *= plan.rows.weights[1]
+        result += blend
+        return result
+
+    def __cols(self, rows: numpy.ndarray, plan: _Plan) -> numpy.ndarray:
+        """
+        Resizes the columns of the float32 buffer.
+        """
+        if plan.cols is None:
+            return rows
+
+        result = self.__take("float_cols", rows, plan.cols.first, axis=1)
+        if plan.cols.weights is None:
+            return result
+
+        blend = self.__take("float_cols_blend", rows, plan.cols.second, axis=1)
+        result *= plan.cols.weights[0]
+        blend *= plan.cols.weights[1]
+        result += blend
+        return result
+
+    def transform_into(self, img: Image, out: numpy.ndarray) -> numpy.ndarray:
+        """
+        Transforms the image, writing the sample into the given array.
+
+        Args:
+            img: Image to transform.
+            out: Array to write the sample. Its shape and dtype should
+                match the sample's, e.g: a slot of a batch.
+        Returns:
+            numpy.ndarray: The given array.
+        Raises:
+            ValueError: If the array doesn't match the sample.
+        """
+        plan: _Plan = self.__plan(img.content)
+        if out.shape != plan.shape or out.dtype != self.dtype:
+            raise ValueError(
+                f"Expected an array of shape {plan.shape} and dtype {self.dtype}, "
+                f"found {out.shape} and {out.dtype} instead"
+            )
+
+        result = self.__cols(self.__rows(img.content, plan), plan)
+        result *= plan.factor
+        result += plan.offset
+        if self.dtype.kind in "iub":
+            numpy.rint(result, out=result)
+
+        target = out[0] if self.config.batch_dim else out
+        if self.config.channels_first:
+            target = target.transpose(1, 2, 0)
+        numpy.copyto(target, result, casting="unsafe")
+        return out
+
+    def transform(self, img: Image) -> numpy.ndarray:
+        out = numpy.empty(self.__plan(img.content).shape, dtype=self.dtype)
+        return self.transform_into(img=img, out=out)
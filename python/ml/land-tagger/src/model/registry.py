@@ -0,0 +1,198 @@
+"""
+This module keeps the loaded models in memory, so
+the same model isn't loaded again from its file each
+time it is requested.
+"""
+
+import pathlib
+import threading
+import collections
+from concurrent.futures import Future
+from src.utils.base import Base, dataclass
+from src.file.file import File
+from src.model.config import BackendConfig
+from src.model.model import Model
+
+
+@dataclass
+class ModelUsage(Base):
+    """
+    Describes a model kept by the registry.
+
+    Attributes:
+        path (pathlib.Path | str): Model source path or URI.
+        version (str): Version of the loaded model, e.g: its
+            modification time, ETag or content SHA-256.
+        resident_size (int): Approximate memory used by the model.
+    """
+
+    path: pathlib.Path | str
+    version: str
+    resident_size: int
+
+    def __check_values__(self):
+        if self.resident_size < 0:
+            raise ValueError("The resident size can't be negative")
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of loaded models. The models are keyed
+    by their source path, version and backend configuration.
+    Concurrent requests for the same model share one load and the
+    least recently used models are evicted once the budget is
+    exceeded.
+
+    Attributes:
+        max_models (int | None): Maximum number of models. None
+            means no limit.
+        max_bytes (int | None): Maximum memory used by the models.
+            None means no limit.
+    """
+
+    _shared: "ModelRegistry | None" = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_models: int | None = None, max_bytes: int | None = None):
+        if max_models is not None and max_models <= 0:
+            raise ValueError(f"Invalid maximum number of models: {max_models}")
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError(f"Invalid memory budget: {max_bytes}")
+
+        self.max_models = max_models
+        self.max_bytes = max_bytes
+        self._models: collections.OrderedDict[tuple, Model] = collections.OrderedDict()
+        self._loading: dict[tuple, Future] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "ModelRegistry":
+        """
+        Returns the registry shared by the whole process.
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = ModelRegistry()
+            return cls._shared
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._models)
+
+    def __key(
+        self,
+        source: File,
+        config: BackendConfig | None,
+        prefer: tuple[str, ...] | None,
+    ) -> tuple:
+        """
+        Builds the cache key for the given model. The version
+        comes from the file's metadata, so a cache hit doesn't
+        read the model. The content is only hashed when the
+        location doesn't provide a version.
+        """
+        version: str = source.version() or source.digest()
+        return (source.path, version, repr(config), prefer)
+
+    def get(
+        self,
+        source: File,
+        config: BackendConfig | None = None,
+        prefer: tuple[str, ...] | None = None,
+    ) -> Model:
+        """
+        Returns the model loaded from the given file, loading
+        it only if it isn't available yet.
+
+        Args:
+            source: File to load the model from.
+            config: Backend configuration.
+            prefer: Backend names sorted by preference.
+        Returns:
+            Model: The loaded model.
+        """
+        key: tuple = self.__key(source=source, config=config, prefer=prefer)
+        with self._lock:
+            if (model := self._models.get(key)) is not None:
+                self._models.move_to_end(key)
+                return model
+
+            pending: Future | None = self._loading.get(key)
+            if pending is None:
+                self._loading[key] = Future()
+
+        if pending is not None:
+            return pending.result()
+        return self.__load(key=key, source=source, config=config, prefer=prefer)
+
+    def __load(
+        self,
+        key: tuple,
+        source: File,
+        config: BackendConfig | None,
+        prefer: tuple[str, ...] | None,
+    ) -> Model:
+        """
+        Loads the model and shares the result with the
+        callers waiting for it.
+        """
+        future: Future = self._loading[key]
+        try:
+            model: Model = Model.make(source=source, config=config, prefer=prefer)
+        except Exception as e:
+            with self._lock:
+                del self._loading[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._loading[key]
+            self._models[key] = model
+            self.__evict()
+        future.set_result(model)
+        return model
+
+    def __evict(self) -> None:
+        """
+        Evicts the least recently used models until the budget
+        is met. The most recent model is always kept.
+        """
+        while len(self._models) > 1:
+            total: int = sum(m.model.resident_size for m in self._models.values())
+            too_many: bool = (
+                self.max_models is not None and len(self._models) > self.max_models
+            )
+            too_big: bool = self.max_bytes is not None and total > self.max_bytes
+            if not too_many and not too_big:
+                break
+            self._models.popitem(last=False)
+
+    def evict(self, source: File) -> None:
+        """
+        Removes all the models loaded from the given file.
+        """
+        with self._lock:
+            for key in [k for k in self._models if k[0] == source.path]:
+                del self._models[key]
+
+    def clear(self) -> None:
+        """
+        Removes all the models.
+        """
+        with self._lock:
+            self._models.clear()
+
+    def usage(self) -> list[ModelUsage]:
+        """
+        Reports the models kept by the registry, from the
+        least to the most recently used.
+        """
+        with self._lock:
+            return [
+                ModelUsage(
+                    path=path,
+                    version=version,
+                    resident_size=model.model.resident_size,
+                )
+                for (path, version, *_), model in self._models.items()
+            ]
@@ -0,0 +1,276 @@
+"""
+This module groups the predictions requested
+by concurrent callers into batches, so the model
+backend is called once per batch instead of once
+per request.
+"""
+
+import asyncio
+import queue
+import threading
+import time
+import dataclasses
+from concurrent.futures import Future
+import numpy
+from src.utils.base import Base, dataclass
+from src.model.model import Model
+
+
+@dataclass
+class SchedulerMetrics(Base):
+    """
+    Aggregated timings for the requests served
+    by a scheduler.
+
+    Attributes:
+        requests (int): Requests served.
+        batches (int): Backend calls performed.
+        failed (int): Backend calls which raised an error.
+        queue_time (float): Total seconds the requests waited
+            in the queue before their batch started.
+        compute_time (float): Total seconds spent running batches.
+    """
+
+    requests: int = 0
+    batches: int = 0
+    failed: int = 0
+    queue_time: float = 0.0
+    compute_time: float = 0.0
+
+    def __check_values__(self):
+        pass
+
+    @property
+    def mean_batch_size(self) -> float:
+        """
+        Returns the average number of requests per batch.
+        """
+        return self.requests / self.batches if self.batches else 0.0
+
+    @property
+    def mean_queue_time(self) -> float:
+        """
+        Returns the average seconds a request waited in the queue.
+        """
+        return self.queue_time / self.requests if self.requests else 0.0
+
+    @property
+    def mean_compute_time(self) -> float:
+        """
+        Returns the average seconds spent running a batch.
+        """
+        return self.compute_time / self.batches if self.batches else 0.0
+
+
+@dataclasses.dataclass
+class _Request:
+    """
+    A sample waiting to be predicted.
+    """
+
+    sample: numpy.ndarray
+    future: Future = dataclasses.field(default_factory=Future)
+    enqueued_at: float = dataclasses.field(default_factory=time.perf_counter)
+
+
+class BatchScheduler:
+    # pylint: disable=too-many-instance-attributes
+    """
+    Collects the samples submitted from many threads or
+    asyncio tasks and merges them into a batch until it is full
+    or the oldest request has waited `max_wait` seconds. Then,
+    the backend is called once per sample shape and each caller
+    receives its own prediction, so a mis-shaped sample doesn't
+    fail the requests of other callers.
+
+    Attributes:
+        model (Model): Model used to generate the predictions.
+        max_batch_size (int): Maximum number of samples per batch.
+        max_wait (float): Maximum seconds a request waits for
+            other requests to join its batch.
+    """
+
+    def __init__(
+        self,
+        model: Model,
+        max_batch_size: int = 32,
+        max_wait: float = 0.005,
+        max_queue: int = 1024,
+    ) -> None:
+        if max_batch_size <= 0:
+            raise ValueError(f"Invalid batch size: {max_batch_size}")
+        if max_wait < 0:
+            raise ValueError(f"Invalid maximum wait: {max_wait}")
+
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue: queue.Queue[_Request] = queue.Queue(maxsize=max_queue)
+        self._metrics = SchedulerMetrics()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._worker = threading.Thread(
+            target=self.__run, name="batch-scheduler", daemon=True
+        )
+        self._worker.start()
+
+    def __enter__(self) -> "BatchScheduler":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @property
+    def metrics(self) -> SchedulerMetrics:
+        """
+        Returns a snapshot of the scheduler metrics.
+        """
+        with self._lock:
+            return SchedulerMetrics(
+                requests=self._metrics.requests,
+                batches=self._metrics.batches,
+                failed=self._metrics.failed,
+                queue_time=self._metrics.queue_time,
+                compute_time=self._metrics.compute_time,
+            )
+
+    def submit(self, sample: numpy.ndarray, timeout: float | None = None) -> Future:
+        """
+        Queues a sample to be predicted.
+
+        Args:
+            sample: Sample to generate the prediction.
+            timeout: Maximum seconds to wait for a free slot
+                if the queue is full. None waits forever.
+        Returns:
+            Future: Resolved with the prediction for the sample.
+        Raises:
+            RuntimeError: If the scheduler is closed.
+            queue.Full: If the queue is still full after the timeout.
+        """
+        if self._stop.is_set():
+            raise RuntimeError("The scheduler is closed")
+
+        request = _Request(sample=sample)
+        self._queue.put(request, timeout=timeout)
+        # The scheduler was closed while queuing, so the queue
+        # may have already been drained.
+        if self._stop.is_set():
+            self.__drain()
+        return request.future
+
+    async def asubmit(self, sample: numpy.ndarray) -> numpy.ndarray:
+        """
+        Queues a sample and waits for its prediction
+        without blocking the event loop.
+
+        Args:
+            sample: Sample to generate the prediction.
+        Returns:
+            numpy.ndarray: Prediction for the sample.
+        """
+        while True:
+            try:
+                future: Future = self.submit(sample=sample, timeout=0)
+                break
+            except queue.Full:
+                await asyncio.sleep(self.max_wait)
+        return await asyncio.wrap_future(future)
+
+    def predict(self, sample: numpy.ndarray) -> numpy.ndarray:
+        """
+        Queues a sample and blocks until its prediction is ready.
+        """
+        return self.submit(sample=sample).result()
+
+    def close(self) -> None:
+        """
+        Stops the scheduler. Pending requests fail with a
+        RuntimeError.
+        """
+        self._stop.set()
+        self._worker.join()
+        self.__drain()
+
+    def __drain(self) -> None:
+        """
+        Fails the requests left in the queue.
+        """
+        while True:
+            try:
+                request: _Request = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request.future.set_running_or_notify_cancel():
+                request.future.set_exception(RuntimeError("The scheduler is closed"))
+
+    def __collect(self) -> list[_Request]:
+        """
+        Waits for a request and gathers the ones arriving
+        before the batch is full or its deadline expires.
+        """
+        try:
+            first: _Request = self._queue.get(timeout=0.1)
+        except queue.Empty:
+            return []
+
+        batch: list[_Request] = [first]
+        deadline: float = first.enqueued_at + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining: float = deadline - time.perf_counter()
+            try:
+                batch.append(
+                    self._queue.get(timeout=remaining)
+                    if remaining > 0
+                    else self._queue.get_nowait()
+                )
+            except queue.Empty:
+                break
+        return batch
+
+    def __execute(self, batch: list[_Request]) -> None:
+        """
+        Splits the batch by sample shape and runs the
+        backend once for each shape.
+        """
+        groups: dict[tuple, list[_Request]] = {}
+        for request in batch:
+            if request.future.set_running_or_notify_cancel():
+                groups.setdefault(numpy.shape(request.sample), []).append(request)
+        for group in groups.values():
+            self.__predict(batch=group)
+
+    def __predict(self, batch: list[_Request]) -> None:
+        """
+        Runs the backend once for the whole batch and
+        resolves the futures of each request.
+        """
+        started_at: float = time.perf_counter()
+        try:
+            predictions: list[numpy.ndarray] = self.model.model.predict_batch(
+                samples=[r.sample for r in batch], batch_size=self.max_batch_size
+            )
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            for request in batch:
+                request.future.set_exception(e)
+            with self._lock:
+                self._metrics.failed += 1
+            return
+        finished_at: float = time.perf_counter()
+
+        for request, prediction in zip(batch, predictions):
+            request.future.set_result(prediction)
+
+        with self._lock:
+            self._metrics.requests += len(batch)
+            self._metrics.batches += 1
+            self._metrics.queue_time += sum(started_at - r.enqueued_at for r in batch)
+            self._metrics.compute_time += finished_at - started_at
+
+    def __run(self) -> None:
+        """
+        Scheduler loop.
+        """
+        while not self._stop.is_set():
+            if batch := self.__collect():
+                self.__execute(batch=batch)
@@ -3,10 +3,21 @@ Loads a model from a given file using Tensorflow.
 Then, it uses the loaded model to generate predictions.
 """
 
+import pathlib
+import tempfile
 import numpy
 import keras
 
-from src.model.model_interfaces import ModelInterface, ModelLoadInterface
+# This module shares its name with the package.
+# pylint: disable=import-self, no-member
+import tensorflow as tf
+
+from src.model.model_interfaces import (
+    InputCaster,
+    ModelInterface,
+    ModelLoadInterface,
+)
+from src.model.config import TensorflowConfig
 from src.file.file import File
 
 
@@ -17,19 +28,48 @@ class TensorflowModel(ModelInterface):
 
     Attributes:
         model (keras.Model): Tensorflow model.
+        config (TensorflowConfig): Prediction settings.
+        caster (InputCaster): Casts the samples to the input layer dtype.
     """
 
-    def __init__(self, model: keras.Model) -> None:
+    def __init__(
+        self, model: keras.Model, config: TensorflowConfig | None = None
+    ) -> None:
         self.model = model
+        self.config = config or TensorflowConfig()
         self._input_layers_config = self.__get_config()
+        self.caster = InputCaster()
+        self._call = tf.function(
+            self.__forward,
+            jit_compile=self.config.jit_compile,
+            reduce_retracing=True,
+        )
+
+    def __forward(self, sample):
+        """
+        Calls the model directly in inference mode.
+        """
+        return self.model(sample, training=False)
+
+    def warmup(self) -> None:
+        """
+        Runs a prediction with a sample of zeros to trace
+        the model. Skipped if the input shape isn't fixed.
+        """
+        if len(self._input_layers_config) != 1:
+            return
+        if not all(isinstance(dim, int) for dim in self.input_shape):
+            return
+        self.predict(numpy.zeros((1, *self.input_shape), dtype=self.input_dtype))
 
-    def __get_config(self) -> list[tuple[str, tuple[int, ...]]]:
+    def __get_config(self) -> list[tuple[str, tuple[int, ...], int | None]]:
         """
         Retrieves the input layers and their dtypes.
 
         Returns:
             A list of tuples, the first element is related with
-                the layer's dtype and the second is its shape.
+                the layer's dtype, the second is its shape and the
+                third is its batch size (None if it is dynamic).
         """
         input_layers_config = []
         model_config: dict = self.model.get_config()
@@ -46,13 +86,26 @@ class TensorflowModel(ModelInterface):
             config: dict = layer.get("config", {})
             dtype: str = config.get("dtype", "")
             raw_shape: tuple[int, ...] = config.get("batch_input_shape", ())
-            shape = raw_shape[1:]
-            input_layers_config += [(dtype, shape)]
+            shape = tuple(raw_shape[1:])
+            batch: int | None = raw_shape[0] if raw_shape else None
+            input_layers_config += [(dtype, shape, batch)]
 
         return input_layers_config
 
     def predict(self, sample: numpy.ndarray) -> numpy.ndarray:
-        return self.model.predict(sample)
+        # Multi-input models take a list or dict of arrays.
+        if not isinstance(sample, numpy.ndarray):
+            return self.model.predict(sample, verbose=0)
+        if len(self._input_layers_config) == 1:
+            sample = self.caster.cast(sample=sample, dtype=self.input_dtype)
+        if len(sample) >= self.config.predict_threshold:
+            return self.model.predict(sample, verbose=0)
+
+        # Same as `model.predict`, a vector is handled as a batch of scalars.
+        if sample.ndim == 1:
+            sample = sample[:, numpy.newaxis]
+        outputs = self._call(tf.convert_to_tensor(sample))
+        return tf.nest.map_structure(lambda t: t.numpy(), outputs)
 
     @property
     def input_shape(self) -> tuple[int, ...]:
@@ -62,6 +115,26 @@ class TensorflowModel(ModelInterface):
             )
         return self._input_layers_config[0][1]
 
+    @property
+    def sample_shape(self) -> tuple | None:
+        # The input shape doesn't include the batch dimension.
+        if len(self._input_layers_config) != 1:
+            return None
+        return self.input_shape
+
+    @property
+    def resident_size(self) -> int:
+        return sum(
+            int(numpy.prod(weight.shape)) * weight.dtype.size
+            for weight in self.model.weights
+        )
+
+    @property
+    def batch_size(self) -> int | None:
+        if len(self._input_layers_config) != 1:
+            return None
+        return self._input_layers_config[0][2]
+
     @property
     def input_dtype(self) -> str:
         if (num_layers := len(self._input_layers_config)) != 1:
@@ -74,8 +147,14 @@ class TensorflowModel(ModelInterface):
 class TensorflowLoader(ModelLoadInterface):
     """
     Load a model using Tensorflow as backend.
+
+    Attributes:
+        config (TensorflowConfig): Prediction settings.
     """
 
+    def __init__(self, config: TensorflowConfig | None = None) -> None:
+        self.config = config or TensorflowConfig()
+
     def _is_remote_file(self, source: File) -> bool:
         """
         Determines if the given file is available
@@ -88,15 +167,30 @@ class TensorflowLoader(ModelLoadInterface):
             bool: True if the file is not available
                 in the local filesystem nor it is reachable from it.
         """
-        return not source.path.exists()
+        return not source.is_local
 
-    def load(self, source: File) -> ModelInterface:
-        if self._is_remote_file(source=source):
-            msg = (
-                "Please implement a method to temporarily store "
-                "the file into the local filesystem before loading the model. "
-            )
-            raise NotImplementedError(msg)
+    def _load_remote(self, source: File) -> keras.Model:
+        """
+        Keras only loads models from the local filesystem, so the
+        remote file is temporarily stored into a local folder.
+        """
+        if not source.suffix:
+            raise NotImplementedError("Remote SavedModel folders are not supported")
 
-        keras_model: keras.Model = keras.models.load_model(filepath=source.path)
-        return TensorflowModel(model=keras_model)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            local_path = pathlib.Path(tmp_dir).joinpath(f"model{source.suffix}")
+            with open(local_path, mode="wb") as f:
+                for chunk in source.iter_chunks():
+                    f.write(chunk)
+            return keras.models.load_model(filepath=local_path)
+
+    def load(self, source: File) -> ModelInterface:
+        keras_model: keras.Model = (
+            self._load_remote(source=source)
+            if self._is_remote_file(source=source)
+            else keras.models.load_model(filepath=source.path)
+        )
+        model = TensorflowModel(model=keras_model, config=self.config)
+        if self.config.warmup:
+            model.warmup()
+        return model
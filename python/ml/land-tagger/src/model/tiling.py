@@ -0,0 +1,544 @@
+"""
+This module runs a model over scenes larger than its input:
+the scene is cut into overlapping tiles, the tiles are predicted
+in batches and the predictions are stitched back together.
+"""
+
+import os
+import pathlib
+import threading
+import functools
+import contextlib
+import dataclasses
+from typing import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+import numpy
+import rasterio
+import rasterio.plot
+import rasterio.windows
+from src.utils.base import Base, dataclass, validation
+from src.file.file import File
+from src.image.image import Image, LoadOptions, Loader
+from src.image.pyramid import Pyramid
+from src.model.model import Model
+from src.model.model_interfaces import ModelImageInterface
+
+
+@dataclass
+class TilingConfig(Base):
+    """
+    Settings to cut a scene into tiles and stitch
+    the predictions.
+
+    Attributes:
+        tile_size (tuple | None): Tile (height, width). If not provided,
+            it is taken from the model's input shape, which should
+            use the (batch, height, width, bands) layout.
+        overlap (int): Pixels shared by neighbouring tiles. The
+            stride between tiles is `tile_size - overlap`.
+        mode (str): How the overlapping predictions are merged.
+            `blend` averages them, weighting each pixel by its
+            distance to the tile border. `vote` keeps the most
+            predicted class of each pixel.
+        batch_size (int): Tiles per model call.
+        workers (int): Threads reading and transforming the tiles.
+    """
+
+    MODES = ("blend", "vote")
+
+    tile_size: tuple | None = None
+    overlap: int = 0
+    mode: str = "blend"
+    batch_size: int = 32
+    workers: int = os.cpu_count() or 1
+
+    def __check_values__(self):
+        if self.tile_size is not None and (
+            len(self.tile_size) != 2 or min(self.tile_size) <= 0
+        ):
+            raise ValueError(f"Invalid tile size: {self.tile_size}")
+        if self.overlap < 0:
+            raise ValueError("The overlap can't be negative")
+        if self.mode not in TilingConfig.MODES:
+            raise ValueError(f"Invalid stitching mode: {self.mode}")
+        if self.batch_size <= 0 or self.workers <= 0:
+            raise ValueError("The batch size and the workers should be positive")
+
+
+@dataclass
+class CoarseConfig(Base):
+    """
+    Settings of the coarse-to-fine tagging: the model runs
+    first on an overview of the scene, and only the tiles where
+    it finds candidates are predicted at full resolution.
+
+    Attributes:
+        factor (int): Overview factor of the coarse pass.
+        threshold (float): Minimum score of a candidate pixel
+            in the coarse pass.
+        classes (tuple | None): Prediction channels with the scores
+            of the elements to find. None uses all of them.
+        margin (int): Overview pixels added around each candidate,
+            so the elements near a tile border aren't missed.
+    """
+
+    factor: int = 8
+    threshold: float = 0.5
+    classes: tuple | None = None
+    margin: int = 1
+
+    def __check_values__(self):
+        if self.factor < 1:
+            raise ValueError(f"Invalid overview factor: {self.factor}")
+        if self.margin < 0:
+            raise ValueError("The margin can't be negative")
+
+
+@dataclasses.dataclass
+class _Scene:
+    """
+    Scene to tile. `read(row, col, rows, cols)` returns a window
+    with the (height, width, bands) layout, clipped to the scene.
+    """
+
+    source: File
+    height: int
+    width: int
+    read: Callable[[int, int, int, int], numpy.ndarray]
+    metadata: dict
+    image: Image | None = None
+
+
+def _offsets(size: int, tile: int, stride: int) -> list[int]:
+    """
+    Returns the tile offsets along an axis. The last tile
+    is aligned with the scene border instead of going out of it.
+    """
+    if size <= tile:
+        return [0]
+    offsets: list[int] = list(range(0, size - tile + 1, stride))
+    if offsets[-1] != size - tile:
+        offsets.append(size - tile)
+    return offsets
+
+
+def _ramp(size: int, overlap: int) -> numpy.ndarray:
+    """
+    Returns the blending weights along an axis: they grow
+    linearly over the overlap and are flat in the middle.
+    """
+    position = numpy.arange(size)
+    distance = numpy.minimum(position + 1, size - position)
+    return numpy.minimum(distance, overlap + 1).astype(numpy.float32)
+
+
+class _Stitcher:
+    """
+    Merges the tile predictions of a band of rows. Only the
+    rows which may still receive predictions are kept, so the
+    memory doesn't depend on the scene height.
+    """
+
+    def __init__(self, tile: tuple[int, int], width: int, config: TilingConfig) -> None:
+        self.tile = tile
+        self.width = width
+        self.vote: bool = config.mode == "vote"
+        self.weights = numpy.outer(
+            _ramp(tile[0], 0 if self.vote else config.overlap),
+            _ramp(tile[1], 0 if self.vote else config.overlap),
+        )
+        self._sum: numpy.ndarray | None = None
+        self._weight = numpy.zeros((tile[0], width), dtype=numpy.float32)
+
+    def __expand(self, prediction: numpy.ndarray) -> numpy.ndarray:
+        """
+        Returns the prediction of each pixel of the tile. The
+        predictions of the whole tile are used for all its pixels.
+        """
+        if prediction.ndim == 1:
+            return numpy.broadcast_to(prediction, (*self.tile, len(prediction)))
+        if prediction.shape[:2] != self.tile or prediction.ndim > 3:
+            raise ValueError(
+                f"Expected a prediction for the tile {self.tile}, "
+                f"found {prediction.shape} instead"
+            )
+        return prediction.reshape((*self.tile, -1))
+
+    def add(self, col: int, rows: int, prediction: numpy.ndarray) -> None:
+        """
+        Accumulates the prediction of the tile at the given column.
+        Only the first `rows` rows belong to the scene.
+        """
+        values: numpy.ndarray = self.__expand(prediction)
+        if self.vote:
+            values = numpy.arange(values.shape[-1]) == values.argmax(axis=-1)[..., None]
+        if self._sum is None:
+            self._sum = numpy.zeros(
+                (self.tile[0], self.width, values.shape[-1]), dtype=numpy.float32
+            )
+
+        cols: int = min(self.tile[1], self.width - col)
+        weights: numpy.ndarray = self.weights[:rows, :cols]
+        self._sum[:rows, col : col + cols] += values[:rows, :cols] * weights[..., None]
+        self._weight[:rows, col : col + cols] += weights
+
+    def flush(self, rows: int) -> numpy.ndarray:
+        """
+        Returns the result of the first rows, which won't
+        receive more predictions, and drops them.
+        """
+        if self._sum is None:
+            raise ValueError("There are no predictions to flush")
+
+        if self.vote:
+            classes: int = self._sum.shape[-1]
+            dtype = numpy.uint8 if classes <= 256 else numpy.uint16
+            result = self._sum[:rows].argmax(axis=-1)[..., None].astype(dtype)
+        else:
+            result = self._sum[:rows] / self._weight[:rows, :, None]
+
+        kept: int = self.tile[0] - rows
+        self._sum[:kept] = self._sum[rows:]
+        self._sum[kept:] = 0
+        self._weight[:kept] = self._weight[rows:]
+        self._weight[kept:] = 0
+        return result
+
+
+class TiledInference:
+    """
+    Runs a model over a whole scene. The scene is read one
+    band of tile rows at a time, the tiles are transformed in
+    a thread pool while the next band is read, and the finished
+    rows are released as soon as no other tile covers them.
+    The memory used is bounded by a few bands of tiles, so
+    geospatial images of any height can be processed.
+
+    Attributes:
+        model (Model): Model used to predict each tile.
+        config (TilingConfig): Tiling and stitching settings.
+        transform (ModelImageInterface | None): Transforms each tile
+            into a sample. If not provided, the tile content is used.
+        options (LoadOptions): Decoding options.
+    """
+
+    def __init__(
+        self,
+        model: Model,
+        config: TilingConfig | None = None,
+        transform: ModelImageInterface | None = None,
+        options: LoadOptions | None = None,
+    ) -> None:
+        self.model = model
+        self.config = config or TilingConfig()
+        self.transform = transform
+        self.options = options or LoadOptions()
+        self.tile: tuple[int, int] = self.__tile_size()
+        if self.config.overlap >= min(self.tile):
+            raise ValueError("The overlap should be smaller than the tile")
+
+    def __tile_size(self) -> tuple[int, int]:
+        """
+        Returns the configured tile size or the model's input size.
+        """
+        if self.config.tile_size is not None:
+            return tuple(self.config.tile_size)  # type: ignore[return-value]
+
+        shape: tuple = tuple(self.model.model.input_shape)
+        size: tuple = shape[-3:-1]
+        if len(shape) < 3 or not all(isinstance(s, int) and s > 0 for s in size):
+            raise ValueError(f"Please provide the tile size for {shape}")
+        return size  # type: ignore[return-value]
+
+    def __scene(self, source: Image | File, stack: contextlib.ExitStack) -> _Scene:
+        """
+        Opens the scene. The rasters are read window by window,
+        the other images are decoded at once.
+        """
+        if isinstance(source, Image):
+            content: numpy.ndarray = source.content
+            return _Scene(
+                source=source.source,
+                height=source.resolution[0],
+                width=source.resolution[1],
+                read=lambda row, col, rows, cols: content[
+                    row : row + rows, col : col + cols
+                ],
+                metadata=source.metadata or {},
+                image=source,
+            )
+
+        try:
+            raster = Loader.open_raster(file=source, stack=stack)
+        except NotImplementedError:
+            return self.__scene(Image.make(file=source, options=self.options), stack)
+
+        out_dtype = None if self.options.native_dtype else numpy.int32
+        # The dataset can't be read from several threads at once.
+        lock = threading.Lock()
+
+        def __read(row: int, col: int, rows: int, cols: int) -> numpy.ndarray:
+            window = rasterio.windows.Window(
+                col_off=col,
+                row_off=row,
+                width=min(cols, raster.width - col),
+                height=min(rows, raster.height - row),
+            )
+            with lock:
+                content = raster.read(window=window, out_dtype=out_dtype)
+            return rasterio.plot.reshape_as_image(content)
+
+        return _Scene(
+            source=source,
+            height=raster.height,
+            width=raster.width,
+            read=__read,
+            metadata=raster.meta,
+        )
+
+    def __sample(self, scene: _Scene, tile: numpy.ndarray) -> numpy.ndarray:
+        """
+        Transforms a tile into a sample. The tiles crossing
+        the scene border are padded with zeros.
+        """
+        if tile.shape[:2] != self.tile:
+            padded = numpy.zeros((*self.tile, tile.shape[2]), dtype=tile.dtype)
+            padded[: tile.shape[0], : tile.shape[1]] = tile
+            tile = padded
+        if self.transform is None:
+            return tile
+        with validation(False):
+            image = Image(source=scene.source, content=tile)
+        return self.transform.transform(image)
+
+    def __predict_band(
+        self,
+        scene: _Scene,
+        band: numpy.ndarray,
+        cols: list[int],
+        stitcher: _Stitcher,
+        pool: ThreadPoolExecutor,
+    ) -> None:
+        """
+        Predicts the tiles of a band of rows in batches.
+        """
+        samples = pool.map(
+            lambda col: self.__sample(scene, band[:, col : col + self.tile[1]]), cols
+        )
+        predictions = self.model.model.iter_predict(
+            samples=samples, batch_size=self.config.batch_size
+        )
+        for col, prediction in zip(cols, predictions):
+            stitcher.add(col=col, rows=band.shape[0], prediction=prediction)
+
+    def strips(self, source: Image | File) -> Iterator[tuple[int, numpy.ndarray]]:
+        """
+        Predicts the scene, releasing the results by bands of rows.
+
+        Args:
+            source: Image or file of the scene. Only the geospatial
+                files are read by windows.
+        Returns:
+            Iterator[tuple[int, numpy.ndarray]]: The first row of each
+                band and its result with the (rows, width, channels)
+                layout, from top to bottom. `blend` results are float32
+                and `vote` results hold the class of each pixel.
+        Raises:
+            ValueError: If the predictions don't match the tiles.
+        """
+        with contextlib.ExitStack() as stack:
+            yield from self.__strips(self.__scene(source, stack))
+
+    def __grid(self, scene: _Scene) -> tuple[list[int], list[int]]:
+        """
+        Returns the row and column offsets of the tiles.
+        """
+        return (
+            _offsets(scene.height, self.tile[0], self.tile[0] - self.config.overlap),
+            _offsets(scene.width, self.tile[1], self.tile[1] - self.config.overlap),
+        )
+
+    def __strips(self, scene: _Scene) -> Iterator[tuple[int, numpy.ndarray]]:
+        """
+        Predicts the opened scene. See `strips`.
+        """
+        rows, cols = self.__grid(scene)
+        stitcher = _Stitcher(tile=self.tile, width=scene.width, config=self.config)
+        with ThreadPoolExecutor(
+            max_workers=self.config.workers, thread_name_prefix="tiling"
+        ) as pool:
+            reading: Future = pool.submit(
+                scene.read, rows[0], 0, self.tile[0], scene.width
+            )
+            # The rows above the next band won't receive more predictions.
+            for row, end in zip(rows, [*rows[1:], scene.height]):
+                band: numpy.ndarray = reading.result()
+                if end < scene.height:
+                    # Read the next band while this one is predicted.
+                    reading = pool.submit(scene.read, end, 0, self.tile[0], scene.width)
+
+                self.__predict_band(scene, band, cols, stitcher, pool)
+                yield row, stitcher.flush(end - row)
+
+    def predict(self, source: Image | File) -> numpy.ndarray:
+        """
+        Predicts the whole scene in memory. See `strips`.
+
+        Returns:
+            numpy.ndarray: Result with the (height, width, channels) layout.
+        """
+        return numpy.concatenate([result for _, result in self.strips(source)])
+
+    def write(
+        self, source: Image | File, destination: pathlib.Path | str
+    ) -> pathlib.Path:
+        """
+        Predicts the scene and writes the result to a GeoTIFF as
+        the bands of rows are finished. The georeference of the
+        source is kept.
+
+        Args:
+            source: Image or file of the scene.
+            destination: Path of the GeoTIFF to create.
+        Returns:
+            pathlib.Path: Path of the GeoTIFF.
+        """
+        destination = pathlib.Path(destination)
+        with contextlib.ExitStack() as stack:
+            scene: _Scene = self.__scene(source, stack)
+            output = None
+            for row, result in self.__strips(scene):
+                if output is None:
+                    output = stack.enter_context(
+                        rasterio.open(
+                            destination,
+                            mode="w",
+                            driver="GTiff",
+                            height=scene.height,
+                            width=scene.width,
+                            count=result.shape[-1],
+                            dtype=result.dtype,
+                            crs=scene.metadata.get("crs"),
+                            transform=scene.metadata.get("transform"),
+                            tiled=True,
+                            blockxsize=256,
+                            blockysize=256,
+                        )
+                    )
+                window = rasterio.windows.Window(
+                    col_off=0, row_off=row, width=scene.width, height=result.shape[0]
+                )
+                output.write(rasterio.plot.reshape_as_raster(result), window=window)
+        return destination
+
+    def __candidates(
+        self, scene: _Scene, coarse: CoarseConfig
+    ) -> list[tuple[int, int]]:
+        """
+        Runs the coarse pass and returns the offsets of the
+        full resolution tiles with candidates.
+        """
+        pyramid: Pyramid = (
+            Pyramid(file=scene.source, options=self.options)
+            if scene.image is None
+            else Pyramid.from_image(scene.image)
+        )
+        scores: numpy.ndarray = self.predict(pyramid.level(coarse.factor))
+        if coarse.classes is not None:
+            scores = scores[..., list(coarse.classes)]
+        found: numpy.ndarray = (scores >= coarse.threshold).any(axis=-1)
+
+        def __found(start: int, size: int, axis: int) -> slice:
+            first: int = max(start // coarse.factor - coarse.margin, 0)
+            last: int = -(-(start + size) // coarse.factor) + coarse.margin
+            return slice(first, min(last, found.shape[axis]))
+
+        rows, cols = self.__grid(scene)
+        return [
+            (row, col)
+            for row in rows
+            for col in cols
+            if found[__found(row, self.tile[0], 0), __found(col, self.tile[1], 1)].any()
+        ]
+
+    def candidates(
+        self, source: Image | File, coarse: CoarseConfig | None = None
+    ) -> list[tuple[int, int]]:
+        """
+        Runs the coarse pass of `tag` on an overview of the scene.
+
+        Args:
+            source: Image or file of the scene.
+            coarse: Coarse pass settings.
+        Returns:
+            list[tuple[int, int]]: (row, column) offsets of the full
+                resolution tiles to predict.
+        """
+        with contextlib.ExitStack() as stack:
+            scene: _Scene = self.__scene(source, stack)
+            return self.__candidates(scene, coarse or CoarseConfig())
+
+    def __tile(self, scene: _Scene, offset: tuple[int, int]) -> Image:
+        """
+        Reads the tile at the given offset.
+        """
+        row, col = offset
+        content: numpy.ndarray = scene.read(row, col, *self.tile)
+        height, width = content.shape[:2]
+        metadata: dict = {"window": (row, col, height, width)}
+        if (transform := scene.metadata.get("transform")) is not None:
+            metadata["transform"] = rasterio.windows.transform(
+                rasterio.windows.Window(col, row, width, height), transform
+            )
+        # The tiles are built from the already validated scene.
+        with validation(False):
+            return Image(source=scene.source, content=content, metadata=metadata)
+
+    def tag(
+        self,
+        source: Image | File,
+        coarse: CoarseConfig | None = None,
+        tiles: list[tuple[int, int]] | None = None,
+    ) -> Iterator[tuple[Image, numpy.ndarray]]:
+        """
+        Coarse-to-fine tagging: the model runs on an overview of the
+        scene and only the tiles where it found candidates are read and
+        predicted at full resolution. On mostly empty scenes, most of
+        the full resolution tiles are skipped.
+
+        Args:
+            source: Image or file of the scene. The overviews stored
+                in the geospatial files are used when present.
+            coarse: Coarse pass settings.
+            tiles: Tiles to predict, see `candidates`. If not provided,
+                the coarse pass is run.
+        Returns:
+            Iterator[tuple[Image, numpy.ndarray]]: Each candidate tile
+                with its prediction. The tile metadata includes its
+                window (row, col, height, width) in the scene.
+        """
+        with contextlib.ExitStack() as stack:
+            scene: _Scene = self.__scene(source, stack)
+            if tiles is None:
+                tiles = self.__candidates(scene, coarse or CoarseConfig())
+            pool = stack.enter_context(
+                ThreadPoolExecutor(
+                    max_workers=self.config.workers, thread_name_prefix="tiling"
+                )
+            )
+            for start in range(0, len(tiles), self.config.batch_size):
+                images: list[Image] = list(
+                    pool.map(
+                        functools.partial(self.__tile, scene),
+                        tiles[start : start + self.config.batch_size],
+                    )
+                )
+                samples = pool.map(
+                    lambda image: self.__sample(scene, image.content), images
+                )
+                yield from zip(
+                    images,
+                    self.model.model.iter_predict(
+                        samples=samples, batch_size=self.config.batch_size
+                    ),
+                )
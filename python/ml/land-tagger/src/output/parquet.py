@@ -0,0 +1,50 @@
+"""
+This module writes the tags of each image into a columnar
+Parquet file. It requires the `pyarrow` package, which is
+only imported when this writer is used.
+"""
+
+import pathlib
+
+# pylint: disable=import-error
+import pyarrow
+import pyarrow.parquet
+from src.output.writers import TagConfig, TagWriter
+
+SCHEMA = pyarrow.schema(
+    [
+        ("source", pyarrow.string()),
+        ("tags", pyarrow.list_(pyarrow.string())),
+        ("scores", pyarrow.list_(pyarrow.float32())),
+    ]
+)
+
+
+class ParquetWriter(TagWriter):
+    """
+    Writes the tags of each image into a Parquet file.
+    Each bulk write becomes a row group.
+
+    Attributes:
+        path (pathlib.Path): Destination file.
+    """
+
+    def __init__(
+        self,
+        path: pathlib.Path | str,
+        config: TagConfig | None = None,
+        buffer_size: int = 1024,
+        compression: str = "zstd",
+    ) -> None:
+        super().__init__(config=config, buffer_size=buffer_size)
+        self.path = pathlib.Path(path)
+        self._writer = pyarrow.parquet.ParquetWriter(
+            self.path, SCHEMA, compression=compression
+        )
+
+    def write_records(self, records: list[dict]) -> None:
+        self._writer.write_table(pyarrow.Table.from_pylist(records, schema=SCHEMA))
+
+    def close(self) -> None:
+        super().close()
+        self._writer.close()
@@ -0,0 +1,336 @@
+"""
+This module persists the predictions as they are produced:
+the tags of each image to NDJSON or Parquet files and the
+segmentation masks to Cloud-Optimized GeoTIFFs.
+"""
+
+import abc
+import json
+import queue
+import pathlib
+import importlib
+import threading
+from typing import Callable, Iterable
+import numpy
+import rasterio
+import rasterio.plot
+from src.utils.base import Base, dataclass
+from src.image.image import Image
+
+
+@dataclass
+class TagConfig(Base):
+    """
+    Turns the scores predicted for an image into tags.
+
+    Attributes:
+        labels (tuple | None): Name of each class. If not provided,
+            the class index is used.
+        threshold (float): Minimum score of a tag.
+        top_k (int | None): Maximum tags per image. None keeps all
+            the tags above the threshold.
+    """
+
+    labels: tuple | None = None
+    threshold: float = 0.0
+    top_k: int | None = None
+
+    def __check_values__(self):
+        if self.top_k is not None and self.top_k <= 0:
+            raise ValueError(f"Invalid number of tags: {self.top_k}")
+
+
+class WriterInterface(abc.ABC):
+    """
+    Destination of the predictions generated for
+    each image.
+    """
+
+    def __enter__(self) -> "WriterInterface":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @abc.abstractmethod
+    def write(self, image: Image, prediction: numpy.ndarray) -> None:
+        """
+        Persists the prediction of an image.
+
+        Args:
+            image: Predicted image.
+            prediction: Model output for the image.
+        """
+
+    @abc.abstractmethod
+    def close(self) -> None:
+        """
+        Writes the pending predictions and releases the destination.
+        """
+
+    def write_all(self, predictions: Iterable[tuple[Image, numpy.ndarray]]) -> int:
+        """
+        Persists the predictions as they are generated, e.g:
+        from `Model.predict_images` or `Pipeline.run`.
+
+        Returns:
+            int: Number of predictions written.
+        """
+        written: int = 0
+        for image, prediction in predictions:
+            self.write(image=image, prediction=prediction)
+            written += 1
+        return written
+
+
+class TagWriter(WriterInterface):
+    """
+    Writes a record with the tags and scores of each image.
+    The records are buffered and written in bulk.
+
+    Attributes:
+        FORMATS (dict[str, str]): Writer of each file extension
+            as `module:Class`, imported the first time it is used.
+        config (TagConfig): Tags settings.
+        buffer_size (int): Records kept before writing them.
+    """
+
+    FORMATS: dict[str, str] = {
+        ".ndjson": "src.output.writers:NDJSONWriter",
+        ".jsonl": "src.output.writers:NDJSONWriter",
+        ".parquet": "src.output.parquet:ParquetWriter",
+    }
+
+    def __init__(self, config: TagConfig | None = None, buffer_size: int = 1024) -> None:
+        if buffer_size <= 0:
+            raise ValueError(f"Invalid buffer size: {buffer_size}")
+        self.config = config or TagConfig()
+        self.buffer_size = buffer_size
+        self._records: list[dict] = []
+
+    @classmethod
+    def make(
+        cls,
+        path: pathlib.Path | str,
+        config: TagConfig | None = None,
+        buffer_size: int = 1024,
+    ) -> "TagWriter":
+        """
+        Creates the writer for the file extension.
+
+        Raises:
+            NotImplementedError: If the extension isn't supported.
+        """
+        path = pathlib.Path(path)
+        if (reference := TagWriter.FORMATS.get(path.suffix.lower())) is None:
+            raise NotImplementedError(f"There is no tag writer for '{path.suffix}' files")
+        module, name = reference.split(":")
+        writer: Callable[..., TagWriter] = getattr(importlib.import_module(module), name)
+        return writer(path, config=config, buffer_size=buffer_size)
+
+    def record(self, image: Image, prediction: numpy.ndarray) -> dict:
+        """
+        Returns the record of an image: its URI and its tags
+        sorted by score.
+
+        Raises:
+            ValueError: If the prediction isn't a score per class.
+        """
+        scores: numpy.ndarray = numpy.asarray(prediction, dtype=numpy.float32)
+        if scores.ndim > 1 and scores.size != scores.shape[-1]:
+            raise ValueError(f"Expected a score per class, found {scores.shape}")
+        scores = scores.ravel()
+        if self.config.labels is not None and len(self.config.labels) != len(scores):
+            raise ValueError(
+                f"Expected {len(self.config.labels)} scores, found {len(scores)}"
+            )
+
+        order: numpy.ndarray = numpy.argsort(-scores, kind="stable")
+        order = order[scores[order] >= self.config.threshold][: self.config.top_k]
+        labels: tuple = self.config.labels or tuple(str(i) for i in range(len(scores)))
+        return {
+            "source": image.source.uri,
+            "tags": [labels[i] for i in order],
+            "scores": scores[order].tolist(),
+        }
+
+    def write(self, image: Image, prediction: numpy.ndarray) -> None:
+        self._records.append(self.record(image=image, prediction=prediction))
+        if len(self._records) >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Writes the buffered records.
+        """
+        if self._records:
+            self.write_records(self._records)
+            self._records = []
+
+    @abc.abstractmethod
+    def write_records(self, records: list[dict]) -> None:
+        """
+        Writes several records at once.
+        """
+
+    def close(self) -> None:
+        self.flush()
+
+
+class NDJSONWriter(TagWriter):
+    """
+    Writes a JSON object per line with the tags of each image.
+
+    Attributes:
+        path (pathlib.Path): Destination file.
+    """
+
+    def __init__(
+        self,
+        path: pathlib.Path | str,
+        config: TagConfig | None = None,
+        buffer_size: int = 1024,
+    ) -> None:
+        super().__init__(config=config, buffer_size=buffer_size)
+        self.path = pathlib.Path(path)
+        # pylint: disable=consider-using-with
+        self._stream = open(self.path, mode="w", encoding="utf-8")
+
+    def write_records(self, records: list[dict]) -> None:
+        self._stream.write("".join(json.dumps(record) + "\n" for record in records))
+        self._stream.flush()
+
+    def close(self) -> None:
+        super().close()
+        self._stream.close()
+
+
+class COGWriter(WriterInterface):
+    """
+    Writes each segmentation mask into a tiled and compressed
+    Cloud-Optimized GeoTIFF, named as its image. The georeference
+    of the image metadata is kept and scaled to the mask size.
+
+    Attributes:
+        directory (pathlib.Path): Destination folder.
+        compress (str): Compression codec, e.g: deflate, zstd, lzw.
+        blocksize (int): Tile size in pixels.
+    """
+
+    def __init__(
+        self,
+        directory: pathlib.Path | str,
+        compress: str = "deflate",
+        blocksize: int = 512,
+    ) -> None:
+        if blocksize <= 0 or blocksize % 16:
+            raise ValueError(f"The block size should be a multiple of 16: {blocksize}")
+        self.directory = pathlib.Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.compress = compress
+        self.blocksize = blocksize
+
+    def path(self, image: Image) -> pathlib.Path:
+        """
+        Returns the destination of the image mask. The
+        tiles of a scene are named after their window.
+        """
+        stem: str = pathlib.PurePosixPath(image.source.name).stem or "image"
+        if (window := (image.metadata or {}).get("window")) is not None:
+            stem = f"{stem}_{window[0]}_{window[1]}"
+        return self.directory.joinpath(f"{stem}.tif")
+
+    def write(self, image: Image, prediction: numpy.ndarray) -> None:
+        mask: numpy.ndarray = prediction[..., None] if prediction.ndim == 2 else prediction
+        if mask.ndim != 3:
+            raise ValueError(f"Expected a (height, width, bands) mask, found {mask.shape}")
+
+        metadata: dict = image.metadata or {}
+        transform = metadata.get("transform")
+        if transform is not None:
+            height, width = image.resolution
+            transform = transform * transform.scale(
+                width / mask.shape[1], height / mask.shape[0]
+            )
+        with rasterio.open(
+            self.path(image),
+            mode="w",
+            driver="COG",
+            height=mask.shape[0],
+            width=mask.shape[1],
+            count=mask.shape[2],
+            dtype=mask.dtype,
+            crs=metadata.get("crs"),
+            transform=transform,
+            compress=self.compress,
+            blocksize=self.blocksize,
+        ) as output:
+            output.write(rasterio.plot.reshape_as_raster(mask))
+
+    def close(self) -> None:
+        pass
+
+
+class BackgroundWriter(WriterInterface):
+    """
+    Runs a writer in a background thread, so writing overlaps
+    with the inference. The queue is bounded: if the writer falls
+    behind, `write` waits instead of accumulating predictions.
+    The errors of the writer are raised by the next call.
+
+    Attributes:
+        writer (WriterInterface): Writer to run.
+    """
+
+    def __init__(self, writer: WriterInterface, max_pending: int = 64) -> None:
+        self.writer = writer
+        self._queue: queue.Queue[tuple[Image, numpy.ndarray] | None] = queue.Queue(
+            maxsize=max_pending
+        )
+        self._error: Exception | None = None
+        self._closed: bool = False
+        self._worker = threading.Thread(
+            target=self.__run, name="background-writer", daemon=True
+        )
+        self._worker.start()
+
+    def __run(self) -> None:
+        """
+        Writer loop. After an error, the remaining predictions
+        are discarded so the producers never block.
+        """
+        while (item := self._queue.get()) is not None:
+            if self._error is not None:
+                continue
+            try:
+                self.writer.write(*item)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                self._error = e
+
+    def __raise(self) -> None:
+        if self._error is not None:
+            raise RuntimeError("Unable to write the predictions") from self._error
+
+    def write(self, image: Image, prediction: numpy.ndarray) -> None:
+        """
+        Queues the prediction to be written.
+
+        Raises:
+            RuntimeError: If the writer is closed or it failed.
+        """
+        if self._closed:
+            raise RuntimeError("The writer is closed")
+        self.__raise()
+        self._queue.put((image, prediction))
+
+    def close(self) -> None:
+        """
+        Waits for the queued predictions to be written
+        and closes the writer.
+        """
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._worker.join()
+            self.writer.close()
+        self.__raise()
@@ -0,0 +1,140 @@
+"""
+This module runs the blocking operations (file
+retrieval, decoding and inference) from asyncio code
+without blocking the event loop.
+"""
+
+import os
+import asyncio
+import functools
+import threading
+from typing import Any, Callable, TypeVar
+from concurrent.futures import ThreadPoolExecutor
+
+T = TypeVar("T")
+
+
+class Executors:
+    """
+    Bounded thread pools for each kind of blocking work, so
+    many concurrent requests share a fixed number of threads
+    instead of using one thread per request. The decoders and
+    the model runtimes release the GIL while they work.
+
+    Attributes:
+        IO (str): Pool to retrieve the files.
+        DECODE (str): Pool to decode the images.
+        PREDICT (str): Pool to run the models.
+    """
+
+    IO: str = "io"
+    DECODE: str = "decode"
+    PREDICT: str = "predict"
+
+    _shared: "Executors | None" = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        io_workers: int = 32,
+        decode_workers: int | None = None,
+        predict_workers: int | None = None,
+    ) -> None:
+        cpus: int = os.cpu_count() or 1
+        workers: dict[str, int] = {
+            Executors.IO: io_workers,
+            Executors.DECODE: decode_workers or cpus,
+            Executors.PREDICT: predict_workers or max(cpus // 2, 1),
+        }
+        if any(n <= 0 for n in workers.values()):
+            raise ValueError(f"Invalid number of workers: {workers}")
+
+        self._pools: dict[str, ThreadPoolExecutor] = {
+            kind: ThreadPoolExecutor(max_workers=n, thread_name_prefix=f"aio-{kind}")
+            for kind, n in workers.items()
+        }
+
+    @classmethod
+    def shared(cls) -> "Executors":
+        """
+        Returns the executors shared by the whole process.
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = Executors()
+            return cls._shared
+
+    @classmethod
+    def configure(
+        cls,
+        io_workers: int = 32,
+        decode_workers: int | None = None,
+        predict_workers: int | None = None,
+    ) -> "Executors":
+        """
+        Replaces the shared executors, e.g: to size them for
+        a web server worker. The previous ones finish their
+        pending work in the background.
+        """
+        executors = Executors(
+            io_workers=io_workers,
+            decode_workers=decode_workers,
+            predict_workers=predict_workers,
+        )
+        with cls._shared_lock:
+            previous, cls._shared = cls._shared, executors
+        if previous is not None:
+            previous.close(wait=False, cancel=False)
+        return executors
+
+    def pool(self, kind: str) -> ThreadPoolExecutor:
+        """
+        Returns the pool for the given kind of work.
+        """
+        if kind not in self._pools:
+            raise ValueError(f"Unknown kind of work: {kind}")
+        return self._pools[kind]
+
+    def close(self, wait: bool = True, cancel: bool = True) -> None:
+        """
+        Stops the pools.
+
+        Args:
+            wait: Whether to wait for the running work.
+            cancel: Whether to cancel the queued work. Otherwise,
+                it still runs before the pools stop.
+        """
+        for pool in self._pools.values():
+            pool.shutdown(wait=wait, cancel_futures=cancel)
+
+
+async def run_blocking(
+    kind: str,
+    func: Callable[..., T],
+    *args: Any,
+    timeout: float | None = None,
+    **kwargs: Any,
+) -> T:
+    """
+    Runs a blocking function in the shared pool for the
+    given kind of work and waits for it without blocking
+    the event loop.
+
+    If the caller is cancelled or the timeout expires before
+    the function starts, it never runs. Otherwise, it finishes
+    in the background and its result is discarded.
+
+    Args:
+        kind: Kind of work, see `Executors`.
+        func: Function to run.
+        timeout: Maximum seconds to wait. None waits forever.
+    Returns:
+        T: The function's result.
+    Raises:
+        TimeoutError: If the timeout expires.
+    """
+    loop = asyncio.get_running_loop()
+    pool: ThreadPoolExecutor = Executors.shared().pool(kind)
+    future = loop.run_in_executor(pool, functools.partial(func, *args, **kwargs))
+    async with asyncio.timeout(timeout):
+        return await future
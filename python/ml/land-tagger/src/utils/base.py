@@ -6,6 +6,76 @@ fields provided are the same as declared.
 """
 from dataclasses import dataclass
 import abc
+import types
+import typing
+import contextlib
+import contextvars
+from typing import Iterator
+
+# Disabled while constructing trusted objects, see `validation`.
+_VALIDATION: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "validation", default=True
+)
+
+
+def _accepted_types(field_type: typing.Any) -> type | tuple[type, ...]:
+    """
+    Returns the types accepted by `isinstance` for an annotation.
+    For unions, each member is used, e.g: `int | None` accepts
+    (int, NoneType), and generic aliases use their origin,
+    e.g: `list[int]` accepts list.
+    """
+    if isinstance(field_type, types.UnionType) or (
+        typing.get_origin(field_type) is typing.Union
+    ):
+        accepted: list[type] = []
+        for arg in typing.get_args(field_type):
+            member = _accepted_types(arg)
+            accepted.extend(member if isinstance(member, tuple) else (member,))
+        return tuple(accepted)
+    if field_type is None:
+        return type(None)
+    if field_type is typing.Any:
+        return object
+    if isinstance(field_type, type):
+        return field_type
+    if isinstance(origin := typing.get_origin(field_type), type):
+        return origin
+    raise TypeError(f"Unsupported field annotation: {field_type!r}")
+
+
+def _compile(cls: type) -> tuple[tuple[str, type | tuple[type, ...], typing.Any], ...]:
+    """
+    Returns the validation plan of a class: the name of each
+    field, the types it accepts and its annotation. The fields
+    declared by the parent classes are included.
+    """
+    annotations: dict = {}
+    for klass in reversed(cls.__mro__):
+        annotations.update(vars(klass).get("__annotations__", {}))
+    return tuple(
+        (name, _accepted_types(field_type), field_type)
+        for name, field_type in annotations.items()
+        if typing.get_origin(field_type) is not typing.ClassVar
+    )
+
+
+@contextlib.contextmanager
+def validation(enabled: bool) -> Iterator[None]:
+    """
+    Enables or disables the type validation of the objects
+    built in the current thread or asyncio task, e.g: to build
+    many objects from trusted values. The values are still
+    checked by `__check_values__`.
+
+        with validation(False):
+            tiles = [Image(source=file, content=c) for c in contents]
+    """
+    token: contextvars.Token = _VALIDATION.set(enabled)
+    try:
+        yield
+    finally:
+        _VALIDATION.reset(token)
 
 
 @dataclass
@@ -13,8 +83,26 @@ class Base(abc.ABC):
     """
     Little base model to include type checking
     for standard data classes.
+
+    The accepted types of each field are resolved once, when
+    the class is created. Subclasses may use `@dataclass(slots=True)`
+    and skip the type validation with `validate=False`:
+
+        @dataclass
+        class Tile(Base, validate=False):
+            ...
     """
 
+    __slots__ = ()
+    __typecheck__: typing.ClassVar[bool] = True
+    __plan__: typing.ClassVar[tuple] = ()
+
+    def __init_subclass__(cls, validate: bool | None = None, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        if validate is not None:
+            cls.__typecheck__ = validate
+        cls.__plan__ = _compile(cls) if cls.__typecheck__ else ()
+
     def __new__(cls, *args, **kwargs):
         # pylint: disable=unused-argument
         if cls == Base:
@@ -27,24 +115,14 @@ class Base(abc.ABC):
         return super().__new__(cls)
 
     def __validate__(self) -> None:
-        # pylint: disable=no-member
-        model_annotations: dict = self.__annotations__
         type_errors: list[str] = []
-        error_num: int = 1
-
-        for name, field_type in model_annotations.items():
-            provided_key = self.__dict__[name]
-            try:
-                type_matches: bool = isinstance(provided_key, field_type)
-            except TypeError:
-                type_matches = isinstance(provided_key, field_type.__args__)
-
-            if not type_matches:
+        for name, accepted, field_type in self.__plan__:
+            provided_key = getattr(self, name)
+            if not isinstance(provided_key, accepted):
                 type_errors.append(
-                    f"{error_num}. The field '{name}' is of type '{type(provided_key)}', but "
-                    f"should be of type '{field_type}' instead."
+                    f"{len(type_errors) + 1}. The field '{name}' is of type "
+                    f"'{type(provided_key)}', but should be of type '{field_type}' instead."
                 )
-                error_num += 1
 
         if type_errors:
             cause: str = f"Validation errors for class: {self.__class__}\n"
@@ -68,5 +146,6 @@ class Base(abc.ABC):
         Force that the schema validation
         is executed for the new objects.
         """
-        self.__validate__()
+        if self.__plan__ and _VALIDATION.get():
+            self.__validate__()
         self.__check_values__()
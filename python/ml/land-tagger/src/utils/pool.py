@@ -0,0 +1,175 @@
+"""
+This module reuses the large arrays allocated for each
+request, e.g: decoded images and model input batches,
+instead of allocating new ones every time.
+"""
+
+import weakref
+import threading
+import contextlib
+import collections
+from typing import Iterator
+import numpy
+import numpy.typing
+from src.utils.base import Base, dataclass
+
+
+@dataclass
+class PoolStats(Base):
+    """
+    Usage of a buffer pool.
+
+    Attributes:
+        hits (int): Buffers reused.
+        misses (int): Buffers allocated.
+        released (int): Buffers returned to the pool.
+        dropped (int): Buffers released but not kept, or
+            evicted to stay under the size limit.
+        pooled_bytes (int): Memory kept by the free buffers.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    released: int = 0
+    dropped: int = 0
+    pooled_bytes: int = 0
+
+    def __check_values__(self):
+        pass
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Returns the fraction of the buffers reused.
+        """
+        requests: int = self.hits + self.misses
+        return self.hits / requests if requests else 0.0
+
+
+class BufferPool:
+    """
+    Keeps the released arrays by shape and dtype to hand them
+    out again. The buffers aren't initialized: their content is
+    whatever their last user left. Once the free buffers exceed
+    `max_bytes`, the least recently used are dropped.
+
+    Attributes:
+        max_bytes (int): Maximum memory kept by the free buffers.
+    """
+
+    _shared: "BufferPool | None" = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_bytes: int = 256 * 2**20) -> None:
+        if max_bytes < 0:
+            raise ValueError(f"Invalid pool size: {max_bytes}")
+        self.max_bytes = max_bytes
+        self._free: collections.OrderedDict[tuple, list[numpy.ndarray]] = (
+            collections.OrderedDict()
+        )
+        # Weak, so the buffers never released are freed as usual.
+        self._leased: weakref.WeakValueDictionary[int, numpy.ndarray] = (
+            weakref.WeakValueDictionary()
+        )
+        self._stats = PoolStats()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "BufferPool":
+        """
+        Returns the pool shared by the whole process.
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = BufferPool()
+            return cls._shared
+
+    @property
+    def stats(self) -> PoolStats:
+        """
+        Returns a snapshot of the pool usage.
+        """
+        with self._lock:
+            return PoolStats(**vars(self._stats))
+
+    def acquire(self, shape: tuple[int, ...], dtype: numpy.typing.DTypeLike) -> numpy.ndarray:
+        """
+        Returns an uninitialized C-contiguous array, reused if a
+        released one has the same shape and dtype.
+        """
+        key: tuple = (tuple(shape), numpy.dtype(dtype).str)
+        with self._lock:
+            if free := self._free.get(key):
+                buffer: numpy.ndarray = free.pop()
+                if not free:
+                    del self._free[key]
+                self._stats.hits += 1
+                self._stats.pooled_bytes -= buffer.nbytes
+            else:
+                buffer = numpy.empty(shape, dtype=dtype)
+                self._stats.misses += 1
+            self._leased[id(buffer)] = buffer
+        return buffer
+
+    def release(self, array: numpy.ndarray) -> None:
+        """
+        Returns a buffer to the pool. Views of the buffer, e.g:
+        an image content with its axes rearranged, are accepted.
+        Don't use the buffer or its views afterwards.
+
+        Raises:
+            ValueError: If the array doesn't come from this pool.
+        """
+        buffer: numpy.ndarray = array
+        with self._lock:
+            while id(buffer) not in self._leased and isinstance(
+                buffer.base, numpy.ndarray
+            ):
+                buffer = buffer.base
+            if self._leased.pop(id(buffer), None) is not buffer:
+                raise ValueError("The array wasn't acquired from this pool")
+            self._stats.released += 1
+            if buffer.nbytes > self.max_bytes:
+                self._stats.dropped += 1
+                return
+            key: tuple = (buffer.shape, buffer.dtype.str)
+            self._free.setdefault(key, []).append(buffer)
+            self._free.move_to_end(key)
+            self._stats.pooled_bytes += buffer.nbytes
+            self.__evict()
+
+    def __evict(self) -> None:
+        """
+        Drops the least recently used buffers until the pool
+        fits its size. Called with the lock held.
+        """
+        while self._stats.pooled_bytes > self.max_bytes:
+            key, free = next(iter(self._free.items()))
+            self._stats.pooled_bytes -= free.pop(0).nbytes
+            self._stats.dropped += 1
+            if not free:
+                del self._free[key]
+
+    @contextlib.contextmanager
+    def buffer(
+        self, shape: tuple[int, ...], dtype: numpy.typing.DTypeLike
+    ) -> Iterator[numpy.ndarray]:
+        """
+        Acquires a buffer and releases it on exit.
+
+            with pool.buffer((32, 224, 224, 3), "float32") as batch:
+                ...
+        """
+        buffer: numpy.ndarray = self.acquire(shape=shape, dtype=dtype)
+        try:
+            yield buffer
+        finally:
+            self.release(buffer)
+
+    def clear(self) -> None:
+        """
+        Drops the free buffers.
+        """
+        with self._lock:
+            self._free.clear()
+            self._stats.pooled_bytes = 0
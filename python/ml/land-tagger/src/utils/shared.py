@@ -0,0 +1,95 @@
+"""
+This module hands arrays over between processes without
+pickling them. The producer writes the array once into a
+memory-backed file and sends a small handle; the consumer
+maps it and gets a `numpy` view without copying it.
+"""
+
+import os
+import pathlib
+import tempfile
+import contextlib
+import numpy
+from src.utils.base import Base, dataclass
+
+
+def shared_directory() -> pathlib.Path:
+    """
+    Returns the folder for the shared arrays: the shared memory
+    filesystem when available, e.g: /dev/shm on Linux, or the
+    temporal folder otherwise.
+    """
+    shm = pathlib.Path("/dev/shm")
+    if shm.is_dir() and os.access(shm, os.W_OK):
+        return shm
+    return pathlib.Path(tempfile.gettempdir())
+
+
+@dataclass
+class SharedArray(Base):
+    """
+    Handle to an array placed in shared memory by another
+    process. It is cheap to pickle, so it can be returned by
+    the process pools instead of the array.
+
+    The array lives while a process references it: `attach`
+    removes its name once it is mapped, so the memory is
+    released with the last view of the array.
+
+    Attributes:
+        path (str): Memory-backed file with the array.
+        shape (tuple): Array shape.
+        dtype (str): Array dtype, e.g: <u2
+    """
+
+    path: str
+    shape: tuple
+    dtype: str
+
+    def __check_values__(self):
+        pass
+
+    @classmethod
+    def create(
+        cls, content: numpy.ndarray, directory: pathlib.Path | None = None
+    ) -> "SharedArray":
+        """
+        Copies the array into shared memory.
+
+        Args:
+            content: Numeric array to share.
+            directory: Folder for the array. Defaults to
+                `shared_directory()`.
+        """
+        fd, path = tempfile.mkstemp(
+            prefix="shared-", suffix=".npy", dir=directory or shared_directory()
+        )
+        try:
+            with os.fdopen(fd, mode="wb") as f:
+                numpy.save(f, content, allow_pickle=False)
+        except BaseException:
+            os.unlink(path)
+            raise
+        return SharedArray(path=path, shape=content.shape, dtype=content.dtype.str)
+
+    def attach(self) -> numpy.ndarray:
+        """
+        Maps the array without copying it. It can be attached
+        only once: its name is removed, so nothing outlives
+        the views of the array.
+
+        Returns:
+            numpy.ndarray: Writable view of the shared array.
+        """
+        content: numpy.ndarray = numpy.load(self.path, mmap_mode="r+")
+        # The mapping stays valid after removing the name (POSIX).
+        with contextlib.suppress(OSError):
+            os.unlink(self.path)
+        return content
+
+    def release(self) -> None:
+        """
+        Releases an array that won't be attached.
+        """
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.path)
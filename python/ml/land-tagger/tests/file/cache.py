@@ -0,0 +1,233 @@
+"""
+This module test that file/cache.py module works
+properly.
+"""
+import os
+import tempfile
+import unittest
+import threading
+import functools
+import http.server
+import multiprocessing
+from pathlib import Path
+from unittest import mock
+import numpy
+from src.file.file import File
+from src.file.cache import FileCache
+
+
+class _Handler(http.server.SimpleHTTPRequestHandler):
+    """
+    Serves the source files, standing in for a remote storage.
+    """
+
+    def log_message(self, *args) -> None:  # pylint: disable=arguments-differ
+        pass
+
+
+def _fill_cache(directory: str, max_bytes: int, worker: int, endpoint: str) -> None:
+    """
+    Stores several files into a shared cache.
+    """
+    cache = FileCache(directory=directory, max_bytes=max_bytes)
+    for i in range(10):
+        path: Path = Path(directory).parent.joinpath(f"{worker}-{i}.bin")
+        path.write_bytes(os.urandom(1 << 10))
+        cache.fetch(file=File(path=f"{endpoint}/{path.name}"))
+
+
+class FileCacheTest(unittest.TestCase):
+    # pylint: disable=too-many-public-methods
+    """
+    Test the `FileCache` class functionalities.
+    """
+
+    CONTENT: bytes = b"Hello World!" * 1024
+
+    def setUp(self) -> None:
+        super().setUp()
+        # pylint: disable=consider-using-with
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.directory: Path = Path(self.tmp_dir.name).joinpath("cache")
+        self.server = http.server.ThreadingHTTPServer(
+            ("127.0.0.1", 0), functools.partial(_Handler, directory=self.tmp_dir.name)
+        )
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.endpoint: str = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.source: str = self.__write("source.tif", FileCacheTest.CONTENT)
+
+    def tearDown(self) -> None:
+        super().tearDown()
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        self.tmp_dir.cleanup()
+
+    def __write(self, name: str, content: bytes) -> str:
+        """
+        Writes a source file and returns its URL.
+        """
+        Path(self.tmp_dir.name).joinpath(name).write_bytes(content)
+        return f"{self.endpoint}/{name}"
+
+    def test_fetch_once(self) -> None:
+        """
+        Check that a file is only retrieved again
+        once it has changed.
+        """
+        cache = FileCache(directory=self.directory)
+        cached: File = cache.fetch(file=File(path=self.source))
+        self.assertEqual(cached.suffix, ".tif")
+        self.assertEqual(bytes(cached.load()), FileCacheTest.CONTENT)
+
+        with mock.patch.object(File, "iter_chunks", side_effect=AssertionError):
+            self.assertEqual(cache.fetch(file=File(path=self.source)).path, cached.path)
+
+        self.__write("source.tif", b"Updated")
+        updated: File = cache.fetch(file=File(path=self.source))
+        self.assertNotEqual(updated.path, cached.path)
+        self.assertEqual(bytes(updated.load()), b"Updated")
+
+    def test_load(self) -> None:
+        """
+        Check that the content is loaded through the cache.
+        """
+        cache = FileCache(directory=self.directory)
+        file: File = File(path=self.source, memory_map=True)
+        content = cache.load(file=file)
+        self.assertIsInstance(content, memoryview)
+        self.assertEqual(bytes(content), FileCacheTest.CONTENT)
+        self.assertIs(file.content, content)
+
+    def test_content_addressed(self) -> None:
+        """
+        Check that the same content is stored once.
+        """
+        cache = FileCache(directory=self.directory)
+        copy: str = self.__write("copy.tif", FileCacheTest.CONTENT)
+        first: File = cache.fetch(file=File(path=self.source))
+        second: File = cache.fetch(file=File(path=copy))
+        in_memory: File = cache.fetch(
+            file=File(path="memory.tif", content=FileCacheTest.CONTENT)
+        )
+        self.assertEqual(first.path, second.path)
+        self.assertEqual(first.path, in_memory.path)
+        # The content plus the references of both URLs.
+        self.assertEqual(cache.size(), len(FileCacheTest.CONTENT) + 2 * 64)
+
+    def test_local_files(self) -> None:
+        """
+        Check that the local files aren't copied, while the
+        arrays decoded from them are cached by version.
+        """
+        cache = FileCache(directory=self.directory)
+        local: File = File(path=Path(self.tmp_dir.name).joinpath("source.tif"))
+        self.assertIs(cache.fetch(file=local), local)
+        self.assertFalse(list(self.directory.glob("objects/*/*")))
+
+        content = numpy.zeros((2, 2, 1), dtype=numpy.uint8)
+        cache.put_array(local, "a", content, {})
+        self.assertIsNotNone(cache.get_array(cached=local, variant="a"))
+        Path(local.path).write_bytes(b"Updated")
+        self.assertIsNone(cache.get_array(cached=local, variant="a"))
+
+    def test_evicted_before_use(self) -> None:
+        """
+        Check that a copy evicted before it is opened
+        is fetched again.
+        """
+        cache = FileCache(directory=self.directory)
+        opened: list[str] = []
+
+        def evict_once(cached: File) -> bytes:
+            if not opened:
+                os.unlink(cached.path)
+            opened.append(str(cached.path))
+            return bytes(cached.load())
+
+        content: bytes = cache.use(file=File(path=self.source), func=evict_once)
+        self.assertEqual(content, FileCacheTest.CONTENT)
+        self.assertEqual(len(opened), 2)
+        # The errors of the copies which weren't evicted are raised.
+        with self.assertRaises(ValueError):
+            cache.use(file=File(path=self.source), func=lambda f: int(f.name))
+
+    def test_arrays(self) -> None:
+        """
+        Check that the decoded arrays are stored by variant
+        and memory-mapped when retrieved.
+        """
+        cache = FileCache(directory=self.directory)
+        cached: File = cache.fetch(file=File(path=self.source))
+        self.assertIsNone(cache.get_array(cached=cached, variant="a"))
+
+        content = numpy.arange(24, dtype=numpy.uint16).reshape((2, 4, 3))
+        cache.put_array(cached, "a", content, {"crs": "EPSG:4326"})
+        decoded = cache.get_array(cached=cached, variant="a")
+        if decoded is None:
+            self.fail("The array should be cached")
+        array, metadata = decoded
+        self.assertIsInstance(array, numpy.memmap)
+        numpy.testing.assert_array_equal(array, content)
+        self.assertEqual(metadata, {"crs": "EPSG:4326"})
+        self.assertIsNone(cache.get_array(cached=cached, variant="b"))
+
+    def test_evict(self) -> None:
+        """
+        Check that the least recently used entries are
+        evicted once the cache is full.
+        """
+        # Three files of 1 KiB and the references of four.
+        max_bytes: int = 3 * (1 << 10) + 4 * 64
+        cache = FileCache(directory=self.directory, max_bytes=max_bytes)
+        files: list[File] = [
+            File(path=self.__write(f"{i}.bin", bytes([i]) * 1024)) for i in range(3)
+        ]
+        cached: list[File] = [cache.fetch(file=file) for file in files]
+        # Make the second file the least recently used.
+        os.utime(cached[1].path, ns=(0, 0))
+
+        cache.fetch(file=File(path=self.__write("3.bin", b"3" * 1024)))
+        self.assertLessEqual(cache.size(), max_bytes)
+        self.assertTrue(Path(cached[0].path).exists())
+        self.assertFalse(Path(cached[1].path).exists())
+
+        # The evicted file is retrieved again.
+        self.assertEqual(cache.fetch(file=files[1]).path, cached[1].path)
+        self.assertTrue(Path(cached[1].path).exists())
+
+        # The references are evicted along with the content.
+        for i in range(4, 20):
+            cache.fetch(file=File(path=self.__write(f"{i}.bin", bytes([i]) * 1024)))
+        self.assertLessEqual(len(list(self.directory.glob("refs/*"))), 4)
+
+    def test_shared_between_processes(self) -> None:
+        """
+        Check that several processes can share the
+        cache without exceeding its size.
+        """
+        max_bytes: int = 8 << 10
+        processes = [
+            multiprocessing.Process(
+                target=_fill_cache,
+                args=(str(self.directory), max_bytes, worker, self.endpoint),
+            )
+            for worker in range(4)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+            self.assertEqual(process.exitcode, 0)
+
+        cache = FileCache(directory=self.directory, max_bytes=max_bytes)
+        self.assertLessEqual(cache.size(), max_bytes)
+        self.assertFalse(list(self.directory.glob("*/.staging-*")))
+
+    def test_invalid_size(self) -> None:
+        """
+        Check that the cache size must be positive.
+        """
+        with self.assertRaises(ValueError):
+            FileCache(directory=self.directory, max_bytes=0)
@@ -3,8 +3,11 @@ This module test that file/file.py module works
 properly.
 """
 import uuid
+import asyncio
+import hashlib
 import tempfile
 import unittest
+import tracemalloc
 from pathlib import Path
 from src.file.file import File
 
@@ -39,7 +42,7 @@ class FileTest(unittest.TestCase):
         loaded_file.load()
         parsed_content: str = ""
         if loaded_file.content:
-            parsed_content = loaded_file.content.decode("utf-8")
+            parsed_content = bytes(loaded_file.content).decode("utf-8")
         self.assertEqual(
             parsed_content, FileTest.CONTENT, "The content is not the same as expected"
         )
@@ -57,3 +60,65 @@ class FileTest(unittest.TestCase):
             invalid_file.load()
 
         self.assertRaises(FileNotFoundError, __execute_error)
+
+    def test_memory_map(self) -> None:
+        """
+        Check that the file can be memory-mapped and
+        its content is not copied into a bytes object.
+        """
+        mapped_file: File = File(path=Path(self.tmp_file.name), memory_map=True)
+        content = mapped_file.load()
+        if not isinstance(content, memoryview):
+            self.fail("The content should be a view")
+        self.assertTrue(content.readonly, "The view should be read-only")
+        self.assertEqual(FileTest.CONTENT, bytes(content).decode("utf-8"))
+
+    def test_stream_memory_map(self) -> None:
+        """
+        Check that a memory-mapped file is streamed
+        without copying its content.
+        """
+        content: bytes = bytes(range(256)) * (32 << 10)
+        with tempfile.TemporaryDirectory() as directory:
+            path: Path = Path(directory).joinpath("large.bin")
+            path.write_bytes(content)
+            mapped_file: File = File(path=path, memory_map=True)
+            mapped_file.load()
+
+            tracemalloc.start()
+            with mapped_file.open_stream() as stream:
+                self.assertEqual(content[:16], stream.read(16))
+                stream.seek(-16, 2)
+                self.assertEqual(content[-16:], stream.read())
+                self.assertEqual(len(content), stream.tell())
+            peak: int = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        self.assertLess(peak, len(content) // 8, msg="The content was copied")
+
+    def test_stream_chunks(self) -> None:
+        """
+        Check that the file can be read by chunks and as
+        a stream without loading its content.
+        """
+        fp = Path(self.tmp_file.name)
+        streamed_file: File = File(path=fp)
+        chunks = [bytes(c) for c in streamed_file.iter_chunks(chunk_size=5)]
+        self.assertEqual([5, 5, 2], [len(c) for c in chunks])
+        self.assertEqual(FileTest.CONTENT, b"".join(chunks).decode("utf-8"))
+
+        with streamed_file.open_stream() as stream:
+            self.assertEqual(FileTest.CONTENT.encode("utf-8"), stream.read())
+        self.assertIsNone(streamed_file.content, "The content shouldn't be loaded")
+
+        expected: str = hashlib.sha256(FileTest.CONTENT.encode("utf-8")).hexdigest()
+        self.assertEqual(expected, streamed_file.digest())
+        self.assertEqual(len(FileTest.CONTENT), streamed_file.size())
+
+    def test_async_load(self) -> None:
+        """
+        Check that the file can be loaded from asyncio code.
+        """
+        async_file: File = File(path=Path(self.tmp_file.name))
+        content = asyncio.run(async_file.aload(timeout=5))
+        self.assertEqual(FileTest.CONTENT, bytes(content).decode("utf-8"))
+        self.assertIs(async_file.content, content)
@@ -0,0 +1,268 @@
+"""
+This module test that file/remote.py module works
+properly.
+"""
+import os
+import threading
+import unittest
+import http.server
+from pathlib import Path
+from unittest import mock
+from src.file.file import File, Loader
+from src.file.remote import HTTPLoader, RemoteConfig, S3Loader
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    """
+    Serves the files of a `_Server`, supporting
+    ranged GETs and keep-alive connections.
+    """
+
+    protocol_version = "HTTP/1.1"
+    server: "_Server"
+
+    def log_message(self, *args) -> None:  # pylint: disable=arguments-differ
+        pass
+
+    def __reply(self, body: bytes | None) -> None:
+        self.server.record(self)
+        if self.server.failures > 0:
+            self.server.failures -= 1
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        content: bytes | None = self.server.files.get(self.path)
+        if content is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        status, start, end = 200, 0, len(content) - 1
+        if header := self.headers.get("Range"):
+            first, last = header.removeprefix("bytes=").split("-")
+            status, start, end = 206, int(first), min(int(last), end)
+
+        self.send_response(status)
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(end - start + 1))
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(content)}")
+        self.end_headers()
+        if body is not None:
+            self.wfile.write(content[start : end + 1])
+
+    def do_HEAD(self) -> None:  # pylint: disable=invalid-name
+        """
+        Replies with the file headers.
+        """
+        self.__reply(body=None)
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        """
+        Replies with the file content.
+        """
+        self.__reply(body=b"")
+
+
+class _Server(http.server.ThreadingHTTPServer):
+    """
+    Local HTTP server used as a stand-in for the remote storages.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, files: dict[str, bytes]) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.files = files
+        self.failures = 0
+        self.clients: set[int] = set()
+        self.requests: list[tuple[str, dict]] = []
+        self._lock = threading.Lock()
+
+    def record(self, handler: _Handler) -> None:
+        """
+        Keeps the request and the client port.
+        """
+        with self._lock:
+            self.clients.add(handler.client_address[1])
+            self.requests.append(
+                (handler.command, {k.lower(): v for k, v in handler.headers.items()})
+            )
+
+    @property
+    def endpoint(self) -> str:
+        """
+        Returns the server URL.
+        """
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class RemoteLoaderTest(unittest.TestCase):
+    # pylint: disable=too-many-public-methods
+    """
+    Test the remote file loaders.
+    """
+
+    CONTENT: bytes = bytes(range(256)) * 1024
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.server = _Server(
+            files={
+                "/image.tif": RemoteLoaderTest.CONTENT,
+                "/bucket/folder/image.tif": RemoteLoaderTest.CONTENT,
+            }
+        )
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self) -> None:
+        super().tearDown()
+        # The shared loaders keep their connections to the server.
+        for loader in list(Loader.HANDLER.values()):
+            if isinstance(loader, HTTPLoader):
+                loader.close()
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def __loader(self, config: RemoteConfig | None = None) -> HTTPLoader:
+        """
+        Returns a loader closed at the end of the test.
+        """
+        loader = HTTPLoader(config=config)
+        self.addCleanup(loader.close)
+        return loader
+
+    def test_parse_uri(self) -> None:
+        """
+        Check that local URIs are converted into paths and
+        the remote ones are kept.
+        """
+        local: File = File(path="file:///tmp/image.tif")
+        self.assertEqual(local.path, Path("/tmp/image.tif"))
+        self.assertTrue(local.is_local)
+
+        remote: File = File(path="s3://bucket/folder/image.tif?versionId=1")
+        self.assertFalse(remote.is_local)
+        self.assertEqual(remote.scheme, "s3")
+        self.assertEqual(remote.name, "image.tif")
+        self.assertEqual(remote.suffix, ".tif")
+
+    def test_http_load(self) -> None:
+        """
+        Check that a file is retrieved from a HTTP server.
+        """
+        remote: File = File(path=f"{self.server.endpoint}/image.tif")
+        self.assertEqual(remote.size(), len(RemoteLoaderTest.CONTENT))
+        self.assertEqual(bytes(remote.load()), RemoteLoaderTest.CONTENT)
+
+    def test_parallel_ranges(self) -> None:
+        """
+        Check that large files are retrieved in parts
+        through pooled connections.
+        """
+        loader = self.__loader(
+            config=RemoteConfig(part_size=16 << 10, parallel_threshold=1, max_connections=4)
+        )
+        content: bytes | memoryview = loader.load(from_path=f"{self.server.endpoint}/image.tif")
+        self.assertEqual(content, RemoteLoaderTest.CONTENT)
+
+        ranged: list = [h for m, h in self.server.requests if "range" in h]
+        self.assertEqual(len(ranged), len(RemoteLoaderTest.CONTENT) // (16 << 10))
+        self.assertLessEqual(len(self.server.clients), 4)
+
+    def test_single_request(self) -> None:
+        """
+        Check that the files fitting in a part take one
+        request and the rest are completed with ranged GETs.
+        """
+        self.server.files["/empty.tif"] = b""
+        loader = self.__loader()
+        self.assertEqual(loader.load(f"{self.server.endpoint}/image.tif"), self.CONTENT)
+        self.assertEqual(loader.load(f"{self.server.endpoint}/empty.tif"), b"")
+        self.assertEqual([m for m, _ in self.server.requests], ["GET", "GET"])
+
+        self.server.requests.clear()
+        loader = self.__loader(config=RemoteConfig(part_size=100 << 10))
+        self.assertEqual(loader.load(f"{self.server.endpoint}/image.tif"), self.CONTENT)
+        ranges: list = [h["range"] for _, h in self.server.requests]
+        self.assertEqual(ranges, [f"bytes=0-{(100 << 10) - 1}", "bytes=102400-262143"])
+
+    def test_stream_chunks(self) -> None:
+        """
+        Check that a remote file is streamed with ranged GETs.
+        """
+        remote: File = File(path=f"{self.server.endpoint}/image.tif")
+        chunks: list = list(remote.iter_chunks(chunk_size=64 << 10))
+        self.assertEqual(len(chunks), 4)
+        self.assertEqual(b"".join(chunks), RemoteLoaderTest.CONTENT)
+        self.assertIsNone(remote.content)
+
+    def test_keep_alive(self) -> None:
+        """
+        Check that the connections are reused between requests.
+        """
+        loader = self.__loader()
+        for _ in range(5):
+            loader.load(from_path=f"{self.server.endpoint}/image.tif")
+        self.assertEqual(len(self.server.requests), 5)
+        self.assertEqual(len(self.server.clients), 1)
+
+    def test_retry(self) -> None:
+        """
+        Check that the failed requests are retried.
+        """
+        self.server.failures = 2
+        loader = self.__loader(config=RemoteConfig(backoff=0.01))
+        content: bytes | memoryview = loader.load(from_path=f"{self.server.endpoint}/image.tif")
+        self.assertEqual(content, RemoteLoaderTest.CONTENT)
+
+        self.server.failures = 10
+        with self.assertRaises(IOError):
+            loader.load(from_path=f"{self.server.endpoint}/image.tif")
+
+    def test_not_found(self) -> None:
+        """
+        Check that a missing remote file raises the same
+        error as a missing local file.
+        """
+        with self.assertRaises(FileNotFoundError):
+            File(path=f"{self.server.endpoint}/missing.tif").load()
+
+    def test_s3_load(self) -> None:
+        """
+        Check that the S3 files are retrieved using path-style
+        URLs and signed requests.
+        """
+        credentials: dict = {
+            "AWS_ACCESS_KEY_ID": "access",
+            "AWS_SECRET_ACCESS_KEY": "secret",
+        }
+        loader = S3Loader(endpoint=self.server.endpoint)
+        self.addCleanup(loader.close)
+        # The registered loader is removed and the previous one restored.
+        handlers = mock.patch.dict(Loader.HANDLER, {"s3": loader})
+        handlers.start()
+        self.addCleanup(handlers.stop)
+        with mock.patch.dict(os.environ, credentials):
+            content = File(path="s3://bucket/folder/image.tif").load()
+
+        self.assertEqual(bytes(content), RemoteLoaderTest.CONTENT)
+        for _, headers in self.server.requests:
+            self.assertTrue(
+                headers["authorization"].startswith(
+                    "AWS4-HMAC-SHA256 Credential=access/"
+                )
+            )
+
+    def test_unknown_scheme(self) -> None:
+        """
+        Check that an error is raised for schemes
+        without a loader.
+        """
+        with self.assertRaises(NotImplementedError):
+            File(path="ftp://server/image.tif").load()
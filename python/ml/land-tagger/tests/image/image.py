@@ -2,14 +2,22 @@
 This module test that image/image.py module
 works properly.
 """
+import pickle
+import asyncio
 import unittest
 import tempfile
+from unittest import mock
 from pathlib import Path
+import numpy
+import rasterio
+import rasterio.transform
 from src.file.file import File
-from src.image.image import Image
+from src.file.cache import FileCache
+from src.image.image import Image, LazyImage, LoadOptions, Loader
 
 
 class ImageTest(unittest.TestCase):
+    # pylint: disable=too-many-public-methods
     """
     Test the `Image` class.
     """
@@ -21,9 +29,13 @@ class ImageTest(unittest.TestCase):
         self.valid_file = self.__valid_image_file()
         self.raster_file = self.__raster_file()
         self.tmp_file, self.empty_file = self.__create_invalid_file(".jpg")
+        # pylint: disable=consider-using-with
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.tiled_file = self.__tiled_raster_file()
 
     def tearDown(self) -> None:
         self.tmp_file.close()
+        self.tmp_dir.cleanup()
 
     def __create_invalid_file(self, extension: str):
         """
@@ -53,6 +65,32 @@ class ImageTest(unittest.TestCase):
         image_path: Path = Path("./tests/image/static/sample.tif").absolute()
         return File(path=image_path)
 
+    def __tiled_raster_file(self) -> File:
+        """
+        Writes a small tiled GeoTIFF into a temporal
+        directory and returns a file object linked to it.
+        """
+        image_path: Path = Path(self.tmp_dir.name).joinpath("tiled.tif")
+        height, width, bands = 300, 200, 3
+        content = numpy.arange(height * width * bands, dtype=numpy.uint16)
+        content = content.reshape((bands, height, width))
+        with rasterio.open(
+            image_path,
+            mode="w",
+            driver="GTiff",
+            height=height,
+            width=width,
+            count=bands,
+            dtype="uint16",
+            crs="EPSG:32631",
+            transform=rasterio.transform.from_origin(500000, 4000000, 10, 10),
+            tiled=True,
+            blockxsize=128,
+            blockysize=128,
+        ) as rf:
+            rf.write(content)
+        return File(path=image_path)
+
     def test_load_image(self) -> None:
         """
         Test that it is possible to load an image
@@ -67,6 +105,83 @@ class ImageTest(unittest.TestCase):
             "Image resolution is not the expected.",
         )
 
+    def test_native_dtype(self) -> None:
+        """
+        Test that the source dtype is kept by default
+        and the int32 cast is still available.
+        """
+        native: Image = Image.make(file=self.tiled_file)
+        self.assertEqual(numpy.uint16, native.dtype, "The source dtype should be kept")
+
+        image: Image = Image.make(file=self.valid_file)
+        self.assertEqual(numpy.uint8, image.dtype, "The source dtype should be kept")
+
+        cast: Image = Image.make(
+            file=self.tiled_file, options=LoadOptions(native_dtype=False)
+        )
+        self.assertEqual(numpy.int32, cast.dtype, "The content should be cast")
+        numpy.testing.assert_array_equal(native.content, cast.content)
+
+    def test_writable_content(self) -> None:
+        """
+        Test that the decoded content can be modified in place.
+        """
+        photo: LazyImage = LazyImage.open(file=self.valid_file)
+        for image in (
+            Image.make(file=self.valid_file),
+            photo.region((10, 20, 30, 40)),
+            Image.make(file=self.tiled_file),
+        ):
+            self.assertTrue(image.content.flags.writeable)
+            image.content[0, 0] = 0
+
+    def test_load_memory_mapped(self) -> None:
+        """
+        Test that images can be decoded from memory-mapped
+        and in-memory content.
+        """
+        photo: Image = Image.make(file=self.valid_file)
+        raster: Image = Image.make(file=self.tiled_file)
+        for file, expected in (
+            (File(path=self.valid_file.path, memory_map=True), photo),
+            (File(path=self.tiled_file.path, memory_map=True), raster),
+            (File(path=Path("in-memory.tif"), content=self.tiled_file.load()), raster),
+        ):
+            image: Image = Image.make(file=file)
+            numpy.testing.assert_array_equal(expected.content, image.content)
+
+    def test_cached_decode(self) -> None:
+        """
+        Test that a cached image is decoded only once and
+        later loads map the decoded array.
+        """
+        cache = FileCache(directory=Path(self.tmp_dir.name).joinpath("cache"))
+        expected: Image = Image.make(file=self.tiled_file, cache=cache)
+        with mock.patch.object(Loader, "load", side_effect=AssertionError):
+            image: Image = Image.make(file=self.tiled_file, cache=cache)
+
+        self.assertIsInstance(image.content, numpy.memmap)
+        self.assertEqual(image.source, self.tiled_file)
+        self.assertEqual(image.metadata, expected.metadata)
+        numpy.testing.assert_array_equal(expected.content, image.content)
+
+        cast: Image = Image.make(
+            file=self.tiled_file, options=LoadOptions(native_dtype=False), cache=cache
+        )
+        self.assertEqual(numpy.int32, cast.dtype, "The options should be cached apart")
+
+    def test_async_load(self) -> None:
+        """
+        Test that an image can be loaded from asyncio code
+        and the load can be bounded by a timeout.
+        """
+        image: Image = asyncio.run(Image.amake(file=self.tiled_file, timeout=5))
+        expected: Image = Image.make(file=self.tiled_file)
+        numpy.testing.assert_array_equal(expected.content, image.content)
+
+        with self.assertRaises(TimeoutError):
+            asyncio.run(Image.amake(file=self.valid_file, timeout=1e-6))
+
     def test_load_invalid_file(self) -> None:
         """
         Test the behavior when an invalid image file
@@ -109,3 +224,155 @@ class ImageTest(unittest.TestCase):
             expected_crs,
             "The coordinate reference system is not the expected"
         )
+
+    def test_raster_block_tiles(self) -> None:
+        """
+        Test that the raster can be read by its internal
+        blocks and the tiles cover the whole raster.
+        """
+        full: Image = Image.make(file=self.tiled_file)
+        tiles: list[Image] = list(Image.tiles(file=self.tiled_file))
+        self.assertEqual(6, len(tiles), "There should be one tile per block")
+
+        covered: int = 0
+        for tile in tiles:
+            metadata: dict = tile.metadata or {}
+            row, col, height, width = metadata["window"]
+            self.assertEqual((height, width), tile.resolution)
+            numpy.testing.assert_array_equal(
+                full.content[row : row + height, col : col + width], tile.content
+            )
+            covered += height * width
+        self.assertEqual(300 * 200, covered, "The tiles should cover the raster")
+
+    def test_raster_tiles_with_overlap(self) -> None:
+        """
+        Test that custom tile sizes are honored and
+        the overlap is clipped to the raster bounds.
+        """
+        tiles: list[Image] = list(
+            Image.tiles(file=self.tiled_file, tile_size=(100, 100), overlap=10)
+        )
+        self.assertEqual(6, len(tiles), "Unexpected number of tiles")
+        self.assertEqual((110, 110), tiles[0].resolution)
+        self.assertEqual((120, 110), tiles[2].resolution)
+
+        first_transform = tiles[0].metadata["transform"] if tiles[0].metadata else None
+        self.assertEqual(
+            rasterio.transform.from_origin(500000, 4000000, 10, 10),
+            first_transform,
+            "The first tile should keep the raster origin",
+        )
+
+    def test_tiles_not_supported(self) -> None:
+        """
+        Test that windowed reads are rejected
+        for non geospatial images.
+        """
+        with self.assertRaises(NotImplementedError):
+            next(Image.tiles(file=self.valid_file))
+
+    def test_lazy_header(self) -> None:
+        """
+        Test that the lazy images only read the header
+        and decode the content the first time it is used.
+        """
+        for file in (self.valid_file, self.tiled_file):
+            with mock.patch.object(Loader, "load", wraps=Loader.load) as load:
+                image = Image.make(file=file, lazy=True)
+                self.assertIsInstance(image, LazyImage)
+                self.assertFalse(image.loaded)
+                expected: Image = Image.make(file=file)
+                self.assertEqual(expected.resolution, image.resolution)
+                self.assertEqual(expected.bands, image.bands)
+                self.assertEqual(expected.metadata, image.metadata)
+                self.assertEqual(load.call_count, 1)
+
+                numpy.testing.assert_array_equal(expected.content, image.content)
+                self.assertIs(image.content, image.content)
+                self.assertTrue(image.loaded)
+                self.assertEqual(load.call_count, 2)
+
+        with self.assertRaises(RuntimeError):
+            Image.make(file=self.empty_file, lazy=True)
+
+    def test_lazy_region(self) -> None:
+        """
+        Test that a region of a lazy image is decoded
+        without decoding the whole image.
+        """
+        expected: Image = Image.make(file=self.tiled_file)
+        image: LazyImage = LazyImage.open(file=self.tiled_file)
+        with mock.patch.object(Loader, "load", side_effect=AssertionError):
+            region: Image = image.region((130, 20, 50, 40))
+        self.assertFalse(image.loaded)
+        numpy.testing.assert_array_equal(
+            region.content, expected.content[130:180, 20:60]
+        )
+        self.assertEqual((region.metadata or {})["window"], (130, 20, 50, 40))
+        self.assertEqual(
+            (region.metadata or {})["transform"],
+            rasterio.transform.from_origin(500200, 3998700, 10, 10),
+        )
+
+        photo: LazyImage = LazyImage.open(
+            file=self.valid_file, options=LoadOptions(native_dtype=False)
+        )
+        crop: Image = photo.region((10, 20, 30, 40))
+        self.assertEqual(crop.content.shape, (30, 40, 3))
+        self.assertEqual(crop.dtype, numpy.int32)
+        with self.assertRaises(ValueError):
+            photo.region((3450, 0, 10, 10))
+
+        restored: LazyImage = pickle.loads(pickle.dumps(image))
+        self.assertEqual(restored.resolution, image.resolution)
+        numpy.testing.assert_array_equal(restored.content, expected.content)
+
+    def test_lazy_region_loaded(self) -> None:
+        """
+        Test that a region has the same metadata before
+        and after the lazy image is decoded.
+        """
+        window: tuple[int, int, int, int] = (30, 10, 20, 25)
+        for options in (LoadOptions(), LoadOptions(size=(55, 40))):
+            image: LazyImage = LazyImage.open(file=self.tiled_file, options=options)
+            before: Image = image.region(window)
+            self.assertIsNotNone(image.content)
+            after: Image = image.region(window)
+            numpy.testing.assert_array_equal(after.content, before.content)
+            for key in ("height", "width", "transform", "window"):
+                self.assertEqual(
+                    (after.metadata or {})[key], (before.metadata or {})[key], key
+                )
+
+    def test_reduced_decode(self) -> None:
+        """
+        Test that the images are decoded at a reduced resolution,
+        never smaller than the target size.
+        """
+        photo: Image = Image.make(
+            file=self.valid_file, options=LoadOptions(size=(224, 224))
+        )
+        self.assertEqual(photo.resolution, (432, 648), "JPEG should scale by 1/8")
+        self.assertEqual(photo.bands, 3)
+
+        options = LoadOptions(size=(55, 40))
+        raster: Image = Image.make(file=self.tiled_file, options=options)
+        self.assertEqual(raster.resolution, (60, 40))
+        self.assertEqual((raster.metadata or {})["factor"], 5)
+        self.assertEqual(
+            (raster.metadata or {})["transform"],
+            rasterio.transform.from_origin(500000, 4000000, 50, 50),
+        )
+
+        lazy = Image.make(file=self.tiled_file, options=options, lazy=True)
+        self.assertEqual(lazy.resolution, raster.resolution)
+        region: Image = lazy.region((10, 20, 30, 20))
+        self.assertEqual((region.metadata or {})["window"], (10, 20, 30, 20))
+        numpy.testing.assert_array_equal(
+            region.content, raster.content[10:40, 20:40]
+        )
+        numpy.testing.assert_array_equal(lazy.content, raster.content)
+
+        with self.assertRaises(ValueError):
+            LoadOptions(size=(0, 224))
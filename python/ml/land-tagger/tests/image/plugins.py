@@ -0,0 +1,134 @@
+"""
+This module test that image/plugins.py module
+works properly.
+"""
+import tempfile
+import unittest
+from pathlib import Path
+import numpy
+import PIL.Image
+import rasterio
+import rasterio.transform
+from src.file.file import File
+from src.image.image import Loader, LoadOptions, ImageInterface, PillowLoader
+from src.image.plugins import PluginRegistry
+
+
+class FakeLoader(ImageInterface):
+    """
+    Little handler that counts its instances and
+    returns an empty image.
+    """
+
+    instances: int = 0
+
+    def __init__(self) -> None:
+        FakeLoader.instances += 1
+
+    def extensions(self) -> set[str]:
+        return {".jpg", ".fake"}
+
+    def signatures(self) -> tuple[bytes, ...]:
+        return (b"FAKE",)
+
+    def load(self, file: File, options: LoadOptions) -> tuple[numpy.ndarray, dict]:
+        return numpy.zeros((1, 1, 1)), {"format": "fake"}
+
+    def arrange_dims(self, content: numpy.ndarray) -> numpy.ndarray:
+        return content
+
+
+class PluginRegistryTest(unittest.TestCase):
+    """
+    Test that the handler of each image file is chosen
+    by its extension and its signature.
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        # pylint: disable=consider-using-with
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.directory = Path(self.tmp_dir.name)
+
+    def tearDown(self) -> None:
+        super().tearDown()
+        self.tmp_dir.cleanup()
+
+    def __png(self, name: str) -> File:
+        """
+        Writes a small PNG image with the given name.
+        """
+        path: Path = self.directory.joinpath(name)
+        content = numpy.full((4, 6, 3), 7, dtype=numpy.uint8)
+        PIL.Image.fromarray(content).save(path, format="PNG")
+        return File(path=path)
+
+    def test_extensions(self) -> None:
+        """
+        Check that the extensions are matched ignoring the case
+        and the files without extension use their signature.
+        """
+        upper: File = self.__png("photo.PNG")
+        self.assertIsInstance(Loader.handler(upper), PillowLoader)
+        for file in (
+            upper,
+            self.__png("photo"),
+            File(path=Path("upload"), content=upper.load()),
+        ):
+            content, metadata = Loader.load(file=file)
+            self.assertEqual(content.shape, (4, 6, 3))
+            self.assertEqual(metadata["format"], "PNG")
+
+        unknown: Path = self.directory.joinpath("notes.xyz")
+        unknown.write_bytes(b"Hello world!")
+        with self.assertRaises(NotImplementedError):
+            Loader.handler(File(path=unknown))
+        with self.assertRaises(RuntimeError):
+            Loader.load(File(path=unknown))
+
+    def test_wrong_extension(self) -> None:
+        """
+        Check that a file whose extension handler fails is
+        decoded by the handler of its signature.
+        """
+        path: Path = self.directory.joinpath("scene.png")
+        with rasterio.open(
+            path,
+            mode="w",
+            driver="GTiff",
+            height=5,
+            width=4,
+            count=3,
+            dtype="uint16",
+            crs="EPSG:32631",
+            transform=rasterio.transform.from_origin(500000, 4000000, 10, 10),
+        ) as rf:
+            rf.write(numpy.ones((3, 5, 4), dtype=numpy.uint16))
+        content, metadata = Loader.load(file=File(path=path))
+        self.assertEqual(content.shape, (5, 4, 3))
+        self.assertEqual(metadata["driver"], "GTiff")
+
+    def test_priority(self) -> None:
+        """
+        Check that the handlers are created on first use and the
+        registered handlers are preferred by priority.
+        """
+        registry: PluginRegistry[ImageInterface] = PluginRegistry(
+            [(10, "src.image.image:PillowLoader"), (5, "tests.image.plugins:FakeLoader")]
+        )
+        created: int = FakeLoader.instances
+        fake = FakeLoader()
+        self.assertEqual(FakeLoader.instances, created + 1)
+        registry.register(fake, priority=20)
+        self.assertEqual(FakeLoader.instances, created + 1, "Created on first use")
+
+        photo: File = self.__png("photo.jpg")
+        self.assertIs(next(registry.candidates(photo)), fake)
+        self.assertEqual(FakeLoader.instances, created + 2)
+        self.assertIsInstance(registry.sniff(photo), PillowLoader)
+
+        registry.unregister(fake)
+        self.assertIsInstance(next(registry.candidates(photo)), PillowLoader)
+        signed: Path = self.directory.joinpath("signed")
+        signed.write_bytes(b"FAKE image")
+        self.assertIsInstance(registry.sniff(File(path=signed)), FakeLoader)
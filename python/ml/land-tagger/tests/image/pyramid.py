@@ -0,0 +1,120 @@
+"""
+This module test that image/pyramid.py module works
+properly.
+"""
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+import numpy
+import PIL.Image
+import rasterio
+import rasterio.enums
+import rasterio.transform
+from src.file.file import File
+from src.file.cache import FileCache
+from src.image.image import Image
+from src.image.pyramid import Pyramid
+
+
+class PyramidTest(unittest.TestCase):
+    """
+    Test that the overviews are read or built and cached.
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        # pylint: disable=consider-using-with
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        content = numpy.arange(64 * 48, dtype=numpy.uint16).reshape((64, 48)) % 251
+        self.content: numpy.ndarray = content
+
+    def tearDown(self) -> None:
+        super().tearDown()
+        self.tmp_dir.cleanup()
+
+    def __raster_file(self, overviews: list[int]) -> File:
+        """
+        Writes the content into a GeoTIFF with the given overviews.
+        """
+        path: Path = Path(self.tmp_dir.name).joinpath("scene.tif")
+        profile: dict = {
+            "driver": "GTiff",
+            "height": self.content.shape[0],
+            "width": self.content.shape[1],
+            "count": 1,
+            "dtype": "uint16",
+            "crs": "EPSG:32631",
+            "transform": rasterio.transform.from_origin(500000, 4000000, 10, 10),
+        }
+        with rasterio.open(path, mode="w", **profile) as rf:
+            rf.write(self.content, 1)
+            if overviews:
+                rf.build_overviews(overviews, rasterio.enums.Resampling.average)
+        return File(path=path)
+
+    def test_from_image(self) -> None:
+        """
+        Check that the overviews average the blocks of pixels.
+        """
+        image = Image(
+            source=File(path=Path("scene.png")), content=self.content[:62, :, None]
+        )
+        pyramid = Pyramid.from_image(image)
+        self.assertEqual(pyramid.factors, Pyramid.DEFAULT_FACTORS)
+        self.assertIs(pyramid.level(1), image)
+
+        overview: Image = pyramid.level(2)
+        self.assertEqual(overview.resolution, (31, 24))
+        self.assertEqual(overview.dtype, numpy.uint16)
+        expected = self.content[:62].reshape((31, 2, 24, 2)).mean(axis=(1, 3))
+        numpy.testing.assert_array_equal(overview.content[..., 0], numpy.rint(expected))
+        self.assertEqual(pyramid.level(8).resolution, (8, 6))
+        self.assertIs(pyramid.level(2), overview)
+
+    def test_raster_overviews(self) -> None:
+        """
+        Check that the overviews stored in a GeoTIFF are used.
+        """
+        pyramid = Pyramid(file=self.__raster_file(overviews=[2, 4]))
+        self.assertEqual(pyramid.factors, (2, 4))
+
+        overview: Image = pyramid.level(4)
+        self.assertEqual(overview.resolution, (16, 12))
+        metadata: dict = overview.metadata or {}
+        self.assertEqual(
+            metadata["transform"], rasterio.transform.from_origin(500000, 4000000, 40, 40)
+        )
+
+    def test_raster_without_overviews(self) -> None:
+        """
+        Check that the overviews are computed when the
+        GeoTIFF doesn't include them.
+        """
+        pyramid = Pyramid(file=self.__raster_file(overviews=[]))
+        self.assertEqual(pyramid.factors, Pyramid.DEFAULT_FACTORS)
+        self.assertEqual(pyramid.level(16).resolution, (4, 3))
+
+    def test_cache(self) -> None:
+        """
+        Check that the overviews are kept in the cache.
+        """
+        path: Path = Path(self.tmp_dir.name).joinpath("scene.png")
+        rgb = numpy.repeat(self.content[..., None], 3, axis=-1).astype(numpy.uint8)
+        PIL.Image.fromarray(rgb).save(path)
+        cache = FileCache(directory=Path(self.tmp_dir.name).joinpath("cache"))
+
+        expected: Image = Pyramid(file=File(path=path), cache=cache).level(4)
+        with mock.patch.object(Image, "make", side_effect=AssertionError):
+            overview: Image = Pyramid(file=File(path=path), cache=cache).level(4)
+        numpy.testing.assert_array_equal(overview.content, expected.content)
+
+    def test_preview(self) -> None:
+        """
+        Check that the finest overview fitting the size is returned.
+        """
+        pyramid = Pyramid(file=self.__raster_file(overviews=[2, 4, 8]))
+        self.assertEqual(pyramid.preview(max_size=20).resolution, (16, 12))
+        self.assertEqual(pyramid.preview(max_size=2).resolution, (8, 6))
+        with self.assertRaises(ValueError):
+            pyramid.level(0)
@@ -3,17 +3,37 @@ This module test the behavior and correctness
 for the module `model/model.py`
 """
 
+import sys
+import asyncio
+import tempfile
 import unittest
+import subprocess
 from pathlib import Path
+from unittest import mock
 import numpy
+import onnxruntime
 
 from src.file.file import File
-from src.model.model import Model
+from src.image.image import Image
+from src.model.model import Backend, Loader, Model
+from src.model.config import ONNXSessionConfig, TensorflowConfig
+from src.model.model_interfaces import ModelImageInterface
 from src.model.tensorflow import TensorflowModel
-from src.model.onnx import ONNXModel
+from src.model.onnx import ONNXLoader, ONNXModel
+
+
+class MeanTransform(ModelImageInterface):
+    """
+    Uses the mean value of the image as
+    the sample for the linear models.
+    """
+
+    def transform(self, img: Image) -> numpy.ndarray:
+        return numpy.array([img.content.mean()], dtype=numpy.float32)
 
 
 class ModelTest(unittest.TestCase):
+    # pylint: disable=too-many-public-methods
     """
     Test that it is possible to load a model
     and perform some predictions.
@@ -135,6 +155,42 @@ class ModelTest(unittest.TestCase):
             self.test_expected_values, pred_samples, msg="The prediction doesn't match"
         )
 
+    def test_async_prediction(self) -> None:
+        """
+        Check that the model can be loaded and run from asyncio
+        code, with concurrent predictions.
+        """
+
+        async def __predict() -> list[numpy.ndarray]:
+            linear_model: Model = await Model.amake(source=self.onnx_example_file)
+            return await asyncio.gather(
+                *(
+                    linear_model.apredict(numpy.array([[t]], dtype=numpy.float32), 5)
+                    for t in self.test_values
+                )
+            )
+
+        result = numpy.round(numpy.array(asyncio.run(__predict())))
+        self.assertEqual(
+            self.test_expected_values,
+            list(result.flatten().astype(int)),
+            msg="The prediction doesn't match",
+        )
+
+    def test_prediction_cast_onnx_model(self) -> None:
+        """
+        Check that samples in a different dtype are
+        cast to the input layer's dtype before the prediction.
+        """
+        linear_model: Model = Model.make(source=self.onnx_example_file)
+        results: list[int] = [
+            int(numpy.round(linear_model.model.predict(numpy.array([[t]]))).item())
+            for t in self.test_values
+        ]
+        self.assertEqual(
+            self.test_expected_values, results, msg="The prediction doesn't match"
+        )
+
     def test_input_dtype_onnx_model(self) -> None:
         """
         Retrieve the input shape and the dtype
@@ -147,3 +203,278 @@ class ModelTest(unittest.TestCase):
         self.assertEqual(
             linear_model.model.input_shape, (1, 1), msg="The input shape doesn't match"
         )
+
+    def test_predict_batch_onnx_model(self) -> None:
+        """
+        Check that the samples are grouped using the
+        batch size declared by the ONNX model.
+        """
+        linear_model: Model = Model.make(source=self.onnx_example_file)
+        self.assertEqual(1, linear_model.model.batch_size, "The batch size is fixed")
+        samples = [numpy.array([t], dtype=numpy.float32) for t in self.test_values]
+        results = linear_model.model.predict_batch(samples=samples)
+        pred_samples: list[int] = [int(numpy.round(r).item()) for r in results]
+        self.assertEqual(
+            self.test_expected_values, pred_samples, msg="The prediction doesn't match"
+        )
+
+    def test_predict_batch_tensorflow_model(self) -> None:
+        """
+        Check that the last partial batch is predicted and
+        the outputs are split back per sample.
+        """
+        linear_model: Model = Model.make(source=self.tf_example_file)
+        self.assertIsNone(linear_model.model.batch_size, "The batch size is dynamic")
+        samples = [numpy.array([t]) for t in self.test_values]
+        results = linear_model.model.predict_batch(samples=samples, batch_size=2)
+        self.assertEqual(len(samples), len(results), "Expected one result per sample")
+        pred_samples: list[int] = [int(numpy.round(r).item()) for r in results]
+        self.assertEqual(
+            self.test_expected_values, pred_samples, msg="The prediction doesn't match"
+        )
+
+    def test_predict_batch_invalid_sample(self) -> None:
+        """
+        Check that a sample not matching the input layer
+        is rejected before calling the backend.
+        """
+        for source in (self.onnx_example_file, self.tf_example_file):
+            linear_model: Model = Model.make(source=source)
+            self.assertEqual((1,), linear_model.model.sample_shape)
+            with mock.patch.object(
+                type(linear_model.model), "predict", side_effect=AssertionError
+            ):
+                with self.assertRaises(ValueError):
+                    linear_model.model.predict_batch(samples=[numpy.zeros((2,))])
+
+    def test_predict_images(self) -> None:
+        """
+        Check that the predictions are matched with
+        the images they were generated from.
+        """
+        linear_model: Model = Model.make(source=self.tf_example_file)
+        images: list[Image] = [
+            Image(
+                source=self.tf_example_file,
+                content=numpy.full((2, 2, 1), t, dtype=numpy.uint8),
+            )
+            for t in self.test_values
+        ]
+        results = list(
+            linear_model.predict_images(
+                images=images, transform=MeanTransform(), batch_size=2
+            )
+        )
+        self.assertEqual(
+            images, [image for image, _ in results], msg="The images order changed"
+        )
+        pred_samples: list[int] = [int(numpy.round(r).item()) for _, r in results]
+        self.assertEqual(
+            self.test_expected_values, pred_samples, msg="The prediction doesn't match"
+        )
+
+    def test_onnx_session_config(self) -> None:
+        """
+        Check that the session configuration is applied
+        and the optimized graph is stored and reused.
+        """
+        with tempfile.TemporaryDirectory() as cache_dir:
+            config = ONNXSessionConfig(
+                intra_op_num_threads=1,
+                inter_op_num_threads=1,
+                graph_optimization_level="extended",
+                optimized_model_dir=Path(cache_dir),
+                providers=("CPUExecutionProvider",),
+            )
+            first: Model = Model.make(source=self.onnx_example_file, config=config)
+            cached: list[Path] = list(Path(cache_dir).glob("*.extended.onnx"))
+            self.assertEqual(1, len(cached), msg="The optimized graph wasn't stored")
+
+            second: Model = Model.make(source=self.onnx_example_file, config=config)
+            self.assertEqual(
+                cached, list(Path(cache_dir).iterdir()), msg="Unexpected cache files"
+            )
+            # Other providers or runtime versions don't reuse the graph.
+            other_providers = ONNXSessionConfig(
+                graph_optimization_level="extended",
+                optimized_model_dir=Path(cache_dir),
+                providers=("AzureExecutionProvider", "CPUExecutionProvider"),
+            )
+            Model.make(source=self.onnx_example_file, config=other_providers)
+            with mock.patch.object(onnxruntime, "__version__", "0.0.0"):
+                Model.make(source=self.onnx_example_file, config=config)
+            self.assertEqual(3, len(list(Path(cache_dir).iterdir())))
+
+            sample = numpy.array([[3]], dtype=numpy.float32)
+            for linear_model in (first, second):
+                result = int(numpy.round(linear_model.model.predict(sample)).item())
+                self.assertEqual(7, result, msg="The prediction doesn't match")
+
+    def test_invalid_onnx_session_config(self) -> None:
+        """
+        Check that invalid session options are rejected.
+        """
+        self.assertRaises(ValueError, ONNXSessionConfig, execution_mode="random")
+        self.assertRaises(ValueError, ONNXSessionConfig, intra_op_num_threads=-1)
+
+    def test_bound_onnx_model(self) -> None:
+        """
+        Check that the bound session reuses its buffers
+        and produces the same predictions.
+        """
+        linear_model = ONNXLoader().load(source=self.onnx_example_file)
+        if not isinstance(linear_model, ONNXModel):
+            self.fail("The implementation class for this case doesn't match")
+        bound = linear_model.bind()
+        outputs = None
+        for value, expected in zip(self.test_values, self.test_expected_values):
+            bound.input[:] = value
+            results = bound.run()
+            if outputs is not None:
+                self.assertIs(outputs, results[0], msg="The outputs should be reused")
+            outputs = results[0]
+            self.assertEqual(expected, int(numpy.round(outputs).item()))
+
+        results = bound.run(sample=numpy.array([[5]]))
+        self.assertEqual(11, int(numpy.round(results[0]).item()))
+        self.assertRaises(ValueError, bound.run, numpy.zeros((2, 1)))
+
+    def test_bound_onnx_input(self) -> None:
+        """
+        Check that a caller-supplied input buffer is bound
+        as-is and the invalid ones are rejected.
+        """
+        linear_model = ONNXLoader().load(source=self.onnx_example_file)
+        if not isinstance(linear_model, ONNXModel):
+            self.fail("The implementation class for this case doesn't match")
+        buffer = numpy.zeros(linear_model.input_shape, dtype=linear_model.input_dtype)
+        bound = linear_model.bind(input=buffer)
+        self.assertIs(buffer, bound.input)
+        buffer[:] = 5
+        self.assertEqual(11, int(numpy.round(bound.run()[0]).item()))
+
+        for invalid in (
+            numpy.zeros((2, 1), dtype=linear_model.input_dtype),
+            numpy.zeros(linear_model.input_shape, dtype=numpy.int8),
+        ):
+            self.assertRaises(ValueError, linear_model.bind, input=invalid)
+        transposed = numpy.zeros((2, 3), dtype=linear_model.input_dtype).T
+        self.assertRaises(ValueError, linear_model.bind, shape=(3, 2), input=transposed)
+
+    def test_tensorflow_direct_call(self) -> None:
+        """
+        Check that the model is traced while loading and both
+        the direct call and `model.predict` paths match.
+        """
+        for jit_compile in (False, True):
+            config = TensorflowConfig(jit_compile=jit_compile, predict_threshold=3)
+            linear_model: Model = Model.make(source=self.tf_example_file, config=config)
+            small = linear_model.model.predict(numpy.array([[1], [3]]))
+            large = linear_model.model.predict(numpy.array(self.test_values))
+            self.assertEqual(
+                self.test_expected_values[:2],
+                list(numpy.round(small).flatten().astype(int)),
+                msg="The direct call prediction doesn't match",
+            )
+            self.assertEqual(
+                self.test_expected_values,
+                list(numpy.round(large).flatten().astype(int)),
+                msg="The `model.predict` prediction doesn't match",
+            )
+
+    def test_tensorflow_multi_input(self) -> None:
+        """
+        Check that the models with several inputs still
+        take a list or dict of arrays.
+        """
+        # pylint: disable=import-outside-toplevel
+        import keras
+
+        first = keras.Input(shape=(1,), name="first")
+        second = keras.Input(shape=(1,), name="second")
+        linear_model = TensorflowModel(
+            model=keras.Model(
+                inputs=[first, second], outputs=keras.layers.Add()([first, second])
+            )
+        )
+        values = numpy.array([[1], [2]], dtype=numpy.float32)
+        for sample in ([values, values * 2], {"first": values, "second": values * 2}):
+            outputs = linear_model.predict(sample)  # type: ignore[arg-type]
+            self.assertEqual([3, 6], list(numpy.round(outputs).flatten().astype(int)))
+
+    def test_lazy_backend_import(self) -> None:
+        """
+        Check that Tensorflow is only imported when
+        a Tensorflow model is loaded.
+        """
+        script: str = (
+            "import sys\n"
+            "from pathlib import Path\n"
+            "from src.file.file import File\n"
+            "from src.model.model import Model\n"
+            f"Model.make(File(path=Path('{self.onnx_example_file.path}')))\n"
+            "print('tensorflow' in sys.modules)\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, check=True, text=True
+        )
+        self.assertEqual(
+            "False", result.stdout.strip(), msg="Tensorflow was imported eagerly"
+        )
+
+    def test_fallback_backend(self) -> None:
+        """
+        Check that the extensions no backend handles
+        are loaded with Tensorflow.
+        """
+        for name in ("model.pb", "model.unknown"):
+            backend, _ = Loader.resolve(source=File(path=Path(name)))
+            self.assertEqual("tensorflow", backend.name)
+        backend, _ = Loader.resolve(source=self.onnx_example_file)
+        self.assertEqual("onnx", backend.name)
+
+    def test_preferred_backend(self) -> None:
+        """
+        Check that a preferred backend uses a converted
+        sibling file if it exists.
+        """
+        linear_model: Model = Model.make(
+            source=self.tf_example_file, prefer=("onnx", "tensorflow")
+        )
+        self.assertIsInstance(linear_model.model, ONNXModel)
+        self.assertEqual(self.onnx_example_file.path, linear_model.source.path)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            keras_copy = Path(tmp_dir).joinpath("linear.keras")
+            keras_copy.write_bytes(self.tf_example_file.load())
+            fallback: Model = Model.make(
+                source=File(path=keras_copy), prefer=("onnx", "tensorflow")
+            )
+            self.assertIsInstance(fallback.model, TensorflowModel)
+
+        self.assertRaises(
+            RuntimeError, Model.make, self.tf_example_file, None, ("unknown",)
+        )
+
+    def test_register_backend(self) -> None:
+        """
+        Check that a registered backend with a higher
+        priority takes over the format.
+        """
+
+        class CustomLoader(ONNXLoader):
+            """
+            ONNX loader registered as a custom backend.
+            """
+
+            FORMATS = frozenset({".onnx"})
+            PRIORITY = 100
+
+        Loader.register(Backend.from_loader(name="custom", loader=CustomLoader))
+        try:
+            backend, _ = Loader.resolve(source=self.onnx_example_file)
+            self.assertEqual("custom", backend.name)
+        finally:
+            del Loader.BACKENDS["custom"]
+
+        self.assertRaises(RuntimeError, Model.make, File(path=Path("model.unknown")))
@@ -0,0 +1,135 @@
+"""
+This module test the behavior and correctness
+for the module `model/pipeline.py`
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+import numpy
+import PIL.Image
+
+from src.file.file import File
+from src.model.model import Model
+from src.model.pipeline import Pipeline, PipelineConfig
+from tests.model.model import MeanTransform
+from tests.model.scheduler import DoubleModel
+
+
+class PipelineTest(unittest.TestCase):
+    """
+    Test that many images are retrieved, decoded
+    and predicted concurrently.
+    """
+
+    IMAGES: int = 24
+
+    def setUp(self) -> None:
+        super().setUp()
+        # pylint: disable=consider-using-with
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.paths: list[Path] = []
+        for value in range(PipelineTest.IMAGES):
+            path: Path = Path(self.tmp_dir.name).joinpath(f"{value}.png")
+            PIL.Image.new("RGB", (32, 16), color=(value, value, value)).save(path)
+            self.paths.append(path)
+        self.results: list = []
+        self.backend = DoubleModel()
+        self.model = Model(source=File(path=Path("double.onnx")), model=self.backend)
+
+    def tearDown(self) -> None:
+        super().tearDown()
+        self.tmp_dir.cleanup()
+
+    def __run(self, config: PipelineConfig) -> Pipeline:
+        with Pipeline(
+            model=self.model, config=config, transform=MeanTransform()
+        ) as pipeline:
+            results = list(pipeline.run(sources=iter(self.paths)))
+
+        self.assertEqual(len(results), PipelineTest.IMAGES)
+        self.results = results
+        for image, prediction in results:
+            value: int = int(Path(image.source.path).stem)
+            self.assertEqual(image.resolution, (16, 32))
+            self.assertEqual(float(prediction.item()), 2.0 * value)
+        if config.ordered:
+            self.assertEqual(
+                [image.source.path for image, _ in results],
+                self.paths,
+                msg="The predictions should keep the sources order",
+            )
+        return pipeline
+
+    def test_ordered(self) -> None:
+        """
+        Check that the predictions keep the sources order and
+        the batches are bounded.
+        """
+        pipeline = self.__run(
+            PipelineConfig(decode_workers=0, max_pending=8, batch_size=4)
+        )
+        self.assertLessEqual(max(self.backend.batches), 4)
+
+        stats = pipeline.stats
+        for stage in (stats.fetch, stats.decode, stats.predict):
+            self.assertEqual(stage.items, PipelineTest.IMAGES)
+            self.assertGreater(stage.throughput, 0.0)
+
+    def test_ordered_single_batches(self) -> None:
+        """
+        Check that the images completed out of order and left
+        waiting are released without new results.
+        """
+        self.__run(PipelineConfig(decode_workers=0, max_pending=24, batch_size=1))
+
+    def test_completion_order(self) -> None:
+        """
+        Check that the predictions are yielded as they complete.
+        """
+        self.__run(PipelineConfig(decode_workers=0, ordered=False, batch_size=4))
+
+    def test_decode_processes(self) -> None:
+        """
+        Check that the images can be decoded in other processes.
+        """
+        pipeline = self.__run(PipelineConfig(decode_workers=2, fetch_workers=2))
+        self.assertGreater(pipeline.stats.decode.busy_time, 0.0)
+        for image, _ in self.results:
+            self.assertIsInstance(image.content, numpy.memmap, "Shared, not pickled")
+
+        self.__run(PipelineConfig(decode_workers=1, shared_memory=False))
+        self.assertNotIsInstance(self.results[0][0].content, numpy.memmap)
+
+    def test_backpressure(self) -> None:
+        """
+        Check that the sources are read only while there
+        are free slots.
+        """
+        read: list[Path] = []
+
+        def __sources():
+            for path in self.paths:
+                read.append(path)
+                yield path
+
+        with Pipeline(
+            model=self.model,
+            config=PipelineConfig(decode_workers=0, max_pending=4, batch_size=1),
+            transform=MeanTransform(),
+        ) as pipeline:
+            results = pipeline.run(sources=__sources())
+            next(results)
+            self.assertLessEqual(len(read), 5)
+            results.close()
+
+    def test_invalid_image(self) -> None:
+        """
+        Check that the errors are raised in the caller.
+        """
+        sources = [*self.paths[:2], Path(self.tmp_dir.name).joinpath("missing.png")]
+        with Pipeline(
+            model=self.model, config=PipelineConfig(decode_workers=0)
+        ) as pipeline:
+            with self.assertRaises(RuntimeError):
+                list(pipeline.run(sources=sources))
@@ -0,0 +1,148 @@
+"""
+This module test the behavior and correctness
+for the module `model/preprocessing.py`
+"""
+
+import unittest
+import tracemalloc
+from pathlib import Path
+import numpy
+import PIL.Image
+
+from src.file.file import File
+from src.image.image import Image
+from src.model.model import Model
+from src.model.model_interfaces import ModelInterface
+from src.model.preprocessing import Preprocessing, PreprocessingConfig
+
+
+class ImageModel(ModelInterface):
+    """
+    Little model taking images of a fixed size and
+    returning the mean of each sample.
+    """
+
+    def predict(self, sample: numpy.ndarray) -> numpy.ndarray:
+        return sample.mean(axis=(1, 2, 3))
+
+    @property
+    def input_shape(self) -> tuple[int, ...]:
+        return (-1, 8, 6, 2)
+
+    @property
+    def input_dtype(self) -> str:
+        return "float32"
+
+
+class PreprocessingTest(unittest.TestCase):
+    """
+    Test that the images are transformed into samples.
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        content = numpy.arange(16 * 12 * 3, dtype=numpy.uint16).reshape((16, 12, 3))
+        self.image = Image(source=File(path=Path("image.tif")), content=content)
+
+    def test_for_model(self) -> None:
+        """
+        Check that the sample matches the model's input.
+        """
+        model = ImageModel()
+        transform = Preprocessing.for_model(
+            model=model, config=PreprocessingConfig(bands=(2, 0))
+        )
+        sample = transform.transform(self.image)
+        self.assertEqual(sample.shape, (8, 6, 2))
+        self.assertEqual(sample.dtype, numpy.float32)
+
+        predictions = list(
+            Model(source=File(path=Path("mean.onnx")), model=model).predict_images(
+                images=[self.image, self.image], transform=transform
+            )
+        )
+        self.assertEqual(len(predictions), 2)
+
+    def test_nearest(self) -> None:
+        """
+        Check the nearest resize, band selection and normalization.
+        """
+        transform = Preprocessing(
+            config=PreprocessingConfig(
+                size=(8, 6),
+                bands=(2, 1),
+                scale=0.5,
+                mean=(1.0, 2.0),
+                std=(2.0, 4.0),
+                resize="nearest",
+            )
+        )
+        content = self.image.content.astype(numpy.float64)
+        expected = content[1::2, 1::2][..., [2, 1]] * 0.5
+        expected = (expected - [1.0, 2.0]) / [2.0, 4.0]
+        numpy.testing.assert_allclose(transform.transform(self.image), expected, rtol=1e-6)
+
+    def test_bilinear(self) -> None:
+        """
+        Check that the bilinear resize matches Pillow's.
+        """
+        content = numpy.random.default_rng(0).integers(0, 255, (10, 7, 1), numpy.uint8)
+        image = Image(source=File(path=Path("image.png")), content=content)
+        transform = Preprocessing(config=PreprocessingConfig(size=(20, 14)), dtype="uint8")
+
+        expected = PIL.Image.fromarray(content[..., 0]).resize(
+            (14, 20), PIL.Image.Resampling.BILINEAR
+        )
+        difference = transform.transform(image)[..., 0].astype(int) - numpy.asarray(expected)
+        self.assertLessEqual(numpy.abs(difference).max(), 1)
+
+    def test_layout(self) -> None:
+        """
+        Check the channels first layout and the batch dimension.
+        """
+        transform = Preprocessing(
+            config=PreprocessingConfig(size=(16, 12), channels_first=True, batch_dim=True),
+            dtype="int32",
+        )
+        sample = transform.transform(self.image)
+        self.assertEqual(sample.shape, (1, 3, 16, 12))
+        numpy.testing.assert_array_equal(sample[0], self.image.content.transpose(2, 0, 1))
+
+        with self.assertRaises(ValueError):
+            transform.transform_into(self.image, numpy.empty((3, 16, 12), numpy.int32))
+
+    def test_no_allocations(self) -> None:
+        """
+        Check that transforming into an existing array doesn't
+        allocate once the plan is ready.
+        """
+        transform = Preprocessing(config=PreprocessingConfig(size=(64, 64)))
+        content = numpy.ones((512, 512, 3), dtype=numpy.uint8)
+        image = Image(source=File(path=Path("image.png")), content=content)
+        out = numpy.empty((64, 64, 3), dtype=numpy.float32)
+        transform.transform_into(image, out)
+
+        tracemalloc.start()
+        for _ in range(10):
+            transform.transform_into(image, out)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.assertLess(peak, out.nbytes)
+        numpy.testing.assert_array_equal(out, 1.0)
+
+    def test_invalid_config(self) -> None:
+        """
+        Check that the invalid settings are rejected.
+        """
+        with self.assertRaises(ValueError):
+            PreprocessingConfig(resize="cubic")
+        with self.assertRaises(ValueError):
+            Preprocessing(config=PreprocessingConfig())
+        with self.assertRaises(ValueError):
+            Preprocessing(
+                config=PreprocessingConfig(size=(4, 4), bands=(5,))
+            ).transform(self.image)
+        with self.assertRaises(ValueError):
+            Preprocessing(
+                config=PreprocessingConfig(size=(4, 4), mean=(1.0,))
+            ).transform(self.image)
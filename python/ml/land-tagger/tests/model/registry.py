@@ -0,0 +1,103 @@
+"""
+This module test the behavior and correctness
+for the module `model/registry.py`
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+from concurrent.futures import ThreadPoolExecutor
+
+from src.file.file import File
+from src.model.config import ONNXSessionConfig
+from src.model.registry import ModelRegistry
+
+
+class ModelRegistryTest(unittest.TestCase):
+    """
+    Test that the loaded models are reused and
+    evicted according to the budget.
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.onnx_path = Path(
+            "./tests/model/static/linear-two-times-x-plus-one.onnx"
+        ).absolute()
+        self.tf_path = Path(
+            "./tests/model/static/linear-two-times-x-plus-one.keras"
+        ).absolute()
+
+    def test_reuse_model(self) -> None:
+        """
+        Check that the same model is returned for the
+        same file and different ones for other configurations.
+        """
+        registry = ModelRegistry()
+        first = registry.get(source=File(path=self.onnx_path))
+        second = registry.get(source=File(path=self.onnx_path))
+        self.assertIs(first, second, msg="The model should be reused")
+
+        other = registry.get(
+            source=File(path=self.onnx_path),
+            config=ONNXSessionConfig(intra_op_num_threads=1),
+        )
+        self.assertIsNot(first, other, msg="The configuration is part of the key")
+        self.assertEqual(2, len(registry), msg="Unexpected number of models")
+
+    def test_version_key(self) -> None:
+        """
+        Check that a cache hit doesn't hash the model and
+        a modified file is loaded again.
+        """
+        registry = ModelRegistry()
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory).joinpath(self.onnx_path.name)
+            shutil.copyfile(self.onnx_path, path)
+            first = registry.get(source=File(path=path))
+            with mock.patch.object(File, "digest", side_effect=AssertionError):
+                self.assertIs(first, registry.get(source=File(path=path)))
+
+            stat = path.stat()
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+            self.assertIsNot(first, registry.get(source=File(path=path)))
+
+    def test_concurrent_loads(self) -> None:
+        """
+        Check that concurrent requests share one load.
+        """
+        registry = ModelRegistry()
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            models = list(
+                pool.map(lambda _: registry.get(File(path=self.onnx_path)), range(8))
+            )
+        self.assertEqual(1, len({id(m) for m in models}), msg="Loaded more than once")
+
+    def test_evict_models(self) -> None:
+        """
+        Check that the least recently used model is evicted
+        and the resident size is reported.
+        """
+        registry = ModelRegistry(max_models=1)
+        registry.get(source=File(path=self.onnx_path))
+        registry.get(source=File(path=self.tf_path))
+        usage = registry.usage()
+        self.assertEqual([self.tf_path], [u.path for u in usage])
+        self.assertGreater(usage[0].resident_size, 0, msg="Unknown resident size")
+
+        budget = ModelRegistry(max_bytes=1)
+        budget.get(source=File(path=self.onnx_path))
+        budget.get(source=File(path=self.tf_path))
+        self.assertEqual(1, len(budget), msg="The memory budget wasn't applied")
+
+    def test_invalid_model(self) -> None:
+        """
+        Check that a failed load is reported and not cached.
+        """
+        registry = ModelRegistry()
+        invalid = File(path=Path(__file__).absolute().with_suffix(".onnx"), content=b"?")
+        self.assertRaises(RuntimeError, registry.get, invalid)
+        self.assertEqual(0, len(registry), msg="A failed load shouldn't be cached")
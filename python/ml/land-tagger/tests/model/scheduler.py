@@ -0,0 +1,165 @@
+"""
+This module test the behavior and correctness
+for the module `model/scheduler.py`
+"""
+
+import asyncio
+import threading
+import unittest
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import numpy
+
+from src.file.file import File
+from src.model.model import Model
+from src.model.model_interfaces import ModelInterface
+from src.model.scheduler import BatchScheduler
+
+
+class DoubleModel(ModelInterface):
+    """
+    Little model that doubles its input and
+    keeps track of the batches it received.
+    """
+
+    def __init__(self) -> None:
+        self.batches: list[int] = []
+        self.lock = threading.Lock()
+
+    def predict(self, sample: numpy.ndarray) -> numpy.ndarray:
+        with self.lock:
+            self.batches.append(sample.shape[0])
+        return sample * 2
+
+    @property
+    def input_shape(self) -> tuple[int, ...]:
+        return (1,)
+
+    @property
+    def sample_shape(self) -> tuple | None:
+        # Any sample can be doubled.
+        return None
+
+    @property
+    def input_dtype(self) -> str:
+        return "float32"
+
+
+class StrictDoubleModel(DoubleModel):
+    """
+    Double model which rejects the samples that
+    don't match its input shape.
+    """
+
+    def predict(self, sample: numpy.ndarray) -> numpy.ndarray:
+        if sample.shape[1:] != self.input_shape:
+            raise ValueError(f"Invalid sample shape: {sample.shape[1:]}")
+        return super().predict(sample)
+
+
+class BatchSchedulerTest(unittest.TestCase):
+    """
+    Test that the requests from concurrent callers
+    are merged into batches.
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.backend = DoubleModel()
+        self.model = Model(source=File(path=Path("double.onnx")), model=self.backend)
+
+    def test_concurrent_requests(self) -> None:
+        """
+        Check that each caller receives its own prediction
+        and the requests share backend calls.
+        """
+        values: list[int] = list(range(64))
+        with BatchScheduler(model=self.model, max_batch_size=16, max_wait=0.05) as sch:
+            with ThreadPoolExecutor(max_workers=16) as pool:
+                results = list(
+                    pool.map(lambda v: sch.predict(numpy.array([v])), values)
+                )
+            metrics = sch.metrics
+
+        self.assertEqual(
+            [2 * v for v in values],
+            [int(r.item()) for r in results],
+            msg="The predictions don't match their requests",
+        )
+        self.assertEqual(len(values), metrics.requests, msg="Unexpected requests")
+        self.assertLess(
+            metrics.batches, len(values), msg="The requests should share batches"
+        )
+        self.assertLessEqual(max(self.backend.batches), 16, msg="The batch is too big")
+        self.assertGreaterEqual(metrics.queue_time, 0.0)
+        self.assertGreater(metrics.compute_time, 0.0)
+
+    def test_async_requests(self) -> None:
+        """
+        Check that asyncio tasks can wait for their
+        predictions without blocking the event loop.
+        """
+
+        async def __run(scheduler: BatchScheduler) -> list[numpy.ndarray]:
+            return await asyncio.gather(
+                *(scheduler.asubmit(numpy.array([v])) for v in range(8))
+            )
+
+        with BatchScheduler(model=self.model, max_batch_size=8, max_wait=0.05) as sch:
+            results = asyncio.run(__run(sch))
+
+        self.assertEqual(
+            [2 * v for v in range(8)],
+            [int(r.item()) for r in results],
+            msg="The predictions don't match their requests",
+        )
+
+    def test_closed_scheduler(self) -> None:
+        """
+        Check that a closed scheduler rejects new requests.
+        """
+        scheduler = BatchScheduler(model=self.model)
+        scheduler.close()
+        self.assertRaises(RuntimeError, scheduler.submit, numpy.array([1]))
+
+    def test_mis_shaped_sample(self) -> None:
+        """
+        Check that a mis-shaped sample only fails its own
+        request and the failed batch is counted.
+        """
+        model = Model(source=File(path=Path("double.onnx")), model=StrictDoubleModel())
+        with BatchScheduler(model=model, max_batch_size=8, max_wait=0.05) as sch:
+            futures = [sch.submit(numpy.array([v])) for v in range(4)]
+            invalid = sch.submit(numpy.array([1, 2]))
+            results = [int(f.result(timeout=5).item()) for f in futures]
+            self.assertRaises(ValueError, invalid.result, 5)
+            metrics = sch.metrics
+
+        self.assertEqual([0, 2, 4, 6], results)
+        self.assertEqual(1, metrics.failed, msg="The failed batch wasn't counted")
+        self.assertEqual(4, metrics.requests, msg="Unexpected requests")
+
+    def test_close_while_submitting(self) -> None:
+        """
+        Check that every request accepted while the scheduler
+        is closing gets resolved.
+        """
+        scheduler = BatchScheduler(model=self.model, max_wait=0.001)
+        futures: list = []
+
+        def __submit() -> None:
+            while True:
+                try:
+                    futures.append(scheduler.submit(numpy.array([1])))
+                except RuntimeError:
+                    return
+
+        threads = [threading.Thread(target=__submit) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        scheduler.close()
+        for thread in threads:
+            thread.join()
+
+        for future in futures:
+            self.assertTrue(future.done(), msg="A request was never resolved")
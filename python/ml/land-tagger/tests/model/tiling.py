@@ -0,0 +1,182 @@
+"""
+This module test the behavior and correctness
+for the module `model/tiling.py`
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+import numpy
+import rasterio
+import rasterio.transform
+
+from src.file.file import File
+from src.image.image import Image
+from src.model.model import Model
+from src.model.model_interfaces import ModelInterface
+from src.model.tiling import CoarseConfig, TiledInference, TilingConfig
+
+
+class SegmentationModel(ModelInterface):
+    """
+    Little model predicting two scores for each pixel of
+    a tile: the pixel value and its distance to 100.
+    """
+
+    def predict(self, sample: numpy.ndarray) -> numpy.ndarray:
+        return numpy.concatenate([sample, 100 - sample], axis=-1)
+
+    @property
+    def input_shape(self) -> tuple[int, ...]:
+        return (-1, 8, 8, 1)
+
+    @property
+    def input_dtype(self) -> str:
+        return "float32"
+
+
+class TiledInferenceTest(unittest.TestCase):
+    """
+    Test that the scenes are predicted by tiles and the
+    predictions are stitched back together.
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        # pylint: disable=consider-using-with
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        content = numpy.arange(30 * 21, dtype=numpy.float32).reshape((30, 21, 1)) % 97
+        self.image = Image(source=File(path=Path("scene.png")), content=content)
+        self.backend = SegmentationModel()
+        self.model = Model(source=File(path=Path("segment.onnx")), model=self.backend)
+
+    def tearDown(self) -> None:
+        super().tearDown()
+        self.tmp_dir.cleanup()
+
+    def __raster_file(self) -> File:
+        """
+        Writes the scene into a GeoTIFF.
+        """
+        path: Path = Path(self.tmp_dir.name).joinpath("scene.tif")
+        with rasterio.open(
+            path,
+            mode="w",
+            driver="GTiff",
+            height=30,
+            width=21,
+            count=1,
+            dtype="float32",
+            crs="EPSG:32631",
+            transform=rasterio.transform.from_origin(500000, 4000000, 10, 10),
+        ) as rf:
+            rf.write(self.image.content[..., 0], 1)
+        return File(path=path)
+
+    def test_blend(self) -> None:
+        """
+        Check that the overlapping predictions are averaged
+        and the bands of rows are released in order.
+        """
+        tiling = TiledInference(
+            model=self.model, config=TilingConfig(overlap=3, batch_size=4, workers=2)
+        )
+        strips = list(tiling.strips(self.image))
+        self.assertEqual([row for row, _ in strips], [0, 5, 10, 15, 20, 22])
+        self.assertTrue(all(len(result) <= 8 for _, result in strips))
+
+        result = numpy.concatenate([result for _, result in strips])
+        self.assertEqual(result.dtype, numpy.float32)
+        expected = numpy.concatenate([self.image.content, 100 - self.image.content], -1)
+        numpy.testing.assert_allclose(result, expected, rtol=1e-5)
+
+    def test_vote(self) -> None:
+        """
+        Check that each pixel keeps the most predicted class.
+        """
+        tiling = TiledInference(
+            model=self.model, config=TilingConfig(overlap=2, mode="vote")
+        )
+        result = tiling.predict(self.image)
+        self.assertEqual(result.shape, (30, 21, 1))
+        self.assertEqual(result.dtype, numpy.uint8)
+        numpy.testing.assert_array_equal(result, self.image.content < 50)
+
+    def test_scene_smaller_than_tile(self) -> None:
+        """
+        Check that the tiles are padded to the model's input.
+        """
+        tiling = TiledInference(model=self.model)
+        image = Image(
+            source=File(path=Path("small.png")), content=self.image.content[:5, :6]
+        )
+        result = tiling.predict(image)
+        numpy.testing.assert_allclose(result[..., 0], image.content[..., 0])
+
+    def test_write(self) -> None:
+        """
+        Check that the result of a raster is written into
+        a GeoTIFF with the same georeference.
+        """
+        source: File = self.__raster_file()
+        destination: Path = Path(self.tmp_dir.name).joinpath("result.tif")
+        tiling = TiledInference(
+            model=self.model, config=TilingConfig(tile_size=(8, 8), overlap=4)
+        )
+        tiling.write(source=source, destination=destination)
+
+        with rasterio.open(destination) as rf:
+            self.assertEqual(rf.count, 2)
+            self.assertEqual(str(rf.crs), "EPSG:32631")
+            self.assertEqual(
+                rf.transform, rasterio.transform.from_origin(500000, 4000000, 10, 10)
+            )
+            numpy.testing.assert_allclose(rf.read(1), self.image.content[..., 0])
+
+    def test_coarse_to_fine(self) -> None:
+        """
+        Check that only the tiles with candidates in the
+        overview are predicted at full resolution.
+        """
+        content = numpy.zeros((64, 64, 1), dtype=numpy.float32)
+        content[40:48, 8:16] = 100
+        image = Image(source=File(path=Path("rural.png")), content=content)
+        tiling = TiledInference(model=self.model)
+        coarse = CoarseConfig(factor=4, threshold=10.0, classes=(0,), margin=0)
+
+        self.assertEqual(tiling.candidates(image, coarse=coarse), [(40, 8)])
+        tagged = list(tiling.tag(image, coarse=coarse))
+        self.assertEqual(len(tagged), 1)
+        tile, prediction = tagged[0]
+        self.assertEqual((tile.metadata or {})["window"], (40, 8, 8, 8))
+        numpy.testing.assert_array_equal(prediction[..., 0], 100)
+
+        wider = CoarseConfig(factor=4, threshold=10.0, classes=(0,), margin=1)
+        self.assertEqual(len(tiling.candidates(image, coarse=wider)), 9)
+        self.assertEqual(tiling.candidates(image, coarse=CoarseConfig(threshold=101.0)), [])
+
+    def test_tag_raster(self) -> None:
+        """
+        Check that the tiles of a raster keep their georeference.
+        """
+        tiling = TiledInference(model=self.model)
+        tagged = list(tiling.tag(self.__raster_file(), tiles=[(8, 16)]))
+        tile, prediction = tagged[0]
+        self.assertEqual(tile.resolution, (8, 5))
+        self.assertEqual(prediction.shape, (8, 8, 2))
+        numpy.testing.assert_array_equal(prediction[:, :5, :1], self.image.content[8:16, 16:])
+        self.assertEqual(
+            (tile.metadata or {})["transform"],
+            rasterio.transform.from_origin(500160, 3999920, 10, 10),
+        )
+
+    def test_invalid_config(self) -> None:
+        """
+        Check that the invalid settings are rejected.
+        """
+        with self.assertRaises(ValueError):
+            TilingConfig(mode="max")
+        with self.assertRaises(ValueError):
+            TilingConfig(tile_size=(8, 0))
+        with self.assertRaises(ValueError):
+            TiledInference(model=self.model, config=TilingConfig(overlap=8))
@@ -0,0 +1,164 @@
+"""
+This module test that output/writers.py module
+works properly.
+"""
+import json
+import time
+import tempfile
+import unittest
+from pathlib import Path
+import numpy
+import rasterio
+import rasterio.transform
+from src.file.file import File
+from src.image.image import Image
+from src.output.writers import (
+    BackgroundWriter,
+    COGWriter,
+    NDJSONWriter,
+    TagConfig,
+    TagWriter,
+    WriterInterface,
+)
+
+
+class SlowWriter(WriterInterface):
+    """
+    Little writer that takes its time and fails
+    with the negative predictions.
+    """
+
+    def __init__(self) -> None:
+        self.written: list[float] = []
+        self.closed: bool = False
+
+    def write(self, image: Image, prediction: numpy.ndarray) -> None:
+        time.sleep(0.05)
+        if prediction.item() < 0:
+            raise ValueError("Negative prediction")
+        self.written.append(prediction.item())
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class WritersTest(unittest.TestCase):
+    """
+    Test that the predictions are persisted as they
+    are produced.
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        # pylint: disable=consider-using-with
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.directory = Path(self.tmp_dir.name)
+        self.image = Image(
+            source=File(path=Path("scene.tif")),
+            content=numpy.zeros((8, 6, 3), dtype=numpy.uint8),
+            metadata={
+                "crs": "EPSG:32631",
+                "transform": rasterio.transform.from_origin(500000, 4000000, 10, 10),
+            },
+        )
+
+    def tearDown(self) -> None:
+        super().tearDown()
+        self.tmp_dir.cleanup()
+
+    def test_ndjson(self) -> None:
+        """
+        Check that the tags are sorted, filtered and
+        written in bulk.
+        """
+        path: Path = self.directory.joinpath("tags.ndjson")
+        config = TagConfig(labels=("crop", "house", "road"), threshold=0.2, top_k=2)
+        with TagWriter.make(path, config=config, buffer_size=2) as writer:
+            self.assertIsInstance(writer, NDJSONWriter)
+            writer.write(self.image, numpy.array([0.1, 0.7, 0.2]))
+            self.assertEqual(path.read_text(encoding="utf-8"), "")
+            writer.write_all([(self.image, numpy.array([[0.5, 0.3, 0.9]]))] * 2)
+            self.assertEqual(len(path.read_text(encoding="utf-8").splitlines()), 2)
+
+        lines: list[str] = path.read_text(encoding="utf-8").splitlines()
+        records: list[dict] = [json.loads(line) for line in lines]
+        self.assertEqual(len(records), 3)
+        self.assertEqual(records[0]["source"], self.image.source.uri)
+        self.assertEqual(records[0]["tags"], ["house", "road"])
+        self.assertEqual(records[1]["tags"], ["road", "crop"])
+        numpy.testing.assert_allclose(records[1]["scores"], [0.9, 0.5])
+
+    def test_invalid_tags(self) -> None:
+        """
+        Check that the predictions should be a score per class.
+        """
+        with self.assertRaises(NotImplementedError):
+            TagWriter.make(self.directory.joinpath("tags.csv"))
+        with NDJSONWriter(self.directory.joinpath("tags.jsonl")) as writer:
+            with self.assertRaises(ValueError):
+                writer.write(self.image, numpy.zeros((2, 3)))
+        with self.assertRaises(ValueError):
+            TagConfig(top_k=0)
+
+    def test_parquet(self) -> None:
+        """
+        Check that the tags are written into a Parquet file.
+        """
+        # pylint: disable=import-outside-toplevel, import-error
+        import pyarrow.parquet
+
+        path: Path = self.directory.joinpath("tags.parquet")
+        with TagWriter.make(path, buffer_size=2) as writer:
+            writer.write_all([(self.image, numpy.array([0.1, 0.7]))] * 3)
+
+        table = pyarrow.parquet.read_table(path)
+        self.assertEqual(table.num_rows, 3)
+        self.assertEqual(table.column("tags").to_pylist()[0], ["1", "0"])
+
+    def test_cog(self) -> None:
+        """
+        Check that the masks are written into tiled Cloud-Optimized
+        GeoTIFFs with the image georeference.
+        """
+        writer = COGWriter(self.directory.joinpath("masks"), blocksize=16)
+        mask = numpy.arange(4 * 3 * 2, dtype=numpy.float32).reshape((4, 3, 2))
+        writer.write(self.image, mask)
+        tile = Image(
+            source=self.image.source,
+            content=self.image.content,
+            metadata={**(self.image.metadata or {}), "window": (16, 32, 8, 6)},
+        )
+        writer.write(tile, mask[..., 0])
+        writer.close()
+
+        with rasterio.open(self.directory.joinpath("masks", "scene.tif")) as rf:
+            self.assertEqual(rf.profile["compress"], "deflate")
+            self.assertTrue(rf.profile["tiled"])
+            self.assertEqual(str(rf.crs), "EPSG:32631")
+            self.assertEqual(
+                rf.transform, rasterio.transform.from_origin(500000, 4000000, 20, 20)
+            )
+            numpy.testing.assert_array_equal(rf.read(2), mask[..., 1])
+        with rasterio.open(self.directory.joinpath("masks", "scene_16_32.tif")) as rf:
+            self.assertEqual(rf.count, 1)
+
+    def test_background(self) -> None:
+        """
+        Check that the predictions are written in the background,
+        in order, and the errors are raised to the caller.
+        """
+        slow = SlowWriter()
+        with BackgroundWriter(slow, max_pending=2) as writer:
+            started_at: float = time.perf_counter()
+            writer.write(self.image, numpy.array(1.0))
+            self.assertLess(time.perf_counter() - started_at, 0.05)
+            writer.write_all((self.image, numpy.array(float(i))) for i in range(2, 6))
+        self.assertEqual(slow.written, [1.0, 2.0, 3.0, 4.0, 5.0])
+        self.assertTrue(slow.closed)
+
+        writer = BackgroundWriter(SlowWriter())
+        writer.write(self.image, numpy.array(-1.0))
+        with self.assertRaises(RuntimeError):
+            writer.close()
+        with self.assertRaises(RuntimeError):
+            writer.write(self.image, numpy.array(1.0))
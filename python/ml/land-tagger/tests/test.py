@@ -4,9 +4,22 @@ Run all the test suite.
 # pylint: disable=unused-import
 import unittest
 from tests.utils.base import BaseSchemaTest
+from tests.utils.aio import ExecutorsTest
+from tests.utils.shared import SharedArrayTest
+from tests.utils.pool import BufferPoolTest
 from tests.file.file import FileTest
+from tests.file.remote import RemoteLoaderTest
+from tests.file.cache import FileCacheTest
 from tests.image.image import ImageTest
+from tests.image.pyramid import PyramidTest
+from tests.image.plugins import PluginRegistryTest
 from tests.model.model import ModelTest
+from tests.model.registry import ModelRegistryTest
+from tests.model.scheduler import BatchSchedulerTest
+from tests.model.pipeline import PipelineTest
+from tests.model.preprocessing import PreprocessingTest
+from tests.model.tiling import TiledInferenceTest
+from tests.output.writers import WritersTest
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,109 @@
+"""
+This module test that utils/aio.py module
+works properly.
+"""
+import time
+import asyncio
+import threading
+import unittest
+from src.utils.aio import Executors, run_blocking
+
+
+class ExecutorsTest(unittest.TestCase):
+    """
+    Test that the blocking work runs in bounded pools
+    and supports timeouts and cancellation.
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.executors = Executors.configure(io_workers=2)
+        self.running: int = 0
+        self.max_running: int = 0
+        self.lock = threading.Lock()
+
+    def tearDown(self) -> None:
+        super().tearDown()
+        Executors.configure()
+
+    def __work(self, seconds: float) -> float:
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(seconds)
+        with self.lock:
+            self.running -= 1
+        return seconds
+
+    def test_bounded(self) -> None:
+        """
+        Check that the concurrent calls share the pool threads.
+        """
+
+        async def __main() -> list[float]:
+            return await asyncio.gather(
+                *(run_blocking(Executors.IO, self.__work, 0.01) for _ in range(8))
+            )
+
+        self.assertEqual(asyncio.run(__main()), [0.01] * 8)
+        self.assertEqual(self.max_running, 2)
+
+    def test_timeout(self) -> None:
+        """
+        Check that the caller stops waiting once the timeout expires.
+        """
+
+        async def __main() -> None:
+            await run_blocking(Executors.IO, self.__work, 1.0, timeout=0.05)
+
+        started_at: float = time.perf_counter()
+        with self.assertRaises(TimeoutError):
+            asyncio.run(__main())
+        self.assertLess(time.perf_counter() - started_at, 1.0)
+
+    def test_cancel_queued(self) -> None:
+        """
+        Check that the cancelled calls which didn't start never run.
+        """
+        calls: list[int] = []
+
+        async def __main() -> None:
+            busy = [
+                asyncio.ensure_future(run_blocking(Executors.IO, self.__work, 0.1))
+                for _ in range(2)
+            ]
+            queued = asyncio.ensure_future(run_blocking(Executors.IO, calls.append, 1))
+            await asyncio.sleep(0.01)
+            queued.cancel()
+            await asyncio.gather(*busy)
+            with self.assertRaises(asyncio.CancelledError):
+                await queued
+
+        asyncio.run(__main())
+        self.executors.close()
+        self.assertEqual(calls, [])
+
+    def test_configure_pending(self) -> None:
+        """
+        Check that the work queued in the replaced pools still completes.
+        """
+
+        async def __main() -> list[float]:
+            pending = [
+                asyncio.ensure_future(run_blocking(Executors.IO, self.__work, 0.05))
+                for _ in range(6)
+            ]
+            await asyncio.sleep(0.01)
+            Executors.configure(io_workers=2)
+            return await asyncio.gather(*pending)
+
+        self.assertEqual(asyncio.run(__main()), [0.05] * 6)
+
+    def test_unknown_kind(self) -> None:
+        """
+        Check that the kind of work must be known.
+        """
+        with self.assertRaises(ValueError):
+            self.executors.pool("gpu")
+        with self.assertRaises(ValueError):
+            Executors(io_workers=0)
@@ -4,7 +4,7 @@ works properly.
 """
 import unittest
 from dataclasses import dataclass
-from src.utils.base import Base
+from src.utils.base import Base, validation
 
 
 @dataclass
@@ -28,6 +28,42 @@ class ExampleSchema(Base):
             raise ValueError("Height is not the same for `m` and `cm` records")
 
 
+@dataclass(slots=True)
+class SlotsSchema(Base):
+    """
+    Little schema with slots and
+    optional fields.
+    """
+
+    name: str
+    tags: list[str] | None = None
+
+    def __check_values__(self):
+        if not self.name:
+            raise ValueError("Please assign a name!")
+
+
+@dataclass
+class TrustedSchema(Base, validate=False):
+    """
+    Little schema that skips
+    the type validation.
+    """
+
+    name: str
+
+    def __check_values__(self):
+        pass
+
+
+@dataclass
+class ChildSchema(SlotsSchema):
+    """
+    Little schema that inherits
+    the fields of its parent.
+    """
+
+
 class BaseSchemaTest(unittest.TestCase):
     """
     Test the `Base` data class
@@ -71,3 +107,47 @@ class BaseSchemaTest(unittest.TestCase):
             error_raised,
             "A TypeError should be raised, the height is not the same",
         )
+
+    def test_plan(self) -> None:
+        """
+        Check that the accepted types are resolved
+        when the class is created.
+        """
+        self.assertEqual(
+            [name for name, _, _ in ExampleSchema.__plan__],
+            ["word", "height_cm", "height_m"],
+        )
+        self.assertEqual(SlotsSchema.__plan__[1][1], (list, type(None)))
+        self.assertEqual(TrustedSchema.__plan__, ())
+        self.assertEqual(ChildSchema.__plan__, SlotsSchema.__plan__)
+        with self.assertRaises(TypeError):
+            ChildSchema(name=1)  # type: ignore
+
+    def test_slots(self) -> None:
+        """
+        Check that the slots data classes are validated
+        and don't have a dictionary per object.
+        """
+        schema = SlotsSchema(name="crop", tags=["field"])
+        self.assertFalse(hasattr(schema, "__dict__"))
+        self.assertIsNone(SlotsSchema(name="crop").tags)
+        with self.assertRaises(TypeError) as context:
+            SlotsSchema(name="crop", tags=("field",))  # type: ignore
+        self.assertIn("The field 'tags'", str(context.exception))
+        with self.assertRaises(ValueError):
+            SlotsSchema(name="")
+
+    def test_skip_validation(self) -> None:
+        """
+        Check that the type validation is skipped for the
+        trusted classes and inside `validation(False)`,
+        but the values are still checked.
+        """
+        self.assertEqual(TrustedSchema(name=1).name, 1)  # type: ignore
+        with validation(False):
+            schema = SlotsSchema(name="crop", tags=("field",))  # type: ignore
+            self.assertEqual(schema.tags, ("field",))
+            with self.assertRaises(ValueError):
+                SlotsSchema(name="")
+        with self.assertRaises(TypeError):
+            SlotsSchema(name=1)  # type: ignore
@@ -0,0 +1,144 @@
+"""
+This module test that utils/pool.py module
+works properly.
+"""
+import gc
+import tempfile
+import unittest
+from pathlib import Path
+import numpy
+import rasterio
+import rasterio.transform
+from src.file.file import File
+from src.image.image import Image
+from src.model.model import Model
+from src.utils.pool import BufferPool
+from tests.model.scheduler import DoubleModel
+
+
+class BufferPoolTest(unittest.TestCase):
+    """
+    Test that the large arrays are reused instead
+    of allocated for each request.
+    """
+
+    def test_reuse(self) -> None:
+        """
+        Check that the released buffers are handed out again
+        for the same shape and dtype.
+        """
+        pool = BufferPool()
+        first: numpy.ndarray = pool.acquire((4, 5), "float32")
+        pool.release(first.T[1:])
+        self.assertIs(pool.acquire((4, 5), numpy.float32), first)
+        self.assertIsNot(pool.acquire((4, 5), "float64"), first)
+        with pool.buffer((2, 3), "uint8") as buffer:
+            self.assertEqual(buffer.shape, (2, 3))
+
+        stats = pool.stats
+        self.assertEqual((stats.hits, stats.misses, stats.released), (1, 3, 2))
+        self.assertEqual(stats.pooled_bytes, 6)
+        self.assertAlmostEqual(stats.hit_rate, 0.25)
+
+        with self.assertRaises(ValueError):
+            pool.release(numpy.zeros((4, 5)))
+        pool.release(first)
+        with self.assertRaises(ValueError):
+            pool.release(first)
+        with self.assertRaises(ValueError):
+            BufferPool(max_bytes=-1)
+
+    def test_limit(self) -> None:
+        """
+        Check that the pool drops the least recently used
+        buffers to stay under its size, and the buffers never
+        released are freed as usual.
+        """
+        pool = BufferPool(max_bytes=100)
+        old, new = pool.acquire((60,), "uint8"), pool.acquire((40,), "uint8")
+        pool.release(old)
+        pool.release(new)
+        pool.release(pool.acquire((30,), "uint8"))
+        self.assertEqual(pool.stats.pooled_bytes, 70)
+        self.assertEqual(pool.stats.dropped, 1)
+        pool.release(pool.acquire((200,), "uint8"))
+        self.assertEqual(pool.stats.dropped, 2)
+
+        pool.acquire((10,), "uint8")
+        gc.collect()
+        self.assertEqual(len(pool._leased), 0)  # pylint: disable=protected-access
+
+    def test_limit_mixed_shapes(self) -> None:
+        """
+        Check that the shapes whose buffers are all leased
+        don't break the eviction.
+        """
+        pool = BufferPool(max_bytes=100)
+        pool.release(pool.acquire((10,), "uint8"))
+        leased: numpy.ndarray = pool.acquire((10,), "uint8")
+        first, second = pool.acquire((60,), "uint8"), pool.acquire((60,), "uint8")
+        pool.release(first)
+        pool.release(second)
+        self.assertEqual(pool.stats.pooled_bytes, 60)
+        self.assertEqual(pool.stats.dropped, 1)
+        pool.release(leased)
+        self.assertEqual(pool.stats.pooled_bytes, 70)
+        self.assertIs(pool.acquire((60,), "uint8"), second)
+
+    def __decode(self, pool: BufferPool, file: File) -> None:
+        """
+        Decodes the image twice into the pool.
+        """
+        expected: Image = Image.make(file=file)
+        for _ in range(2):
+            image: Image = Image.make(file=file, pool=pool)
+            numpy.testing.assert_array_equal(image.content, expected.content)
+            self.assertEqual(image.metadata, expected.metadata)
+            pool.release(image.content)
+
+    def test_decode_and_predict(self) -> None:
+        """
+        Check that the images are decoded into the pool and the
+        model batches don't allocate in the steady state.
+        """
+        pool = BufferPool()
+        with tempfile.TemporaryDirectory() as directory:
+            raster: Path = Path(directory).joinpath("scene.tif")
+            with rasterio.open(
+                raster,
+                mode="w",
+                driver="GTiff",
+                height=6,
+                width=4,
+                count=2,
+                dtype="uint16",
+                crs="EPSG:32631",
+                transform=rasterio.transform.from_origin(500000, 4000000, 10, 10),
+            ) as rf:
+                rf.write(numpy.arange(48, dtype=numpy.uint16).reshape((2, 6, 4)))
+            self.__decode(pool, File(path=raster))
+        self.__decode(pool, File(path=Path("./tests/image/static/cat.jpg").absolute()))
+        self.assertEqual((pool.stats.hits, pool.stats.misses), (2, 2))
+
+        model = Model(source=File(path=Path("double.onnx")), model=DoubleModel())
+        samples = [numpy.full((3,), i, dtype=numpy.float32) for i in range(5)]
+        list(model.model.iter_predict(samples, batch_size=2))
+        misses: int = BufferPool.shared().stats.misses
+        predictions = list(model.model.iter_predict(samples, batch_size=2))
+        self.assertEqual(BufferPool.shared().stats.misses, misses)
+        numpy.testing.assert_array_equal(predictions[4], numpy.full((3,), 8.0))
+
+    def test_batch_sizes(self) -> None:
+        """
+        Check that the smaller batches reuse the buffer of the
+        maximum batch size and only predict the filled samples.
+        """
+        backend = DoubleModel()
+        model = Model(source=File(path=Path("double.onnx")), model=backend)
+        samples = [numpy.full((3,), i, dtype=numpy.float32) for i in range(5)]
+        list(model.model.iter_predict(samples, batch_size=8))
+        misses = BufferPool.shared().stats.misses
+        for count in range(1, 5):
+            list(model.model.iter_predict(samples[:count], batch_size=8))
+        self.assertEqual(BufferPool.shared().stats.misses, misses)
+        self.assertEqual(backend.batches[-4:], [1, 2, 3, 4])
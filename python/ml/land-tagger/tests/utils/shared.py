@@ -0,0 +1,75 @@
+"""
+This module test that utils/shared.py module
+works properly.
+"""
+import os
+import tempfile
+import unittest
+import multiprocessing
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+import numpy
+from src.utils.shared import SharedArray
+
+
+def _produce(shape: tuple[int, ...], directory: str) -> SharedArray:
+    """
+    Shares an array from another process.
+    """
+    content = numpy.arange(numpy.prod(shape), dtype=numpy.int32).reshape(shape)
+    return SharedArray.create(content, directory=Path(directory))
+
+
+class SharedArrayTest(unittest.TestCase):
+    """
+    Test that the arrays are handed over between
+    processes without copying them.
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        # pylint: disable=consider-using-with
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        super().tearDown()
+        self.tmp_dir.cleanup()
+
+    def test_handoff(self) -> None:
+        """
+        Check that an array shared by another process is mapped
+        and nothing is left once it is attached.
+        """
+        with ProcessPoolExecutor(
+            max_workers=1, mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            handle: SharedArray = pool.submit(
+                _produce, (4, 5, 3), self.tmp_dir.name
+            ).result()
+
+        self.assertEqual(handle.shape, (4, 5, 3))
+        self.assertEqual(numpy.dtype(handle.dtype), numpy.int32)
+        content: numpy.ndarray = handle.attach()
+        self.assertIsInstance(content, numpy.memmap)
+        self.assertEqual(os.listdir(self.tmp_dir.name), [])
+        numpy.testing.assert_array_equal(
+            content, numpy.arange(60, dtype=numpy.int32).reshape((4, 5, 3))
+        )
+        content[0, 0, 0] = 7
+        self.assertEqual(content[..., 0].min(), 3)
+
+    def test_release(self) -> None:
+        """
+        Check that an array which won't be attached can be
+        released and that object arrays are rejected.
+        """
+        directory = Path(self.tmp_dir.name)
+        handle: SharedArray = SharedArray.create(numpy.ones(3), directory=directory)
+        self.assertTrue(Path(handle.path).exists())
+        handle.release()
+        handle.release()
+        self.assertEqual(os.listdir(directory), [])
+
+        with self.assertRaises(ValueError):
+            SharedArray.create(numpy.array([{}, None]), directory=directory)
+        self.assertEqual(os.listdir(directory), [])